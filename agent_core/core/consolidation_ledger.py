@@ -0,0 +1,89 @@
+"""
+ConsolidationLedger — Which days the SleepConsolidator already processed.
+
+One JSON file maps each consolidated date to a hash of that day's log
+entries (plus when it ran and what it saved). A day is pending when it has
+no record or its logs changed since (e.g. a cron runner appended after the
+nightly run). The hash is computed over the parsed entries, so archiving a
+day (see log_archive.py) does not make it look changed.
+
+Each record also keeps the day's file fingerprint (see
+InteractionLogger.day_fingerprint). While it matches, the day is known to
+be unchanged without reading its logs; the hash is only recomputed when it
+differs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class ConsolidationLedger:
+    """Persistent record of consolidated dates and their log hashes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = self._load()
+
+    @staticmethod
+    def hash_logs(logs: list) -> str:
+        digest = hashlib.sha256()
+        for entry in logs:
+            digest.update(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def is_current(self, date_str: str, logs_hash: str) -> bool:
+        with self._lock:
+            record = self._records.get(date_str)
+        return bool(record) and record.get("hash") == logs_hash
+
+    def fingerprint_matches(self, date_str: str, fingerprint: dict) -> bool:
+        with self._lock:
+            record = self._records.get(date_str)
+        return bool(record) and record.get("fingerprint") == fingerprint
+
+    def update_fingerprint(self, date_str: str, fingerprint: dict):
+        """Stores a new fingerprint for a day whose hash was confirmed unchanged."""
+        with self._lock:
+            self._records = self._load()
+            if date_str not in self._records:
+                return
+            self._records[date_str]["fingerprint"] = fingerprint
+            self._save_locked()
+
+    def get(self, date_str: str) -> dict:
+        with self._lock:
+            return dict(self._records.get(date_str) or {})
+
+    def dates(self) -> list:
+        with self._lock:
+            return sorted(self._records)
+
+    def record(self, date_str: str, logs_hash: str, **details):
+        with self._lock:
+            # Re-read first: another run may have recorded other days meanwhile
+            self._records = self._load()
+            self._records[date_str] = {
+                "hash": logs_hash,
+                "consolidated_at": datetime.now().isoformat(),
+                **details,
+            }
+            self._save_locked()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_locked(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._records, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
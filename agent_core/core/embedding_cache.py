@@ -0,0 +1,150 @@
+"""
+EmbeddingCache — Persistent embedding cache with an in-memory LRU front.
+
+Vectors are stored in SQLite keyed by (provider, model, sha256(text)), so a
+repeated query or an insight that was already embedded never costs another
+OpenAI call or MiniLM forward pass — across restarts and across processes.
+
+CachedEmbeddings wraps any LangChain Embeddings object and is what the
+MemoryManager hands to Chroma, so recall, save and forget all go through it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingCache:
+    """SQLite-backed (provider, model, text) → vector store with an LRU front."""
+
+    LRU_SIZE = 2048
+
+    def __init__(self, db_path: str, lru_size: int = None):
+        self.db_path = db_path
+        self.lru_size = lru_size or self.LRU_SIZE
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (provider, model, text_hash)
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, provider: str, model: str, texts: List[str]) -> List[List[float] | None]:
+        """Returns cached vectors (or None) for each text, in order."""
+        results = [None] * len(texts)
+        to_query = {}
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = (provider, model, self.text_hash(text))
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    results[i] = vector
+                else:
+                    to_query.setdefault(key, []).append(i)
+
+            for key, indexes in to_query.items():
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE provider=? AND model=? AND text_hash=?",
+                    key,
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += len(indexes)
+                    continue
+                vector = array("f", row[0]).tolist()
+                self._remember(key, vector)
+                self.stats["disk_hits"] += len(indexes)
+                for i in indexes:
+                    results[i] = vector
+
+        return results
+
+    def put_many(self, provider: str, model: str, texts: List[str], vectors: List[List[float]]):
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = (provider, model, self.text_hash(text))
+                self._remember(key, list(vector))
+                rows.append((*key, array("f", vector).tobytes()))
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (provider, model, text_hash, vector) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[EmbeddingCache] Write error: {e}")
+
+    def _remember(self, key: tuple, vector: List[float]):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "hit_rate": round(self.hit_rate(), 3), "lru_entries": len(self._lru)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that consults an EmbeddingCache first."""
+
+    def __init__(self, inner: Embeddings, provider: str, model: str, cache: EmbeddingCache):
+        self.inner = inner
+        self.provider = provider
+        self.model = model
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.provider, self.model, texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            # Embed each distinct missing text once, in a single batch
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            fresh = self.inner.embed_documents(unique)
+            self.cache.put_many(self.provider, self.model, unique, fresh)
+            by_text = dict(zip(unique, fresh))
+            for i in missing:
+                vectors[i] = list(by_text[texts[i]])
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get_many(self.provider, self.model, [text])[0]
+        if vector is None:
+            vector = self.inner.embed_query(text)
+            self.cache.put_many(self.provider, self.model, [text], [vector])
+        return vector
@@ -0,0 +1,76 @@
+"""
+EnginePool — Warm, bounded pool of Orchestrator sessions.
+
+One base Orchestrator is initialized once (tools, memory, LLM clients, soul).
+Each checkout hands out a fork() of it with its own chat_history, so a
+scheduled task starts in milliseconds and never sees another task's context.
+Sessions are reset and kept for reuse on return; at most `size` are ever
+checked out at once, which keeps memory bounded when several tasks fire.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from agent_core.core.orchestrator import Orchestrator
+
+
+class EnginePool:
+    """Hands out isolated sessions over a shared, pre-initialized engine."""
+
+    SIZE = 2
+
+    def __init__(self, size: int = None, base: Optional[Orchestrator] = None):
+        self.size = size or self.SIZE
+        self._base = base
+        self._idle = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    @property
+    def initialized(self) -> bool:
+        return self._base is not None
+
+    @property
+    def base(self) -> Orchestrator:
+        """The shared engine, initialized on first use."""
+        with self._lock:
+            if self._base is None:
+                engine = Orchestrator()
+                init_event = engine.initialize()
+                if init_event.type == "error":
+                    raise RuntimeError(init_event.content)
+                self._base = engine
+            return self._base
+
+    @contextmanager
+    def session(self, timeout: float = None):
+        """
+        Checks out an isolated session engine, blocking while the pool is full.
+        Raises TimeoutError if no session frees up within timeout.
+        """
+        if not self._slots.acquire(timeout=timeout if timeout is not None else -1):
+            raise TimeoutError("EnginePool: todas as sessões estão ocupadas.")
+
+        engine = None
+        try:
+            base = self.base
+            with self._lock:
+                engine = self._idle.pop() if self._idle else None
+                self._in_use += 1
+            if engine is None:
+                engine = base.fork()
+            yield engine
+        finally:
+            if engine is not None:
+                engine.chat_history = [engine.soul_message] if engine.soul_message else []
+                engine.history.reset()
+                with self._lock:
+                    self._in_use -= 1
+                    self._idle.append(engine)
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": self.size, "in_use": self._in_use, "idle": len(self._idle)}
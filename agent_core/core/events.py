@@ -3,6 +3,6 @@ from typing import Any, Dict
 
 @dataclass
 class AuroraEvent:
-    type: str  # 'log', 'plan', 'step_start', 'tool_call', 'tool_result', 'thought', 'final_answer', 'error', 'setup_complete'
+    type: str  # 'log', 'plan', 'step_start', 'tool_call', 'tool_result', 'tool_progress', 'tools_updated', 'thought', 'final_answer', 'final_answer_delta', 'final_answer_reset', 'error', 'setup_complete'
     content: Any
     metadata: Dict[str, Any] = None
@@ -0,0 +1,255 @@
+"""
+HistoryManager — Keeps chat_history inside a token budget.
+
+The soul message is always kept first and the most recent turns are kept
+verbatim, except that no tool result may exceed MAX_TOOL_MESSAGE_CHARS in
+any turn (the Orchestrator also clips results to it when appending them,
+since a step resends its history on every LLM call). Large tool results
+from older turns are clipped harder (head + tail), and when the history is
+still over budget the oldest turns are folded into a rolling summary. If
+the recent turns alone still break the budget, their tool results are
+clipped as hard as the older ones' and they are folded as well — all but
+the current turn. The summary is written by the fast model on a background
+thread, so compaction never waits on an LLM call; until it is ready, a
+crude digest of the folded turns stands in for it.
+
+Token counts are estimated (chars / 4) — close enough for budgeting and
+free of tokenizer dependencies.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from agent_core.utils.llm_factory import LLMFactory
+
+
+SUMMARY_HEADER = "[RESUMO DA CONVERSA ANTERIOR]"
+
+SUMMARY_PROMPT = """Você mantém o resumo de longo prazo de uma conversa entre o usuário e a Aurora.
+Atualize o resumo existente incorporando os novos trechos da conversa.
+Preserve fatos, decisões, pedidos em aberto, nomes de arquivos e resultados importantes.
+Descarte saudações e detalhes irrelevantes. Seja conciso (no máximo ~300 palavras).
+
+[RESUMO ATUAL]
+{summary}
+
+[NOVOS TRECHOS]
+{turns}
+
+Responda APENAS com o resumo atualizado."""
+
+
+class HistoryManager:
+    """Enforces a token budget on the Orchestrator's chat_history."""
+
+    TOKEN_BUDGET = 12000
+    KEEP_RECENT_TURNS = 3
+    MAX_TOOL_RESULT_CHARS = 1500   # tool results in older turns
+    MAX_TOOL_MESSAGE_CHARS = 6000  # hard cap for any tool result, recent turns included
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        token_budget: int = None,
+        keep_recent_turns: int = None,
+        max_tool_result_chars: int = None,
+        max_tool_message_chars: int = None,
+    ):
+        self.token_budget = token_budget or self.TOKEN_BUDGET
+        self.keep_recent_turns = keep_recent_turns or self.KEEP_RECENT_TURNS
+        self.max_tool_result_chars = max_tool_result_chars or self.MAX_TOOL_RESULT_CHARS
+        self.max_tool_message_chars = max(
+            max_tool_message_chars or self.MAX_TOOL_MESSAGE_CHARS, self.max_tool_result_chars
+        )
+
+        self.summary = ""
+        self._pending_digest = ""
+        self._future = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aurora-summary")
+        self._summary_message = None
+
+    # ── Public API ──
+
+    def compact(self, history: list) -> list:
+        """
+        Returns a history that fits the token budget:
+        [soul, summary?, older turns (clipped)..., recent turns (hard cap only)...]
+        """
+        self._collect_summary()
+
+        soul, body = self._split_soul(history)
+        turns = self._group_turns(body)
+
+        # Older turns get their tool outputs clipped; the last ones only get the hard cap
+        cutoff = max(len(turns) - self.keep_recent_turns, 0)
+        turns = [
+            [self._clip(m, self.max_tool_result_chars if i < cutoff else self.max_tool_message_chars) for m in turn]
+            for i, turn in enumerate(turns)
+        ]
+
+        folded = []
+        fixed_tokens = self.estimate_tokens(soul) + len(self._summary_text()) // self.CHARS_PER_TOKEN
+
+        def over_budget():
+            return fixed_tokens + sum(self.estimate_tokens(t) for t in turns) > self.token_budget
+
+        def fold(keep: int):
+            nonlocal fixed_tokens
+            while len(turns) > keep and over_budget():
+                turn = turns.pop(0)
+                folded.append(turn)
+                fixed_tokens += len(self._digest([turn])) // self.CHARS_PER_TOKEN
+
+        fold(self.keep_recent_turns)
+        if over_budget():
+            # The recent turns alone break the budget: clip them too, then
+            # fold them as well, keeping only the current turn
+            turns = [[self._clip(m) for m in turn] for turn in turns]
+            fold(1)
+
+        if folded:
+            self._schedule_summary(folded)
+
+        compacted = list(soul)
+        summary_text = self._summary_text()
+        if summary_text:
+            self._summary_message = SystemMessage(content=f"{SUMMARY_HEADER}\n{summary_text}")
+            compacted.append(self._summary_message)
+        for turn in turns:
+            compacted.extend(turn)
+        return compacted
+
+    def reset(self):
+        """Forgets the rolling summary (used on session reset)."""
+        with self._lock:
+            self.summary = ""
+            self._pending_digest = ""
+            self._future = None
+            self._summary_message = None
+
+    def estimate_tokens(self, messages: list) -> int:
+        total = 0
+        for m in messages:
+            total += len(str(m.content))
+            tool_calls = getattr(m, "tool_calls", None)
+            if tool_calls:
+                total += len(str(tool_calls))
+        return total // self.CHARS_PER_TOKEN
+
+    # ── Internals ──
+
+    def _split_soul(self, history: list):
+        """Separates the soul message and drops any previous summary message."""
+        body = [
+            m for m in history
+            if m is not self._summary_message
+            and not (isinstance(m, SystemMessage) and str(m.content).startswith(SUMMARY_HEADER))
+        ]
+        if body and isinstance(body[0], SystemMessage):
+            return body[:1], body[1:]
+        return [], body
+
+    @staticmethod
+    def _group_turns(messages: list) -> list:
+        """
+        Groups messages into turns, each starting at a HumanMessage.
+        Keeps AI tool calls together with their ToolMessages.
+        """
+        turns = []
+        for m in messages:
+            if isinstance(m, HumanMessage) or not turns:
+                turns.append([m])
+            else:
+                turns[-1].append(m)
+        return turns
+
+    def clip_tool_output(self, content: str, limit: int = None) -> str:
+        """Head + tail of a tool result longer than limit (default: the hard cap)."""
+        content = str(content)
+        limit = limit or self.max_tool_message_chars
+        if len(content) <= limit:
+            return content
+        head = content[: limit * 2 // 3]
+        tail = content[-(limit // 3):]
+        omitted = len(content) - len(head) - len(tail)
+        return f"{head}\n... [{omitted} caracteres omitidos] ...\n{tail}"
+
+    def _clip(self, message, limit: int = None):
+        if not isinstance(message, ToolMessage):
+            return message
+        limit = limit or self.max_tool_result_chars
+        if len(str(message.content)) <= limit:
+            return message
+        return ToolMessage(
+            tool_call_id=message.tool_call_id,
+            name=message.name,
+            content=self.clip_tool_output(message.content, limit),
+        )
+
+    @staticmethod
+    def _digest(turns: list) -> str:
+        """Cheap extractive stand-in for the summary while the LLM works."""
+        lines = []
+        for turn in turns:
+            for m in turn:
+                if isinstance(m, HumanMessage):
+                    lines.append(f"- Usuário: {str(m.content)[:200]}")
+                elif m.type == "ai" and m.content:
+                    lines.append(f"- Aurora: {str(m.content)[:200]}")
+        return "\n".join(lines)
+
+    def _summary_text(self) -> str:
+        with self._lock:
+            parts = [p for p in (self.summary, self._pending_digest) if p]
+        return "\n".join(parts)
+
+    def _schedule_summary(self, folded: list):
+        digest = self._digest(folded)
+        with self._lock:
+            self._pending_digest = "\n".join(p for p in (self._pending_digest, digest) if p)
+            if self._future is not None and not self._future.done():
+                # The running job will be followed up on the next compaction
+                return
+            self._future = self._executor.submit(self._summarize, self.summary, self._pending_digest)
+
+    def _collect_summary(self):
+        """Adopts a finished background summary, if any."""
+        with self._lock:
+            future = self._future
+            if future is None or not future.done():
+                return
+            self._future = None
+            try:
+                summary, consumed = future.result()
+            except Exception as e:
+                print(f"[History] Summary error: {e}")
+                return
+            self.summary = summary
+            # Drop only the digest lines this summary already covers
+            if self._pending_digest.startswith(consumed):
+                self._pending_digest = self._pending_digest[len(consumed):].lstrip("\n")
+            else:
+                self._pending_digest = ""
+
+            # Turns folded while the job was running still need summarizing
+            if self._pending_digest:
+                self._future = self._executor.submit(
+                    self._summarize, self.summary, self._pending_digest
+                )
+
+    @staticmethod
+    def _summarize(summary: str, turns_text: str):
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", SUMMARY_PROMPT),
+            ("human", "Atualize o resumo."),
+        ])
+        chain = prompt | LLMFactory.get_fast_thinking_model()
+        response = chain.invoke({
+            "summary": summary or "(vazio)",
+            "turns": turns_text,
+        })
+        return response.content.strip(), turns_text
@@ -2,28 +2,84 @@
 InteractionLogger — Structured interaction logging with daily rotation.
 
 Logs all agent interactions as JSON Lines (.jsonl), one file per day.
-Automatically cleans up old logs beyond MAX_LOG_DAYS.
+Days older than ARCHIVE_AFTER_DAYS are moved into a compressed, indexed
+archive (see log_archive.py) instead of being deleted; iter_logs() streams
+entries across plain and archived days by time range and event type.
+
+log() never touches the disk: entries go through a bounded queue to a
+background writer that keeps the day's file open and writes in batches,
+waking at least every FLUSH_INTERVAL, and fsyncs every FSYNC_INTERVAL.
+When the queue is full, BACKPRESSURE decides between dropping the entry
+("drop") and waiting for room ("block"). flush()/close() drain it; close()
+runs at exit.
+
+The web server, worker daemon and run_sleep append to the same daily file,
+so the file is opened O_APPEND and each batch goes out as whole lines in a
+single os.write() (no userspace buffer that could flush half a line).
+Readers still skip lines that do not parse instead of dropping the rest of
+the day.
 """
 
+import atexit
 import os
 import json
 import glob
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from agent_core.core.log_archive import LogArchive, entry_matches
+
+_UNSET = object()
 
 
 class InteractionLogger:
     """Logs interactions to daily JSONL files with automatic rotation."""
 
-    MAX_LOG_DAYS = 7
+    ARCHIVE_AFTER_DAYS = 2         # today and yesterday stay plain JSONL
+    ARCHIVE_RETENTION_DAYS = None  # days to keep in the archive (None = forever)
 
-    def __init__(self, log_dir: str = None):
+    # Background writer
+    QUEUE_SIZE = 10000
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 1.0   # seconds between flushes to the OS
+    FSYNC_INTERVAL = 30.0  # seconds between fsyncs (0 = every flush, None = never)
+    BACKPRESSURE = "drop"  # "drop" | "block" when the queue is full
+
+    def __init__(
+        self,
+        log_dir: str = None,
+        queue_size: int = None,
+        flush_interval: float = None,
+        fsync_interval=_UNSET,
+        backpressure: str = None,
+    ):
         self.log_dir = log_dir or os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
             "data", "logs"
         )
         os.makedirs(self.log_dir, exist_ok=True)
+        self.archive = LogArchive(os.path.join(self.log_dir, "archive"))
         self._rotate_old_logs()
 
+        self.flush_interval = flush_interval if flush_interval is not None else self.FLUSH_INTERVAL
+        self.fsync_interval = self.FSYNC_INTERVAL if fsync_interval is _UNSET else fsync_interval
+        self.backpressure = backpressure or self.BACKPRESSURE
+        if self.backpressure not in ("drop", "block"):
+            raise ValueError(f"Invalid backpressure policy: {self.backpressure}")
+
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "errors": 0}
+        self._queue = queue.Queue(maxsize=queue_size or self.QUEUE_SIZE)
+        self._closed = False
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._fd = None
+        self._file_date = None
+        self._file_lock = threading.Lock()
+        atexit.register(self.close)
+
     @property
     def current_log_path(self) -> str:
         """Path to today's log file."""
@@ -41,22 +97,200 @@ class InteractionLogger:
             content: Main content of the event
             metadata: Optional extra data (args, mode, etc.)
         """
+        now = datetime.now()
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "type": event_type,
             "content": content if isinstance(content, str) else str(content),
             "metadata": metadata or {},
         }
 
         try:
-            with open(self.current_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # Serialized here so later changes to metadata don't leak into the log
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
         except Exception as e:
             print(f"[Logger] Error writing log: {e}")
+            return
+        self._enqueue((now.strftime("%Y-%m-%d"), line))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Blocks until every entry logged so far is on disk. False on timeout."""
+        if self._thread is None or self._closed:
+            return True  # nothing queued, or writes are already synchronous
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Flushes pending entries, stops the writer and closes the file."""
+        with self._thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+        # Entries that raced with shutdown are written directly
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item:
+                leftovers.append(item)
+        self._write_batch(leftovers)
+        self._close_file()
+
+    def _enqueue(self, item):
+        if self._closed:
+            # After shutdown, fall back to a direct append
+            self._write_batch([item])
+            self._close_file()
+            return
+
+        self._ensure_thread()
+        self.stats["queued"] += 1
+        if self.backpressure == "block":
+            self._queue.put(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] % 1000 == 1:
+                print(f"[Logger] Queue full, dropping entries ({self.stats['dropped']} so far)")
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="aurora-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        last_flush = last_fsync = time.monotonic()
+        dirty = unsynced = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = False  # timeout tick: just flush
+
+            batch, markers, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                elif item is not False:
+                    batch.append(item)
+                if stop or len(batch) >= self.BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                previous_date = self._file_date
+                self._write_batch(batch)
+                dirty = True
+                if previous_date and self._file_date != previous_date:
+                    # New day: yesterday's neighbours may now be due for archiving
+                    self._rotate_old_logs()
+
+            now = time.monotonic()
+            urgent = bool(markers) or stop
+            if dirty and (urgent or now - last_flush >= self.flush_interval):
+                self._flush_file(fsync=False)
+                last_flush, dirty, unsynced = now, False, True
+            if unsynced and self.fsync_interval is not None and (
+                urgent or now - last_fsync >= self.fsync_interval
+            ):
+                self._flush_file(fsync=True)
+                last_fsync, unsynced = now, False
+
+            for marker in markers:
+                marker.set()
+            if stop:
+                self._close_file()
+                return
+
+    def _write_batch(self, batch: list):
+        if not batch:
+            return
+        with self._file_lock:
+            self._write_locked(batch)
+
+    def _write_locked(self, batch: list):
+        try:
+            # Consecutive entries of the same day go out in one write
+            runs = []
+            for date_str, line in batch:
+                if runs and runs[-1][0] == date_str:
+                    runs[-1][1].append(line)
+                else:
+                    runs.append((date_str, [line]))
+            for date_str, lines in runs:
+                if date_str != self._file_date:
+                    # Day rollover: the previous day's file is finished
+                    self._close_locked()
+                    path = os.path.join(self.log_dir, f"aurora_{date_str}.jsonl")
+                    self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    self._file_date = date_str
+                data = "".join(lines).encode("utf-8")
+                while data:
+                    data = data[os.write(self._fd, data):]
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[Logger] Error writing log: {e}")
+            self._close_locked()
+
+    def _flush_file(self, fsync: bool):
+        # Writes are unbuffered, so only an fsync has anything to do
+        if not fsync:
+            return
+        with self._file_lock:
+            if self._fd is None:
+                return
+            try:
+                os.fsync(self._fd)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[Logger] Error flushing log: {e}")
+
+    def _close_file(self):
+        with self._file_lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        if self._fd is None:
+            return
+        try:
+            if self.fsync_interval is not None:
+                os.fsync(self._fd)
+            os.close(self._fd)
+        except Exception as e:
+            print(f"[Logger] Error closing log: {e}")
+        self._fd = None
+        self._file_date = None
 
     def read_day_logs(self, date_str: str = None) -> list:
         """
-        Read all log entries for a given day.
+        Read all log entries for a given day (plain or archived).
 
         Args:
             date_str: Date in YYYY-MM-DD format. Defaults to today.
@@ -67,38 +301,89 @@ class InteractionLogger:
         if date_str is None:
             date_str = datetime.now().strftime("%Y-%m-%d")
 
-        log_path = os.path.join(self.log_dir, f"aurora_{date_str}.jsonl")
+        # Make our own queued entries visible first
+        self.flush(timeout=5)
+
         entries = []
+        try:
+            entries.extend(self._iter_day(date_str))
+        except Exception as e:
+            print(f"[Logger] Error reading logs: {e}")
+        return entries
 
-        if not os.path.exists(log_path):
-            return entries
+    def iter_logs(
+        self,
+        start=None,
+        end=None,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[dict]:
+        """
+        Streams log entries between start and end (datetime or ISO string,
+        inclusive; None = unbounded), optionally only the given event types.
+        Archived days decompress only the blocks that can match.
+        """
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+        if end and len(end) == 10:
+            end += "T23:59:59.999999"  # a bare date includes the whole day
+        types = set(types) if types else None
 
-        try:
+        self.flush(timeout=5)
+        for date_str in self.get_available_dates():
+            if start and date_str < start[:10]:
+                continue
+            if end and date_str > end[:10]:
+                break
+            yield from self._iter_day(date_str, start, end, types)
+
+    def _iter_day(self, date_str: str, start: str = None, end: str = None, types: set = None):
+        # Archived entries first; a plain file for the same day holds only
+        # entries appended after archiving, so both are read
+        if self.archive.has_day(date_str):
+            yield from self.archive.iter_day(date_str, start, end, types)
+        log_path = os.path.join(self.log_dir, f"aurora_{date_str}.jsonl")
+        if os.path.exists(log_path):
             with open(log_path, "r", encoding="utf-8") as f:
                 for line in f:
                     line = line.strip()
-                    if line:
-                        entries.append(json.loads(line))
-        except Exception as e:
-            print(f"[Logger] Error reading logs: {e}")
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn line (crash or interleaved writer)
+                    if entry_matches(entry, start, end, types):
+                        yield entry
 
-        return entries
+    def day_fingerprint(self, date_str: str) -> dict:
+        """
+        Cheap change marker for a day: the plain file's size and mtime plus
+        the archive index's block count and size. No entry is read, so an
+        equal fingerprint means the day is unchanged; a different one only
+        means it may have changed (e.g. it was archived since).
+        """
+        try:
+            stat = os.stat(os.path.join(self.log_dir, f"aurora_{date_str}.jsonl"))
+            plain = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            plain = None
+        return {"plain": plain, "archive": self.archive.fingerprint(date_str)}
 
     def get_available_dates(self) -> list:
-        """Returns list of dates (YYYY-MM-DD) that have log files."""
+        """Returns list of dates (YYYY-MM-DD) that have log files (plain or archived)."""
         pattern = os.path.join(self.log_dir, "aurora_*.jsonl")
         files = glob.glob(pattern)
-        dates = []
-        for f in sorted(files):
+        dates = set(self.archive.available_dates())
+        for f in files:
             basename = os.path.basename(f)
             # Extract date from aurora_YYYY-MM-DD.jsonl
             date_part = basename.replace("aurora_", "").replace(".jsonl", "")
-            dates.append(date_part)
-        return dates
+            dates.add(date_part)
+        return sorted(dates)
 
     def _rotate_old_logs(self):
-        """Delete log files older than MAX_LOG_DAYS."""
-        cutoff = datetime.now() - timedelta(days=self.MAX_LOG_DAYS)
+        """Archive log files older than ARCHIVE_AFTER_DAYS (and prune the archive)."""
+        cutoff = datetime.now() - timedelta(days=self.ARCHIVE_AFTER_DAYS)
         pattern = os.path.join(self.log_dir, "aurora_*.jsonl")
 
         for filepath in glob.glob(pattern):
@@ -107,7 +392,13 @@ class InteractionLogger:
             try:
                 file_date = datetime.strptime(date_part, "%Y-%m-%d")
                 if file_date < cutoff:
-                    os.remove(filepath)
-                    print(f"[Logger] Rotated old log: {basename}")
+                    index = self.archive.archive_day(filepath, date_part, remove_source=True)
+                    entries = sum(b["count"] for b in index["blocks"])
+                    print(f"[Logger] Archived old log: {basename} ({entries} entries)")
+            except FileNotFoundError:
+                pass  # archived concurrently by another process
             except (ValueError, OSError) as e:
                 print(f"[Logger] Could not rotate {basename}: {e}")
+
+        if self.ARCHIVE_RETENTION_DAYS:
+            self.archive.prune(self.ARCHIVE_RETENTION_DAYS)
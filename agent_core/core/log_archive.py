@@ -0,0 +1,198 @@
+"""
+LogArchive — Compressed, indexed storage for old interaction logs.
+
+A rotated day (aurora_YYYY-MM-DD.jsonl) becomes:
+- aurora_YYYY-MM-DD.jsonl.gz: a sequence of independent gzip members, one
+  per block of entries (the file is still a valid .gz for zcat/gunzip);
+- aurora_YYYY-MM-DD.idx.json: per block, its byte offset/length, first and
+  last timestamp, entry count and the event types it contains.
+
+Readers consult the index and decompress only the blocks that can match a
+time range / type filter, one block at a time, so months of history stay
+small on disk and never have to be loaded whole.
+
+Archiving a day that is already archived (entries logged for that date
+after it was rotated) appends new blocks instead of replacing the old ones.
+Several processes rotate logs (web server, worker daemon, run_sleep), so
+archive_day holds an flock on the day's aurora_YYYY-MM-DD.lock from reading
+the index until the source file is removed: the same entries are never
+appended twice.
+"""
+
+import fcntl
+import glob
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+
+INDEX_VERSION = 1
+
+
+class LogArchive:
+    """Writes and reads gzip block-framed log archives with a sidecar index."""
+
+    BLOCK_ENTRIES = 500
+    BLOCK_BYTES = 256 * 1024  # uncompressed bytes per block
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+    def data_path(self, date_str: str) -> str:
+        return os.path.join(self.archive_dir, f"aurora_{date_str}.jsonl.gz")
+
+    def index_path(self, date_str: str) -> str:
+        return os.path.join(self.archive_dir, f"aurora_{date_str}.idx.json")
+
+    def lock_path(self, date_str: str) -> str:
+        return os.path.join(self.archive_dir, f"aurora_{date_str}.lock")
+
+    def has_day(self, date_str: str) -> bool:
+        return os.path.exists(self.index_path(date_str))
+
+    def available_dates(self) -> list:
+        pattern = os.path.join(self.archive_dir, "aurora_*.idx.json")
+        return sorted(
+            os.path.basename(p)[len("aurora_"):-len(".idx.json")] for p in glob.glob(pattern)
+        )
+
+    def archive_day(self, jsonl_path: str, date_str: str, remove_source: bool = False) -> dict:
+        """
+        Compresses a day's JSONL file into the archive (after any blocks the
+        day already has there) and, with remove_source, deletes the file
+        before releasing the day's lock. Returns the index. Raises
+        FileNotFoundError if another process archived the file first.
+        """
+        with open(self.lock_path(date_str), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                index = self._archive_locked(jsonl_path, date_str)
+                if remove_source:
+                    os.remove(jsonl_path)
+                return index
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _archive_locked(self, jsonl_path: str, date_str: str) -> dict:
+        data_path, index_path = self.data_path(date_str), self.index_path(date_str)
+        suffix = f".{os.getpid()}.tmp"
+
+        if not os.path.exists(jsonl_path):
+            raise FileNotFoundError(jsonl_path)  # archived by another process while we waited
+        blocks = self._load_index(date_str)["blocks"] if self.has_day(date_str) else []
+        if blocks:
+            shutil.copyfile(data_path, data_path + suffix)
+        with open(jsonl_path, "r", encoding="utf-8") as src, open(data_path + suffix, "ab" if blocks else "wb") as dst:
+            for lines, entries in self._read_blocks(src):
+                payload = gzip.compress("".join(lines).encode("utf-8"), self.COMPRESS_LEVEL)
+                timestamps = [e.get("timestamp", "") for e in entries]
+                types = {}
+                for e in entries:
+                    types[e.get("type", "")] = types.get(e.get("type", ""), 0) + 1
+                blocks.append({
+                    "offset": dst.tell(),
+                    "length": len(payload),
+                    "count": len(entries),
+                    "first_ts": min(timestamps),
+                    "last_ts": max(timestamps),
+                    "types": types,
+                })
+                dst.write(payload)
+
+        index = {"version": INDEX_VERSION, "date": date_str, "blocks": blocks}
+        with open(index_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+        # Data first, index last: an index always points at complete data
+        os.replace(data_path + suffix, data_path)
+        os.replace(index_path + suffix, index_path)
+        return index
+
+    def iter_day(
+        self,
+        date_str: str,
+        start: str = None,
+        end: str = None,
+        types: Optional[Iterable[str]] = None,
+    ) -> Iterator[dict]:
+        """Yields the day's entries within [start, end] (ISO strings) and types."""
+        try:
+            index = self._load_index(date_str)
+        except (OSError, ValueError):
+            return
+        types = set(types) if types else None
+
+        with open(self.data_path(date_str), "rb") as data:
+            for block in index["blocks"]:
+                if start and block["last_ts"] < start:
+                    continue
+                if end and block["first_ts"] > end:
+                    continue
+                if types and not types.intersection(block["types"]):
+                    continue
+
+                data.seek(block["offset"])
+                payload = gzip.decompress(data.read(block["length"]))
+                for line in payload.decode("utf-8").splitlines():
+                    entry = json.loads(line)
+                    if entry_matches(entry, start, end, types):
+                        yield entry
+
+    def fingerprint(self, date_str: str) -> Optional[list]:
+        """The day's [block count, archived bytes], from the index alone (None if not archived)."""
+        try:
+            blocks = self._load_index(date_str)["blocks"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return [len(blocks), sum(b["length"] for b in blocks)]
+
+    def _load_index(self, date_str: str) -> dict:
+        with open(self.index_path(date_str), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def prune(self, retention_days: int):
+        """Deletes archived days older than retention_days."""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        for date_str in self.available_dates():
+            if date_str < cutoff:
+                for path in (self.index_path(date_str), self.data_path(date_str), self.lock_path(date_str)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                print(f"[Logger] Pruned archived log: {date_str}")
+
+    def _read_blocks(self, src):
+        """Splits a JSONL stream into blocks of (raw lines, parsed entries)."""
+        lines, entries, size = [], [], 0
+        for line in src:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn line from a crash; nothing to index
+            if not line.endswith("\n"):
+                line += "\n"
+            lines.append(line)
+            entries.append(entry)
+            size += len(line)
+            if len(entries) >= self.BLOCK_ENTRIES or size >= self.BLOCK_BYTES:
+                yield lines, entries
+                lines, entries, size = [], [], 0
+        if entries:
+            yield lines, entries
+
+
+def entry_matches(entry: dict, start: str = None, end: str = None, types: set = None) -> bool:
+    timestamp = entry.get("timestamp", "")
+    if start and timestamp < start:
+        return False
+    if end and timestamp > end:
+        return False
+    return not types or entry.get("type") in types
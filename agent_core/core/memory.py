@@ -3,16 +3,51 @@ MemoryManager v5.0 — Long-term vector memory with fallback support.
 
 Primary: OpenAI Embeddings (text-embedding-3-small)
 Fallback: HuggingFace local embeddings (all-MiniLM-L6-v2, CPU-friendly)
+
+Both providers are wrapped in CachedEmbeddings, so every recall, save and
+forget reuses vectors already computed for the same text.
+
+Initialization never calls the embedding API. The provider is validated by
+the first real recall/save/forget; if OpenAI fails before it ever worked,
+the manager switches to the local backend and retries transparently.
+Failures are recorded in `health` instead of stalling startup.
+
+Saves are write-behind: save() queues the text and a BatchWriter embeds and
+upserts queued texts in batches on a background thread. Each batch goes
+through the MemoryDeduplicator first, so near-duplicates bump an existing
+memory instead of piling up; compact() dedupes the whole store offline.
+
+recall() returns the plain top-k (the search_memory tool relies on loose
+matches). recall_scored(), used by the orchestrator for every turn, keeps
+only memories whose relevance reaches MIN_RELEVANCE: top-k alone would
+attach something to every turn once the store has data.
 """
 
 import os
+import threading
+from datetime import datetime
 from langchain_chroma import Chroma
 
+from agent_core.core.embedding_cache import CachedEmbeddings, EmbeddingCache
+from agent_core.core.memory_dedup import MemoryDeduplicator
+from agent_core.core.memory_writer import BatchWriter
+
 
 class MemoryManager:
+    MIN_RELEVANCE = 0.35  # recall_scored() drops memories below this relevance
+
     def __init__(self, storage_path="./data/vector_store"):
         self.vector_db = None
         self.embeddings = None
+        self.storage_path = storage_path
+        self.health = {"provider": None, "status": "unavailable", "last_error": None, "checked_at": None}
+        self._switch_lock = threading.Lock()
+        self.embedding_cache = EmbeddingCache(
+            os.path.join(os.path.dirname(os.path.abspath(storage_path)), "embedding_cache.sqlite")
+        )
+        self.writer = BatchWriter(self._write_batch)
+        self.deduplicator = MemoryDeduplicator()
+        self.dedup_stats = {"inserted": 0, "merged": 0}
         self._init_embeddings(storage_path)
 
     def _init_embeddings(self, storage_path: str):
@@ -37,18 +72,22 @@ class MemoryManager:
         try:
             from langchain_openai import OpenAIEmbeddings
 
-            self.embeddings = OpenAIEmbeddings(
+            self.embeddings = CachedEmbeddings(
+                OpenAIEmbeddings(
+                    model="text-embedding-3-small",
+                    openai_api_key=api_key,
+                ),
+                provider="openai",
                 model="text-embedding-3-small",
-                openai_api_key=api_key,
+                cache=self.embedding_cache,
             )
-            # Quick validation — embed a single word to test connectivity
-            self.embeddings.embed_query("test")
-
+            # No connectivity probe here — the first real call validates it
             self.vector_db = Chroma(
                 persist_directory=storage_path,
                 embedding_function=self.embeddings,
                 collection_name="agent_memories",
             )
+            self._set_health("openai", "unverified")
             print(f"[Memory] ✓ OpenAI embeddings initialized at {storage_path}")
             return True
         except Exception as e:
@@ -61,10 +100,15 @@ class MemoryManager:
         try:
             from langchain_huggingface import HuggingFaceEmbeddings
 
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
-                encode_kwargs={"normalize_embeddings": True},
+            self.embeddings = CachedEmbeddings(
+                HuggingFaceEmbeddings(
+                    model_name="all-MiniLM-L6-v2",
+                    model_kwargs={"device": "cpu"},
+                    encode_kwargs={"normalize_embeddings": True},
+                ),
+                provider="huggingface",
+                model="all-MiniLM-L6-v2",
+                cache=self.embedding_cache,
             )
 
             # Use a different collection to avoid dimension mismatch
@@ -73,6 +117,7 @@ class MemoryManager:
                 embedding_function=self.embeddings,
                 collection_name="agent_memories_local",
             )
+            self._set_health("huggingface", "unverified")
             print(f"[Memory] ✓ HuggingFace local embeddings initialized at {storage_path}")
             return True
         except ImportError:
@@ -86,13 +131,54 @@ class MemoryManager:
     def is_available(self) -> bool:
         return self.vector_db is not None
 
+    def _set_health(self, provider: str, status: str, error: Exception = None):
+        self.health = {
+            "provider": provider,
+            "status": status,
+            "last_error": str(error) if error else self.health.get("last_error"),
+            "checked_at": datetime.now().isoformat(),
+        }
+
+    def _call(self, operation):
+        """
+        Runs a vector store operation, validating the provider on first use.
+        If OpenAI fails before ever succeeding, falls back to the local
+        backend and retries once. Later failures are recorded and re-raised.
+        """
+        provider = self.health["provider"]
+        try:
+            result = operation()
+            if self.health["status"] != "ok":
+                self._set_health(provider, "ok")
+            return result
+        except Exception as e:
+            if provider == "openai" and self.health["status"] == "unverified":
+                with self._switch_lock:
+                    # Another thread may have switched already
+                    if self.health["provider"] == "openai":
+                        print(f"[Memory] ⚠ OpenAI embeddings failed on first use: {e}. Switching to fallback...")
+                        self.vector_db = None
+                        self.embeddings = None
+                        if not self._try_huggingface(self.storage_path):
+                            self._set_health(None, "unavailable", e)
+                            raise
+                        self.health["last_error"] = str(e)
+                return self._call(operation)
+
+            self._set_health(provider, "degraded", e)
+            raise
+
+    def cache_stats(self) -> dict:
+        """Embedding cache hit/miss counters."""
+        return self.embedding_cache.get_stats()
+
     def recall(self, query: str, k: int = 3) -> str:
         """Retrieves relevant memories for a given query."""
         if not self.vector_db:
             return ""
 
         try:
-            docs = self.vector_db.similarity_search(query, k=k)
+            docs = self._call(lambda: self.vector_db.similarity_search(query, k=k))
             if not docs:
                 return ""
             return "\n".join(f"- {doc.page_content}" for doc in docs)
@@ -100,21 +186,166 @@ class MemoryManager:
             print(f"[Memory] Recall error: {e}")
             return ""
 
+    def recall_scored(self, query: str, k: int = 3) -> tuple:
+        """
+        Like recall(), but drops memories below MIN_RELEVANCE and also
+        returns the best relevance score (0.0 when nothing relevant was
+        found), so callers can tell a strong match from a loose one.
+        """
+        if not self.vector_db:
+            return "", 0.0
+
+        try:
+            scored = self._call(
+                lambda: self.vector_db.similarity_search_with_relevance_scores(query, k=k)
+            )
+            scored = [(doc, score) for doc, score in scored if score >= self.MIN_RELEVANCE]
+            if not scored:
+                return "", 0.0
+            context = "\n".join(f"- {doc.page_content}" for doc, _ in scored)
+            return context, max(score for _, score in scored)
+        except Exception as e:
+            print(f"[Memory] Recall error: {e}")
+            return "", 0.0
+
     def save(self, text: str):
-        """Stores a new memory."""
+        """Queues a new memory. It is written in the background."""
+        self.save_many([text])
+
+    def save_many(self, texts: list):
+        """Queues several memories; they share one embedding request."""
         if not self.vector_db:
             return
         try:
-            self.vector_db.add_texts([text])
+            self.writer.add(texts)
         except Exception as e:
             print(f"[Memory] Save error: {e}")
 
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every queued memory is written. Returns False on timeout
+        or if a batch failed since the last flush (see writer.last_error).
+        """
+        return self.writer.flush(timeout)
+
+    def _write_batch(self, texts: list):
+        self._call(lambda: self._dedup_and_write(texts))
+
+    def _dedup_and_write(self, texts: list):
+        """Collapses the batch, merges hits into stored memories, inserts the rest."""
+        vectors = self.embeddings.embed_documents(texts)
+        candidates = []  # (text, vector, hits)
+        for group in self.deduplicator.clusters(vectors):
+            best = max(group, key=lambda i: len(texts[i]))
+            candidates.append((texts[best], vectors[best], len(group)))
+
+        collection = self.vector_db._collection
+        neighbours = None
+        if collection.count():
+            neighbours = collection.query(
+                query_embeddings=[c[1] for c in candidates],
+                n_results=1,
+                include=["embeddings", "documents", "metadatas"],
+            )
+
+        updates = {}  # id -> [document, metadata, embedding]
+        inserts = []
+        for i, (text, vector, hits) in enumerate(candidates):
+            if neighbours and neighbours["ids"][i]:
+                doc_id = neighbours["ids"][i][0]
+                current = updates.get(doc_id) or [
+                    neighbours["documents"][i][0],
+                    neighbours["metadatas"][i][0],
+                    neighbours["embeddings"][i][0],
+                ]
+                if self.deduplicator.is_duplicate(vector, current[2]):
+                    document, metadata, changed = self.deduplicator.merge(current[0], current[1], text, hits)
+                    updates[doc_id] = [document, metadata, vector if changed else current[2]]
+                    continue
+            inserts.append((text, vector, hits))
+
+        if updates:
+            collection.update(
+                ids=list(updates),
+                documents=[u[0] for u in updates.values()],
+                metadatas=[u[1] for u in updates.values()],
+                embeddings=[list(map(float, u[2])) for u in updates.values()],
+            )
+        if inserts:
+            metadatas = [self.deduplicator.new_metadata(hits) for _, _, hits in inserts]
+            collection.add(
+                ids=[m["id"] for m in metadatas],
+                documents=[text for text, _, _ in inserts],
+                metadatas=metadatas,
+                embeddings=[list(map(float, vector)) for _, vector, _ in inserts],
+            )
+
+        self.dedup_stats["inserted"] += len(inserts)
+        self.dedup_stats["merged"] += len(texts) - len(inserts)
+        if updates:
+            print(f"[Memory] {len(texts) - len(inserts)} near-duplicate(s) merged into {len(updates)} memories")
+
+    def compact(self, dry_run: bool = False) -> dict:
+        """
+        Offline dedup of the whole store: each cluster of near-duplicates
+        becomes its oldest memory, with the longest text and summed hits.
+        """
+        if not self.vector_db:
+            return {"total": 0, "removed": 0, "clusters": 0}
+        save_error = None
+        if not self.flush(timeout=30):
+            save_error = self.writer.last_error or "pending saves did not finish in time"
+            print(f"[Memory] Compacting without some pending saves: {save_error}")
+
+        collection = self.vector_db._collection
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        ids, documents = data["ids"], data["documents"]
+        metadatas = [m or {} for m in data["metadatas"]]
+        embeddings = data["embeddings"]
+
+        # Oldest first, so the surviving id is the original memory
+        order = sorted(range(len(ids)), key=lambda i: metadatas[i].get("created_at", ""))
+        groups = [
+            [order[i] for i in group]
+            for group in self.deduplicator.clusters([embeddings[i] for i in order])
+            if len(group) > 1
+        ]
+
+        removed = []
+        for group in groups:
+            keeper, others = group[0], group[1:]
+            document, metadata, vector = documents[keeper], metadatas[keeper], embeddings[keeper]
+            for other in others:
+                hits = int(metadatas[other].get("hits", 1))
+                document, metadata, changed = self.deduplicator.merge(document, metadata, documents[other], hits)
+                if changed:
+                    vector = embeddings[other]
+            removed.extend(ids[i] for i in others)
+            if not dry_run:
+                collection.update(
+                    ids=[ids[keeper]],
+                    documents=[document],
+                    metadatas=[metadata],
+                    embeddings=[list(map(float, vector))],
+                )
+
+        if removed and not dry_run:
+            collection.delete(ids=removed)
+
+        result = {"total": len(ids), "removed": len(removed), "clusters": len(groups)}
+        if save_error:
+            result["save_error"] = save_error
+        return result
+
     def forget(self, query: str) -> str:
         """Attempts to delete memories matching a query."""
         if not self.vector_db:
             return "Memória não disponível."
         try:
-            docs = self.vector_db.similarity_search(query, k=5)
+            # Pending saves must land first or they could survive the forget
+            if not self.flush(timeout=10):
+                print(f"[Memory] Forget ran before every pending save landed: {self.writer.last_error}")
+            docs = self._call(lambda: self.vector_db.similarity_search(query, k=5))
             if not docs:
                 return "Nenhuma memória encontrada para esse tópico."
             ids = [doc.metadata.get("id", str(i)) for i, doc in enumerate(docs)]
@@ -0,0 +1,79 @@
+"""
+MemoryDeduplicator — Keeps near-duplicate memories out of the vector store.
+
+Every batch the BatchWriter hands to MemoryManager is checked twice by
+cosine similarity of the embeddings:
+1. inside the batch: near-identical candidates collapse into one (the
+   longest text wins, since it is usually the most specific);
+2. against the store: a candidate whose nearest stored memory is above
+   THRESHOLD does not become a new document. The existing one is bumped
+   (hits, updated_at) and refreshed with the candidate text if that one is
+   longer.
+
+compact() applies the same rule to the whole store offline
+(scripts/compact_memory.py).
+"""
+
+import uuid
+from datetime import datetime
+from typing import List, Tuple
+
+import numpy as np
+
+
+class MemoryDeduplicator:
+    """Similarity-based merge rules shared by the write path and compact()."""
+
+    THRESHOLD = 0.92  # cosine similarity above which two memories are the same
+
+    def __init__(self, threshold: float = None):
+        self.threshold = threshold or self.THRESHOLD
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def clusters(self, vectors) -> List[List[int]]:
+        """
+        Greedy grouping: each not-yet-grouped item claims every later item
+        above the threshold. Returns groups of indices, first item first.
+        """
+        if len(vectors) == 0:
+            return []
+        matrix = self._normalize(vectors)
+        taken = np.zeros(len(matrix), dtype=bool)
+        groups = []
+        for i in range(len(matrix)):
+            if taken[i]:
+                continue
+            sims = matrix[i + 1:] @ matrix[i]
+            members = [i] + [i + 1 + int(j) for j in np.nonzero(sims >= self.threshold)[0] if not taken[i + 1 + j]]
+            taken[members] = True
+            groups.append(members)
+        return groups
+
+    def is_duplicate(self, a, b) -> bool:
+        a, b = self._normalize(a)[0], self._normalize(b)[0]
+        return float(a @ b) >= self.threshold
+
+    @staticmethod
+    def new_metadata(hits: int = 1) -> dict:
+        now = datetime.now().isoformat()
+        return {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now, "hits": hits}
+
+    @staticmethod
+    def merge(document: str, metadata: dict, candidate: str, hits: int = 1) -> Tuple[str, dict, bool]:
+        """
+        Merges a duplicate candidate into a stored memory.
+        Returns (document, metadata, text_changed).
+        """
+        metadata = dict(metadata or {})
+        metadata["hits"] = int(metadata.get("hits", 1)) + hits
+        metadata["updated_at"] = datetime.now().isoformat()
+        if len(candidate) > len(document):
+            return candidate, metadata, True
+        return document, metadata, False
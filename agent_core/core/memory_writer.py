@@ -0,0 +1,139 @@
+"""
+BatchWriter — Write-behind queue for long-term memory saves.
+
+Texts are queued and a background thread hands them to the write function
+in batches, so N saves cost one embedding request and one Chroma upsert
+instead of N, and a save never blocks the user-facing turn.
+
+flush() waits until everything queued so far is written and reports
+whether it all landed: a batch whose write raised is lost, and the next
+flush() returns False (last_error keeps the cause). close() flushes and
+stops the thread; writers still open at exit are closed by one atexit hook
+that only holds them weakly.
+"""
+
+import atexit
+import threading
+import weakref
+from typing import Callable, List
+
+
+_OPEN_WRITERS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_writers():
+    for writer in list(_OPEN_WRITERS):
+        writer.close()
+
+
+class BatchWriter:
+    """Batches texts and writes them from a background thread."""
+
+    BATCH_SIZE = 32
+    FLUSH_INTERVAL = 2.0  # seconds to wait for a batch to fill up
+
+    def __init__(
+        self,
+        write_fn: Callable[[List[str]], None],
+        batch_size: int = None,
+        flush_interval: float = None,
+    ):
+        self.write_fn = write_fn
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else self.FLUSH_INTERVAL
+
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "errors": 0, "lost": 0}
+        self.last_error = None
+        self._lost_since_flush = 0
+        self._queue = []
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        _OPEN_WRITERS.add(self)
+
+    def add(self, texts: List[str]):
+        """Queues texts for writing. Returns immediately."""
+        texts = [t for t in texts if t]
+        if not texts:
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchWriter is closed")
+            self._queue.extend(texts)
+            self.stats["queued"] += len(texts)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="aurora-memory-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every queued text is written. Returns False on timeout,
+        or if any batch failed since the previous flush() (its texts are lost).
+        """
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                drained = self._cond.wait_for(
+                    lambda: not self._queue and not self._in_flight, timeout=timeout
+                )
+            finally:
+                self._flush_waiters -= 1
+            lost, self._lost_since_flush = self._lost_since_flush, 0
+            return drained and not lost
+
+    def close(self, timeout: float = 30.0):
+        """Flushes pending writes and stops the background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        _OPEN_WRITERS.discard(self)
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + self._in_flight
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                # Give the batch a moment to fill, unless someone is waiting
+                self._cond.wait_for(
+                    lambda: len(self._queue) >= self.batch_size
+                    or self._closed
+                    or self._flush_waiters,
+                    timeout=self.flush_interval,
+                )
+                batch = self._queue[: self.batch_size]
+                del self._queue[: self.batch_size]
+                self._in_flight = len(batch)
+
+            try:
+                self.write_fn(batch)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+            except Exception as e:
+                with self._cond:
+                    self.stats["errors"] += 1
+                    self.stats["lost"] += len(batch)
+                    self._lost_since_flush += len(batch)
+                    self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[Memory] Batch save error ({len(batch)} texts): {e}")
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
@@ -7,16 +7,23 @@ All interactions are logged for later consolidation.
 
 Cognitive Flow:
 1. Log Input → record user message
-2. Memory Recall → retrieve relevant context
-3. Gatekeeper → classify SHALLOW vs DEEP
+2. Memory Recall ‖ Gatekeeper → retrieve context and classify SHALLOW vs DEEP
+   concurrently (gatekeeper re-runs only if a strongly relevant memory
+   could change a SHALLOW call)
+3. Speculative SHALLOW path (quick reflection + first brain call) runs
+   alongside classification; kept on SHALLOW, dropped on DEEP.
+   With SHALLOW_FAST_LANE a SHALLOW turn is answered by that one call,
+   unless it asks for tools (then it continues below as usual)
 4. Thinking → always think (depth varies)
 5. Execution → tool calls with runtime critique
 6. Voice Synthesis → transform brain output into natural speech
+   (streamed as final_answer_delta events, closed by final_answer)
 7. Log Output → record everything for sleep consolidation
 """
 
 import os
-from typing import Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Optional
 from langchain_core.messages import (
     HumanMessage, AIMessage, SystemMessage, ToolMessage,
 )
@@ -24,18 +31,53 @@ from langchain_core.messages import (
 from agent_core.core.events import AuroraEvent
 from agent_core.core.memory import MemoryManager
 from agent_core.core.interaction_logger import InteractionLogger
+from agent_core.core.history_manager import HistoryManager
+from agent_core.core.tool_executor import ToolExecutor
+from agent_core.core.plan_scheduler import PlanGraph, PlanScheduler
+from agent_core.core.speculation import ShallowSpeculation, SpeculationTracker
+from agent_core.core.tool_registry import ToolRegistry
 from agent_core.modules.cognitive.gatekeeper import Gatekeeper
 from agent_core.modules.cognitive.thinker import Thinker
 from agent_core.modules.cognitive.critic import Critic
 from agent_core.modules.effectors.voice_synthesizer import VoiceSynthesizer
-from agent_core.utils.tool_loader import load_dynamic_tools
 from agent_core.utils.llm_factory import LLMFactory
-from agent_core.utils.soul_loader import load_soul
+from agent_core.utils import prompt_layout
 from agent_core.basic_tools import BASIC_TOOLS
 from agent_core.memory_tools import MemoryTools
 
 
+# Shared pool for the concurrent pre-processing stage (recall, gatekeeper,
+# quick reflection, speculative brain call). Those calls are I/O bound, so
+# a small pool is enough.
+_PREPROCESS_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix="aurora-pre")
+
+
 class Orchestrator:
+    # Stream the voice output as final_answer_delta events before the
+    # closing final_answer (interfaces that ignore deltas are unaffected).
+    STREAM_VOICE = True
+
+    # Start the SHALLOW pipeline while the Gatekeeper is still deciding
+    # (see core/speculation.py); the tracker may still skip a given turn.
+    SPECULATE_SHALLOW = True
+
+    # SHALLOW turns answer with one combined call (soul + memory + input,
+    # tools bound) that writes the persona text directly; brain → voice only
+    # happens if that call asks for tools. False restores the full pipeline
+    # (quick reflection → brain → voice).
+    SHALLOW_FAST_LANE = True
+
+    # A SHALLOW decision is re-checked with the recalled memories only when
+    # the best one is at least this relevant (loose matches keep the call).
+    MEMORY_RECHECK_RELEVANCE = 0.6
+
+    # Heavy state shared between an engine and its fork()ed sessions
+    SHARED_ATTRS = (
+        "memory", "gatekeeper", "thinker", "critic", "voice", "logger",
+        "all_tools", "tools_map", "soul_message", "tools_dir", "tool_registry",
+        "tools_version", "speculation",
+    )
+
     def __init__(self):
         self.memory = None
         self.gatekeeper = None
@@ -46,7 +88,13 @@ class Orchestrator:
         self.all_tools = []
         self.tools_map = {}
         self.chat_history = []
+        self.history = HistoryManager()
+        self.tool_executor = ToolExecutor()
+        self.plan_scheduler = PlanScheduler()
+        self.speculation = SpeculationTracker()
         self.soul_message = None
+        self.tool_registry = None
+        self.tools_version = 0
 
         self.tools_dir = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -62,21 +110,21 @@ class Orchestrator:
             # 2. Memory
             self.memory = MemoryManager()
 
-            # 3. Tools (basic + dynamic + memory)
-            dynamic_tools = load_dynamic_tools(self.tools_dir)
-            memory_tools = self._build_memory_tools()
-            self.all_tools = BASIC_TOOLS + dynamic_tools + memory_tools
-            self.tools_map = {t.name: t for t in self.all_tools}
-
-            # 4. Soul (needs tools list for description)
-            self.soul_message = load_soul(
-                tools_list=self.all_tools,
+            # 3. Tools (basic + dynamic + memory), hot-reloaded from tools_library
+            # 4. Soul (needs tools list for description) — rebuilt by the registry
+            self.tool_registry = ToolRegistry(
+                self.tools_dir,
+                builtin_tools=BASIC_TOOLS,
+                extra_tools=self._build_memory_tools(),
                 cwd=os.getcwd(),
             )
+            self._apply_tools(self.tool_registry.snapshot)
             self.chat_history = [self.soul_message]
 
             # 5. Cognitive Modules
             self.gatekeeper = Gatekeeper()
+            # Local intent model learns from past LLM decisions, off the startup path
+            _PREPROCESS_POOL.submit(self.gatekeeper.train_from_logs, self.logger)
             self.thinker = Thinker()
             self.critic = Critic()
 
@@ -101,6 +149,7 @@ class Orchestrator:
         try:
             # 1. Reset Chat History to Soul only
             self.chat_history = [self.soul_message] if self.soul_message else []
+            self.history.reset()
             
             # 2. Log the reset
             if self.logger:
@@ -113,6 +162,56 @@ class Orchestrator:
         except Exception as e:
             return AuroraEvent(type="error", content=f"Reset failed: {e}")
 
+    def fork(self) -> "Orchestrator":
+        """
+        Returns a new session engine that shares this engine's heavy, immutable
+        parts (logger, memory, tools, soul, cognitive modules and their LLM
+        clients) but has its own chat_history. Requires initialize() first.
+        """
+        session = Orchestrator()
+        for attr in self.SHARED_ATTRS:
+            setattr(session, attr, getattr(self, attr))
+        session.chat_history = [self.soul_message] if self.soul_message else []
+        return session
+
+    def sync_tools(self) -> Optional[AuroraEvent]:
+        """
+        Picks up changes in tools_library (called between turns).
+        Returns a tools_updated event if this engine's tool set changed.
+        """
+        if not self.tool_registry:
+            return None
+        self.tool_registry.refresh()
+        snapshot = self.tool_registry.snapshot
+        if snapshot.version == self.tools_version:
+            return None
+
+        self._apply_tools(snapshot)
+        self.logger.log("system", "Tools reloaded", {
+            "tools_count": len(self.all_tools), **snapshot.changes,
+        })
+        return AuroraEvent(
+            type="tools_updated",
+            content=f"{len(self.all_tools)} ferramentas disponíveis.",
+            metadata={"tools_count": len(self.all_tools), **snapshot.changes},
+        )
+
+    def _apply_tools(self, snapshot):
+        """Swaps in a registry snapshot: tools, name map and soul."""
+        old_soul = self.soul_message
+        self.all_tools = snapshot.tools
+        self.tools_map = snapshot.tools_map
+        self.soul_message = snapshot.soul_message
+        self.tools_version = snapshot.version
+        if self.chat_history and self.chat_history[0] is old_soul:
+            self.chat_history[0] = self.soul_message
+        if self.voice and self.soul_message:
+            self.voice.update_soul(self.soul_message.content)
+
+    def cancel_tools(self) -> int:
+        """Cancels the tool calls running for this session. Returns how many."""
+        return self.tool_executor.cancel()
+
     def _build_memory_tools(self):
         """Build memory tools if memory is available."""
         if not self.memory or not self.memory.is_available:
@@ -123,31 +222,26 @@ class Orchestrator:
     def process_message(self, user_input: str) -> Generator[AuroraEvent, None, None]:
         """Main cognitive loop."""
 
-        # ── 0. Log Input ──
+        # ── 0. Log Input (and pick up new/changed tools between turns) ──
         self.logger.log("user_input", user_input)
+        tools_event = self.sync_tools()
+        if tools_event:
+            yield tools_event
 
-        # ── 1. Memory Recall ──
-        memory_context = ""
-        if self.memory and self.memory.is_available:
-            memory_context = self.memory.recall(user_input)
-            if memory_context:
-                self.logger.log("memory_recall", memory_context[:500])
-                yield AuroraEvent(
-                    type="log",
-                    content="Memórias relevantes encontradas.",
-                    metadata={"memory": memory_context},
-                )
+        # Keep the prompt inside the token budget before adding this turn
+        self.chat_history = self.history.compact(self.chat_history)
+        self.chat_history.append(HumanMessage(content=user_input))
+        execution_llm = LLMFactory.get_bound_model(self.all_tools)
 
-        # ── 2. Gatekeeper (Intent Classification) ──
+        # ── 1. Memory Recall ‖ Gatekeeper ‖ speculative SHALLOW (concurrent) ──
         yield AuroraEvent(type="log", content="Classificando intenção...")
-        mode = self.gatekeeper.process(
-            user_input,
-            context={"memory_context": memory_context},
+        recall_future = None
+        if self.memory and self.memory.is_available:
+            recall_future = _PREPROCESS_POOL.submit(self.memory.recall_scored, user_input)
+        gate_future = _PREPROCESS_POOL.submit(
+            self.gatekeeper.classify, user_input, {"memory_context": ""}
         )
-        self.logger.log("gatekeeper", mode)
-        yield AuroraEvent(type="log", content=f"Modo: {mode}")
 
-        # ── 3. Thinking (ALWAYS — depth varies) ──
         tools_desc = "\n".join(
             f"- {t.name}: {t.description}" for t in self.all_tools
         )
@@ -155,11 +249,79 @@ class Orchestrator:
         thinking_context = {
             "tools_desc": tools_desc,
             "cwd": os.getcwd(),
-            "memory_context": memory_context,
+            "memory_context": "",
             "soul_text": soul_text,
         }
+        speculation = self._speculate(user_input, thinking_context, execution_llm, recall_future)
+
+        decision = gate_future.result()
+        mode = decision.mode
 
+        # Quick reflection only needs the soul, so it can start right away
+        quick_future = None
+        if mode == "MODE_SHALLOW" and not self.SHALLOW_FAST_LANE:
+            quick_future = speculation.quick_future if speculation else _PREPROCESS_POOL.submit(
+                self.thinker.quick_reflect, user_input, dict(thinking_context)
+            )
+
+        memory_context, relevance = recall_future.result() if recall_future else ("", 0.0)
+        if memory_context:
+            self.logger.log("memory_recall", memory_context[:500])
+            yield AuroraEvent(
+                type="log",
+                content="Memórias relevantes encontradas.",
+                metadata={"memory": memory_context},
+            )
+            thinking_context["memory_context"] = memory_context
+
+            # ── 2. Gatekeeper re-check ──
+            # Memories can only push a SHALLOW call to DEEP, so a DEEP
+            # decision is final and never pays for a second round-trip;
+            # neither does a SHALLOW one when the memories are loose matches.
+            if mode == "MODE_SHALLOW" and relevance >= self.MEMORY_RECHECK_RELEVANCE:
+                decision = self.gatekeeper.classify(
+                    user_input,
+                    context={"memory_context": memory_context},
+                )
+                mode = decision.mode
+                if mode != "MODE_SHALLOW" and quick_future:
+                    if not speculation:
+                        quick_future.cancel()
+                    quick_future = None
+
+        first_response = None
+        if speculation:
+            speculation.resolve(mode, memory_context)
+            first_response = speculation.brain_response()
+            if mode == "MODE_DEEP" and speculation.quick_thought():
+                thinking_context["quick_thought"] = speculation.quick_thought()
+            self.logger.log("speculation", speculation.outcome, {
+                "reused_brain": first_response is not None,
+                "miss_rate": round(self.speculation.miss_rate(), 3),
+            })
+
+        self.logger.log("gatekeeper", mode, {
+            "tier": decision.tier,
+            "confidence": round(decision.confidence, 3),
+            "local_mode": decision.local_mode,
+            "agree": decision.agree,
+        })
+        yield AuroraEvent(type="log", content=f"Modo: {mode}")
+
+        if memory_context:
+            self.chat_history.append(self._memory_message(memory_context))
+
+        # ── 2b. SHALLOW fast lane: one call answers in persona ──
+        if mode == "MODE_SHALLOW" and self.SHALLOW_FAST_LANE:
+            tool_response = yield from self._fast_lane(user_input, execution_llm, first_response)
+            if tool_response is None:
+                return
+            # Tools were requested (or the call failed): continue with brain → voice
+            first_response = tool_response or None
+
+        # ── 3. Thinking (ALWAYS — depth varies) ──
         plan_steps = []
+        plan_dependencies = None
 
         if mode == "MODE_DEEP":
             # ── DEEP: Full inner monologue + structured plan ──
@@ -168,6 +330,7 @@ class Orchestrator:
             thinking_result = self.thinker.process(user_input, thinking_context)
             thought_stream = thinking_result.get("thought_stream", "")
             plan_steps = thinking_result.get("plan", [user_input])
+            plan_dependencies = thinking_result.get("dependencies")
             self_notes = thinking_result.get("self_notes", "")
 
             self.logger.log("thought", thought_stream[:500])
@@ -180,24 +343,26 @@ class Orchestrator:
                     content=f"Auto-nota: {self_notes[:100]}",
                 )
 
-            # Critic validates the plan
-            plan_steps = self.critic.validate_plan(plan_steps)
-            self.logger.log("plan", str(plan_steps))
+            # Critic validates the plan; dependencies follow the steps by text
+            validated = self.critic.validate_plan(plan_steps)
+            if validated != plan_steps:
+                plan_dependencies = PlanGraph.remap_dependencies(plan_steps, plan_dependencies, validated)
+                plan_steps = validated
+            self.logger.log("plan", str(plan_steps), {"dependencies": plan_dependencies})
             yield AuroraEvent(
                 type="plan",
                 content=plan_steps,
-                metadata={"mode": "DEEP"},
+                metadata={"mode": "DEEP", "dependencies": plan_dependencies},
             )
 
         else:
             # ── SHALLOW: Quick reflection before responding ──
-            yield AuroraEvent(type="log", content="Reflexão rápida...")
+            if quick_future:
+                yield AuroraEvent(type="log", content="Reflexão rápida...")
 
-            quick_thought = self.thinker.quick_reflect(
-                user_input, thinking_context
-            )
-            self.logger.log("thought", quick_thought[:300])
-            yield AuroraEvent(type="thought", content=quick_thought)
+                quick_thought = quick_future.result()
+                self.logger.log("thought", quick_thought[:300])
+                yield AuroraEvent(type="thought", content=quick_thought)
 
             plan_steps = [user_input]
             yield AuroraEvent(
@@ -207,34 +372,13 @@ class Orchestrator:
             )
 
         # ── 4. Execution Loop (Brain) ──
-        self.chat_history.append(HumanMessage(content=user_input))
-
-        if memory_context:
-            self.chat_history.append(
-                SystemMessage(content=f"[MEMÓRIAS RELEVANTES]\n{memory_context}")
-            )
-
-        execution_llm = LLMFactory.get_default_model().bind_tools(self.all_tools)
-
-        brain_instruction = ""
-        for i, step in enumerate(plan_steps):
-            yield AuroraEvent(
-                type="step_start",
-                content=step,
-                metadata={"step_index": i + 1, "total_steps": len(plan_steps)},
-            )
-
-            step_result = yield from self._execute_step(
-                step=step,
-                goal=user_input,
-                execution_llm=execution_llm,
-                is_deep=(mode == "MODE_DEEP"),
-            )
-            
-            if step_result and step_result.strip():
-                brain_instruction = step_result
-            else:
-                self.logger.log("warning", f"Step {i+1} returned empty instruction. Keeping previous.")
+        brain_instruction = yield from self._run_plan(
+            PlanGraph(plan_steps, plan_dependencies),
+            goal=user_input,
+            execution_llm=execution_llm,
+            is_deep=(mode == "MODE_DEEP"),
+            first_response=first_response,
+        )
 
         # ── 5. Voice Synthesis ──
         if not brain_instruction:
@@ -256,10 +400,20 @@ class Orchestrator:
         self.logger.log("brain_instruction", brain_instruction[:500])
         yield AuroraEvent(type="log", content="Sintetizando resposta...")
 
-        final_text = self.voice.synthesize(
-            instruction=brain_instruction,
-            context={"user_input": user_input},
-        )
+        if self.STREAM_VOICE:
+            chunks = []
+            for delta in self.voice.synthesize_stream(
+                instruction=brain_instruction,
+                context={"user_input": user_input},
+            ):
+                chunks.append(delta)
+                yield AuroraEvent(type="final_answer_delta", content=delta)
+            final_text = "".join(chunks).strip()
+        else:
+            final_text = self.voice.synthesize(
+                instruction=brain_instruction,
+                context={"user_input": user_input},
+            )
 
         self.logger.log("voice_output", final_text[:500])
         yield AuroraEvent(type="final_answer", content=final_text)
@@ -269,77 +423,262 @@ class Orchestrator:
             summary = f"User: {user_input[:200]}"
             self.memory.save(summary)
 
+    def _speculate(self, user_input: str, thinking_context: dict, execution_llm, recall_future=None):
+        """
+        Starts the SHALLOW pipeline (quick reflection + first brain call)
+        alongside classification. The brain call waits for recall_future so
+        its prompt carries the same memories as the real turn. Returns a
+        ShallowSpeculation, or None when speculation is off or the tracker
+        judges it not worth it.
+        """
+        if not self.SPECULATE_SHALLOW:
+            return None
+        local = self.gatekeeper.preview(user_input)
+        if not self.speculation.should_speculate(local.mode, self.gatekeeper.classifier.is_confident(local)):
+            return None
+
+        # SHALLOW plans are [user_input], so this is exactly the first step's
+        # prompt (or the fast-lane prompt), recalled memories included
+        cache_hint = prompt_layout.supports_cache_control(execution_llm)
+        history = list(self.chat_history)
+        if self.SHALLOW_FAST_LANE:
+            build = lambda h: self._fast_lane_messages(h, cache_hint)
+            quick_reflect = None
+        else:
+            build = lambda h: self._step_messages(h, user_input, cache_hint)
+            quick_reflect = lambda: self.thinker.quick_reflect(user_input, dict(thinking_context))
+
+        def brain_call(memory_context):
+            if memory_context:
+                return execution_llm.invoke(build(history + [self._memory_message(memory_context)]))
+            return execution_llm.invoke(build(history))
+
+        return ShallowSpeculation(
+            _PREPROCESS_POOL,
+            self.speculation,
+            quick_reflect=quick_reflect,
+            brain_call=brain_call,
+            quick_prompt_chars=len(thinking_context["soul_text"]) + len(user_input) if quick_reflect else 0,
+            brain_prompt_chars=sum(len(str(m.content)) for m in build(history)),
+            recall=(lambda: recall_future.result()[0]) if recall_future else None,
+        )
+
+    @staticmethod
+    def _memory_message(memory_context: str) -> SystemMessage:
+        return SystemMessage(content=f"[MEMÓRIAS RELEVANTES]\n{memory_context}")
+
+    def _fast_lane(self, user_input: str, execution_llm, first_response=None):
+        """
+        Answers a SHALLOW turn with a single tool-bound call that speaks as
+        Aurora. Streams the answer as final_answer_delta when STREAM_VOICE;
+        if text was already streamed when a tool call (or an error) turns up,
+        a final_answer_reset event tells the interface to drop it, since the
+        answer will come from brain → voice instead.
+        Returns None when the turn was answered, the LLM response if it
+        asked for tools, or False if the call failed (the caller then
+        continues with brain → voice).
+        """
+        yield AuroraEvent(type="log", content="Resposta direta...")
+        messages = self._fast_lane_messages(
+            self.chat_history, prompt_layout.supports_cache_control(execution_llm)
+        )
+        streamed = False
+
+        try:
+            response = first_response
+            if response is None and self.STREAM_VOICE:
+                for chunk in execution_llm.stream(messages):
+                    response = chunk if response is None else response + chunk
+                    # Once a tool call shows up, the text is not the answer anymore
+                    if response.tool_call_chunks:
+                        if streamed:
+                            streamed = False
+                            yield AuroraEvent(type="final_answer_reset", content="")
+                        continue
+                    if isinstance(chunk.content, str) and chunk.content:
+                        streamed = True
+                        yield AuroraEvent(type="final_answer_delta", content=chunk.content)
+            elif response is None:
+                response = execution_llm.invoke(messages)
+        except Exception as e:
+            self.logger.log("error", f"Fast lane error: {e}")
+            if streamed:
+                yield AuroraEvent(type="final_answer_reset", content="")
+            yield AuroraEvent(type="log", content="Resposta direta falhou, usando o fluxo completo.")
+            return False
+
+        if response is None:
+            return False
+        prompt_layout.record_usage("fast_lane", response)
+        if response.tool_calls:
+            return response
+
+        final_text = response.content.strip() if isinstance(response.content, str) else str(response.content)
+        self.chat_history.append(AIMessage(content=final_text))
+        if self.STREAM_VOICE and not streamed and final_text:
+            yield AuroraEvent(type="final_answer_delta", content=final_text)
+
+        self.logger.log("voice_output", final_text[:500], {"fast_lane": True})
+        yield AuroraEvent(type="final_answer", content=final_text)
+        return None
+
+    @staticmethod
+    def _fast_lane_messages(history: list, cache_hint: bool = False) -> list:
+        """The fast-lane prompt: soul + persona rules, then history (memories, input)."""
+        return prompt_layout.fast_lane_messages(history, cache_hint)
+
+    def _run_plan(
+        self, graph: PlanGraph, goal: str, execution_llm, is_deep: bool, first_response=None
+    ) -> Generator[AuroraEvent, None, str]:
+        """
+        Runs the plan through the PlanScheduler. Each step works on a fork of
+        the chat history holding only the messages of the steps it depends
+        on; the branches are appended back in plan order once all finish.
+        first_response (a speculative brain reply) replaces the first step's
+        first LLM call. Returns the merged brain instruction.
+        """
+        base_history = self.chat_history
+        branches = {}  # step index -> messages the step added
+
+        def run_step(i):
+            history = list(base_history)
+            for j in graph.ancestors(i):
+                history.extend(branches.get(j, ()))
+            start = len(history)
+            try:
+                return (yield from self._execute_step(
+                    step=graph.steps[i],
+                    goal=goal,
+                    execution_llm=execution_llm,
+                    is_deep=is_deep,
+                    history=history,
+                    first_response=first_response if i == 0 else None,
+                ))
+            finally:
+                # Whatever the step managed to add, even if it failed midway
+                branches[i] = history[start:]
+
+        parallel = not graph.is_sequential
+        results = {}
+        try:
+            for event in self.plan_scheduler.run(graph, run_step):
+                if event.kind == "start":
+                    yield AuroraEvent(
+                        type="step_start",
+                        content=graph.steps[event.index],
+                        metadata={
+                            "step_index": event.index + 1,
+                            "total_steps": len(graph.steps),
+                            "parallel": parallel,
+                        },
+                    )
+                elif event.kind == "event":
+                    if parallel and isinstance(event.payload.metadata, dict):
+                        event.payload.metadata.setdefault("step_index", event.index + 1)
+                    yield event.payload
+                elif event.kind == "error":
+                    self.logger.log("error", f"Step {event.index + 1} failed: {event.payload}", {
+                        "step": graph.steps[event.index],
+                    })
+                    yield AuroraEvent(
+                        type="error",
+                        content=f"Passo {event.index + 1} falhou: {event.payload}",
+                        metadata={"step_index": event.index + 1},
+                    )
+                else:
+                    results[event.index] = event.payload
+                    if not (event.payload or "").strip():
+                        self.logger.log("warning", f"Step {event.index + 1} returned empty instruction.")
+        finally:
+            self.chat_history = base_history + [
+                m for i in sorted(branches) for m in branches[i]
+            ]
+
+        return PlanScheduler.merge_instructions(graph, results)
+
+    @staticmethod
+    def _step_messages(history: list, step: str, cache_hint: bool = False) -> list:
+        """The prompt for one step: soul + execution rules, then history and the step."""
+        return prompt_layout.step_messages(history, step, cache_hint)
+
     def _execute_step(
-        self, step: str, goal: str, execution_llm, is_deep: bool
+        self, step: str, goal: str, execution_llm, is_deep: bool, history: list = None, first_response=None
     ) -> Generator[AuroraEvent, None, str]:
-        """Execute a single step with tool calls. Returns brain instruction."""
+        """
+        Execute a single step with tool calls. Returns brain instruction.
+        Messages go to `history` (a forked context) or to self.chat_history.
+        first_response, if given, stands in for the first LLM call.
+        """
+        if history is None:
+            history = self.chat_history
         step_completed = False
         retries = 0
         max_retries = 5
         last_result = ""
+        step_tool_results = []  # every tool result of this step, for the critique policy
+        cache_hint = prompt_layout.supports_cache_control(execution_llm)
 
         while not step_completed and retries < max_retries:
-            messages = self.chat_history + [
-                SystemMessage(
-                    content=(
-                        f"PASSO ATUAL: {step}\n"
-                        "Execute este passo. Use ferramentas se necessário.\n\n"
-                        "IMPORTANTE: Quando terminar, NÃO responda diretamente ao "
-                        "usuário. Em vez disso, gere uma INSTRUÇÃO descrevendo o que "
-                        "a Aurora deve dizer ao usuário. Use o formato:\n"
-                        "RESPONSE_INSTRUCTION: <instrução detalhada do que responder>\n\n"
-                        "Exemplo: RESPONSE_INSTRUCTION: Cumprimente o usuário "
-                        "casualmente, diga que está tudo bem, pergunte o que ele "
-                        "precisa hoje. Mencione que tem X ferramentas disponíveis.\n\n"
-                        "A instrução deve conter TODAS as informações necessárias "
-                        "para gerar a resposta (dados, resultados de ferramentas, "
-                        "números, etc). Outro modelo vai transformar essa instrução "
-                        "em uma fala natural."
-                    )
-                ),
-            ]
+            messages = self._step_messages(history, step, cache_hint)
 
             try:
-                response = execution_llm.invoke(messages)
-                self.chat_history.append(response)
+                if first_response is not None:
+                    response, first_response = first_response, None
+                else:
+                    response = execution_llm.invoke(messages)
+                prompt_layout.record_usage("step", response)
+                history.append(response)
 
                 if response.tool_calls:
-                    for tool_call in response.tool_calls:
-                        tool_name = tool_call["name"]
-                        tool_args = tool_call["args"]
-
-                        self.logger.log("tool_call", tool_name, {"args": tool_args})
+                    tool_calls = response.tool_calls
+                    for tool_call in tool_calls:
+                        self.logger.log("tool_call", tool_call["name"], {"args": tool_call["args"]})
                         yield AuroraEvent(
                             type="tool_call",
-                            content=tool_name,
-                            metadata={"args": tool_args},
+                            content=tool_call["name"],
+                            metadata={"args": tool_call["args"], "call_id": tool_call["id"]},
                         )
 
-                        tool = self.tools_map.get(tool_name)
-                        result = "Ferramenta não encontrada."
-                        if tool:
-                            try:
-                                result = tool.invoke(tool_args)
-                            except Exception as e:
-                                result = f"Erro na ferramenta: {e}"
+                    # Independent calls run concurrently; output streams while they run
+                    # and results arrive as they finish
+                    results = [None] * len(tool_calls)
+                    for event in self.tool_executor.run(tool_calls, self.tools_map):
+                        index = event.index
+                        tool_name = tool_calls[index]["name"]
+                        if event.kind == "progress":
+                            yield AuroraEvent(
+                                type="tool_progress",
+                                content=event.content,
+                                metadata={"tool": tool_name, "call_id": tool_calls[index]["id"]},
+                            )
+                            continue
 
-                        last_result = str(result)
-                        self.logger.log("tool_result", last_result[:300], {
+                        result = results[index] = event.content
+                        self.logger.log("tool_result", result[:300], {
                             "tool": tool_name,
                         })
                         yield AuroraEvent(
                             type="tool_result",
-                            content=last_result[:200],
-                            metadata={"full_content": last_result},
+                            content=result[:200],
+                            metadata={
+                                "full_content": result,
+                                "tool": tool_name,
+                                "call_id": tool_calls[index]["id"],
+                            },
                         )
 
-                        self.chat_history.append(
+                    # ToolMessages keep the original call order for the LLM; the step
+                    # resends its history on every call, so huge outputs are clipped here
+                    for tool_call, result in zip(tool_calls, results):
+                        history.append(
                             ToolMessage(
                                 tool_call_id=tool_call["id"],
-                                content=last_result,
-                                name=tool_name,
+                                content=self.history.clip_tool_output(result),
+                                name=tool_call["name"],
                             )
                         )
+                    step_tool_results.extend(results)
+                    last_result = results[-1]
 
                 else:
                     content = response.content or ""
@@ -356,15 +695,24 @@ class Orchestrator:
                                 step=step,
                                 result=instruction[:500],
                                 goal=goal,
+                                tool_results=step_tool_results,
+                                retries=retries,
                             )
                             quality = critique.get("quality", "acceptable")
                             feedback = critique.get("feedback", "")
+                            skipped = critique.get("skipped")
 
-                            self.logger.log("critique", f"{quality}: {feedback}")
-                            yield AuroraEvent(
-                                type="thought",
-                                content=f"[Crítica] {quality}: {feedback}",
-                            )
+                            self.logger.log("critique", f"{quality}: {feedback}", {"skipped": skipped})
+                            if skipped:
+                                yield AuroraEvent(
+                                    type="log",
+                                    content=f"Crítica dispensada ({skipped}): {quality}",
+                                )
+                            else:
+                                yield AuroraEvent(
+                                    type="thought",
+                                    content=f"[Crítica] {quality}: {feedback}",
+                                )
 
                             if quality == "needs_retry" and retries < max_retries - 1:
                                 yield AuroraEvent(
@@ -0,0 +1,243 @@
+"""
+PlanScheduler — Runs the steps of a DEEP plan as a dependency graph.
+
+The Thinker may declare, per step, which earlier steps it depends on.
+Steps without an unmet dependency start right away, so "check git status",
+"list cron tasks" and "read README" run side by side instead of adding up
+their latencies. Plans without dependency info are a plain chain (each step
+depends on the previous one) and run inline, exactly as before.
+
+Each step is a generator (yielding AuroraEvents, returning its instruction)
+supplied by the orchestrator; concurrent steps are driven on a bounded pool
+and their events are interleaved as they arrive. Giving each step its own
+forked message context is the caller's job — see Orchestrator._run_plan.
+
+Side effects are ordered by the declared dependencies only: ToolExecutor's
+serial barriers apply within one step, not across parallel steps.
+
+A step that raises is reported with an 'error' event and finishes with an
+empty result; steps that depend on it (directly or not) are not run and
+are reported the same way, so one failure never silently empties the rest.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generator, NamedTuple, Optional
+
+
+_STEP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aurora-step")
+
+
+class StepEvent(NamedTuple):
+    kind: str     # 'start' | 'event' | 'error' | 'done'
+    index: int    # position of the step in the plan
+    payload: object = None  # AuroraEvent for 'event', exception for 'error', step result for 'done'
+
+
+class PlanGraph:
+    """Steps plus, for each step, the set of earlier steps it depends on."""
+
+    def __init__(self, steps: list, dependencies: Optional[list] = None):
+        self.steps = list(steps)
+        if dependencies is None or len(dependencies) != len(self.steps):
+            # No (usable) info: keep the old strictly sequential behaviour
+            self.deps = [({i - 1} if i else set()) for i in range(len(self.steps))]
+        else:
+            # Only earlier steps are valid dependencies, which also rules out cycles
+            self.deps = [
+                {d for d in (deps or []) if isinstance(d, int) and 0 <= d < i}
+                for i, deps in enumerate(dependencies)
+            ]
+
+    @property
+    def is_sequential(self) -> bool:
+        return all(self.deps[i] == {i - 1} for i in range(1, len(self.steps)))
+
+    def ancestors(self, index: int) -> list:
+        """Every step `index` transitively depends on, in plan order."""
+        seen, stack = set(), list(self.deps[index])
+        while stack:
+            i = stack.pop()
+            if i not in seen:
+                seen.add(i)
+                stack.extend(self.deps[i])
+        return sorted(seen)
+
+    def sinks(self) -> list:
+        """Steps no other step depends on — their results reach the user."""
+        needed = set().union(*self.deps) if self.deps else set()
+        return [i for i in range(len(self.steps)) if i not in needed]
+
+    @staticmethod
+    def remap_dependencies(old_steps: list, old_deps: Optional[list], new_steps: list) -> Optional[list]:
+        """
+        Carries dependencies over to a rewritten plan (e.g. by the Critic),
+        matching steps by text. A dependency on a removed step becomes a
+        dependency on what that step depended on; a step with no match in
+        the old plan (merged/reworded) waits for every step before it.
+        Returns None (plain chain) when nothing can be matched.
+        """
+        if old_deps is None or len(old_deps) != len(old_steps):
+            return None
+        key = lambda text: " ".join(str(text).lower().split())
+        old_index = {}
+        for i, step in enumerate(old_steps):
+            old_index.setdefault(key(step), i)
+        new_index = {}
+        for i, step in enumerate(new_steps):
+            new_index.setdefault(key(step), i)
+        if not any(key(step) in old_index for step in new_steps):
+            return None
+
+        def surviving(old_dep, seen=()):
+            target = new_index.get(key(old_steps[old_dep]))
+            if target is not None:
+                return {target}
+            # Removed step: inherit what it depended on
+            return set().union(set(), *(
+                surviving(d, seen + (old_dep,)) for d in old_deps[old_dep]
+                if isinstance(d, int) and 0 <= d < old_dep and d not in seen
+            ))
+
+        dependencies = []
+        for i, step in enumerate(new_steps):
+            old = old_index.get(key(step))
+            if old is None:
+                dependencies.append(list(range(i)))
+                continue
+            deps = set().union(set(), *(
+                surviving(d) for d in old_deps[old] if isinstance(d, int) and 0 <= d < old
+            ))
+            if any(d >= i for d in deps):
+                deps = set(range(i))  # reordered past a dependency: wait for everything
+            dependencies.append(sorted(deps))
+        return dependencies
+
+
+class PlanScheduler:
+    """Drives step generators concurrently as their dependencies complete."""
+
+    MAX_PARALLEL = 3
+
+    def __init__(self, max_parallel: int = None):
+        self.max_parallel = max_parallel or self.MAX_PARALLEL
+
+    def run(self, graph: PlanGraph, run_step: Callable[[int], Generator]) -> Generator[StepEvent, None, dict]:
+        """
+        Runs every step of graph. run_step(i) must return a generator that
+        yields AuroraEvents and returns the step result.
+        Yields StepEvents; returns {index: result}.
+        """
+        if graph.is_sequential or self.max_parallel <= 1:
+            return (yield from self._run_inline(graph, run_step))
+        return (yield from self._run_concurrent(graph, run_step))
+
+    def _run_inline(self, graph, run_step):
+        results, failed = {}, set()
+        for i in range(len(graph.steps)):
+            error = self._blocked(graph, i, failed)
+            if error is None:
+                yield StepEvent("start", i)
+                try:
+                    results[i] = yield from self._wrap(i, run_step(i))
+                except Exception as e:
+                    error = e
+            if error is not None:
+                failed.add(i)
+                results[i] = ""
+                yield StepEvent("error", i, error)
+            yield StepEvent("done", i, results[i])
+        return results
+
+    @staticmethod
+    def _blocked(graph, index, failed) -> Optional[Exception]:
+        """An error for a step that depends on a failed step, else None."""
+        for dep in sorted(graph.deps[index]):
+            if dep in failed:
+                return RuntimeError(f"depende do passo {dep + 1}, que falhou")
+        return None
+
+    @staticmethod
+    def _wrap(index, gen):
+        while True:
+            try:
+                event = next(gen)
+            except StopIteration as done:
+                return done.value
+            yield StepEvent("event", index, event)
+
+    def _run_concurrent(self, graph, run_step):
+        events = queue.Queue()
+        stop = threading.Event()
+        results, running, failed = {}, set(), set()
+        pending = list(range(len(graph.steps)))
+
+        try:
+            while pending or running:
+                # Start every ready step, in plan order, up to the limit;
+                # steps behind a failed one are reported and never run
+                for i in list(pending):
+                    if not graph.deps[i] <= results.keys():
+                        continue
+                    error = self._blocked(graph, i, failed)
+                    if error is not None:
+                        pending.remove(i)
+                        failed.add(i)
+                        results[i] = ""
+                        yield StepEvent("error", i, error)
+                        yield StepEvent("done", i, "")
+                        continue
+                    if len(running) >= self.max_parallel:
+                        break
+                    pending.remove(i)
+                    running.add(i)
+                    yield StepEvent("start", i)
+                    _STEP_POOL.submit(self._drive, i, run_step(i), events, stop)
+
+                if not running:
+                    continue
+                event = events.get()
+                if event.kind == "error":
+                    failed.add(event.index)
+                elif event.kind == "done":
+                    running.discard(event.index)
+                    results[event.index] = event.payload
+                yield event
+        finally:
+            # Consumer went away (or a step blew up): let running steps wind down
+            stop.set()
+        return results
+
+    @staticmethod
+    def _drive(index, gen, events, stop):
+        result = ""
+        try:
+            while not stop.is_set():
+                try:
+                    event = next(gen)
+                except StopIteration as done:
+                    result = done.value
+                    break
+                events.put(StepEvent("event", index, event))
+        except Exception as e:
+            events.put(StepEvent("error", index, e))
+        finally:
+            gen.close()
+            events.put(StepEvent("done", index, result or ""))
+
+    @staticmethod
+    def merge_instructions(graph: PlanGraph, results: dict) -> str:
+        """
+        Combines the results that reach the user (the sinks) into one
+        instruction for the Voice. A chain yields its last non-empty result.
+        """
+        sinks = [i for i in graph.sinks() if (results.get(i) or "").strip()]
+        if not sinks:
+            filled = [i for i in sorted(results) if (results[i] or "").strip()]
+            return results[filled[-1]] if filled else ""
+        if len(sinks) == 1:
+            return results[sinks[0]]
+        return "\n\n".join(
+            f"[Passo {i + 1}: {graph.steps[i]}]\n{results[i].strip()}" for i in sinks
+        )
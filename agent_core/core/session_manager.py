@@ -0,0 +1,134 @@
+"""
+SessionManager — One lightweight conversation per client over a shared engine.
+
+Each key (Socket.IO sid, Telegram chat_id, ...) gets its own fork() of a
+shared, initialized Orchestrator: private chat_history, shared tools, memory,
+soul and LLM clients. Sessions are evicted by LRU and idle timeout, or
+dropped explicitly (a session dropped mid-turn goes once its turns finish).
+
+Concurrency is bounded per session (a chat handles one message at a time,
+later ones queue behind it) and globally (at most N turns run at once).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable
+
+from agent_core.core.orchestrator import Orchestrator
+
+
+class _Session:
+    """A forked engine plus its concurrency bookkeeping."""
+
+    def __init__(self, engine: Orchestrator, concurrency: int):
+        self.engine = engine
+        self.semaphore = threading.Semaphore(concurrency)
+        self.active = 0
+        self.last_used = time.time()
+        self.dropped = False  # drop() was called while turns were running
+
+
+class SessionManager:
+    """Maps client keys to isolated Orchestrator sessions."""
+
+    MAX_SESSIONS = 20
+    IDLE_TIMEOUT = 60 * 60  # seconds
+    PER_SESSION_CONCURRENCY = 1
+    GLOBAL_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        base_provider: Callable[[], Orchestrator],
+        max_sessions: int = None,
+        idle_timeout: float = None,
+        per_session_concurrency: int = None,
+        global_concurrency: int = None,
+    ):
+        self.base_provider = base_provider
+        self.max_sessions = max_sessions or self.MAX_SESSIONS
+        self.idle_timeout = idle_timeout or self.IDLE_TIMEOUT
+        self.per_session_concurrency = per_session_concurrency or self.PER_SESSION_CONCURRENCY
+        self.global_concurrency = global_concurrency or self.GLOBAL_CONCURRENCY
+
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._global = threading.Semaphore(self.global_concurrency)
+
+    @contextmanager
+    def acquire(self, key: str):
+        """
+        Yields the session engine for key, creating it if needed.
+        Blocks while the session (or the whole server) is at its limit.
+        """
+        session = self._get_or_create(key)
+        try:
+            with session.semaphore:
+                with self._global:
+                    yield session.engine
+        finally:
+            with self._lock:
+                session.active -= 1
+                session.last_used = time.time()
+                if session.dropped and not session.active and self._sessions.get(key) is session:
+                    del self._sessions[key]
+
+    def reset(self, key: str):
+        """Clears a session's conversation (keeps the shared modules)."""
+        with self._lock:
+            session = self._sessions.get(key)
+        if session:
+            session.engine.reset_session()
+
+    def cancel_tools(self, key: str) -> int:
+        """Cancels the tool calls running in a session. Returns how many."""
+        with self._lock:
+            session = self._sessions.get(key)
+        return session.engine.cancel_tools() if session else 0
+
+    def drop(self, key: str):
+        """Forgets a session now, or as soon as its running turns finish."""
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return
+            if session.active:
+                session.dropped = True
+            else:
+                del self._sessions[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "active": sum(1 for s in self._sessions.values() if s.active),
+                "max_sessions": self.max_sessions,
+                "global_concurrency": self.global_concurrency,
+            }
+
+    def _get_or_create(self, key: str) -> _Session:
+        base = self.base_provider()
+        with self._lock:
+            session = self._sessions.get(key)
+            self._evict_locked(making_room=session is None)
+            if session is None:
+                session = _Session(base.fork(), self.per_session_concurrency)
+                self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            # Counts queued turns too, so a waiting session is never evicted
+            session.active += 1
+            session.dropped = False  # a new turn for the key keeps it
+            session.last_used = time.time()
+            return session
+
+    def _evict_locked(self, making_room: bool):
+        """Drops idle sessions, then least-recently-used ones over the cap."""
+        now = time.time()
+        for key, session in list(self._sessions.items()):
+            if not session.active and now - session.last_used > self.idle_timeout:
+                del self._sessions[key]
+
+        idle_keys = [k for k, s in self._sessions.items() if not s.active]
+        while making_room and len(self._sessions) >= self.max_sessions and idle_keys:
+            del self._sessions[idle_keys.pop(0)]
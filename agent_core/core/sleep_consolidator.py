@@ -5,11 +5,29 @@ Reads the previous day's interaction logs, analyzes them via LLM,
 extracts important insights, and saves them to long-term memory.
 Like human sleep, this process consolidates daily experiences into
 lasting knowledge.
+
+The whole day is covered with a map-reduce pass: logs are grouped by
+conversation turn into token-bounded chunks, chunks are analyzed in
+parallel (at most MAX_PARALLEL_CHUNKS at once), and a reduce call merges
+and dedupes the chunk insights. Each chunk analysis is cached on disk by
+content hash, so a re-run after a failure only redoes the missing chunks.
+
+Consolidated days are recorded in a ledger (date + hash of the day's logs
++ a stat-based fingerprint of its files). A day whose logs did not change
+since it was consolidated is skipped, and pending_dates() finds the days a
+missed nightly run left behind; it compares fingerprints first and only
+reads and hashes a day's logs when its files changed.
 """
 
+import hashlib
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 
+from agent_core.core.consolidation_ledger import ConsolidationLedger
 from agent_core.core.interaction_logger import InteractionLogger
 from agent_core.core.memory import MemoryManager
 from agent_core.utils.llm_factory import LLMFactory
@@ -44,24 +62,101 @@ Os pensamentos revelam a intenção, as dúvidas e as críticas que ela teve dur
 }}"""
 
 
+REDUCE_PROMPT = """Você é o módulo de consolidação de memória da Aurora.
+O dia foi analisado em {chunk_count} trechos. Abaixo estão os aprendizados
+extraídos de cada trecho e o resumo de cada um.
+
+[APRENDIZADOS CANDIDATOS]
+{insights}
+
+[RESUMOS DOS TRECHOS]
+{summaries}
+
+[TAREFA]
+1. Una aprendizados que dizem a mesma coisa em um só (mantenha o mais específico).
+2. Remova repetições e contradições superadas por informações mais recentes.
+3. Mantenha a importância mais alta entre os aprendizados unidos.
+4. Escreva um único resumo do dia inteiro.
+
+[FORMATO DE SAÍDA - JSON APENAS]
+{{
+    "insights": [
+        {{
+            "type": "preference" | "error" | "solution" | "fact" | "self_improvement",
+            "content": "Descrição clara e específica do aprendizado",
+            "importance": "low" | "medium" | "high" | "critical"
+        }}
+    ],
+    "summary": "Um breve comentário sobre como foi o dia de hoje do ponto de vista da sua evolução."
+}}"""
+
+
 class SleepConsolidator:
     """Analyzes daily logs and consolidates important memories."""
 
     MIN_IMPORTANCE = "medium"  # Only save medium+ importance
     IMPORTANCE_LEVELS = ["low", "medium", "high", "critical"]
 
+    # Map-reduce over the whole day
+    CHUNK_TOKENS = 3000        # budget of log text per chunk
+    CHARS_PER_TOKEN = 4        # rough estimate, same as HistoryManager
+    MAX_PARALLEL_CHUNKS = 3
+    CACHE_VERSION = 1          # bump when the prompt changes
+
+    # Catch-up runs over several days
+    MAX_PARALLEL_DAYS = 2
+
     def __init__(self):
         self.logger = InteractionLogger()
         self.memory = MemoryManager()
         self.llm = LLMFactory.get_default_model()
-
-    def consolidate(self, date_str: str = None) -> dict:
+        self.cache_dir = os.path.join(os.path.dirname(self.logger.log_dir), "sleep_cache")
+        self.ledger = ConsolidationLedger(
+            os.path.join(os.path.dirname(self.logger.log_dir), "sleep_ledger.json")
+        )
+        # Saves of parallel days are serialized so merge counts stay per-day
+        self._save_lock = threading.Lock()
+
+    def pending_dates(self, since: str = None, force: bool = False) -> list:
+        """
+        Days with logs that were never consolidated (or all of them with
+        force), oldest first. Today is excluded: it is not over yet.
+        Days consolidated before count as pending only if their logs changed.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        done = set() if force else set(self.ledger.dates())
+        return [
+            d for d in self.logger.get_available_dates()
+            if d < today and (since is None or d >= since) and (d not in done or self._changed(d))
+        ]
+
+    def _changed(self, date_str: str) -> bool:
+        fingerprint = self.logger.day_fingerprint(date_str)
+        if self.ledger.fingerprint_matches(date_str, fingerprint):
+            return False
+        logs = self.logger.read_day_logs(date_str)
+        if not self.ledger.is_current(date_str, ConsolidationLedger.hash_logs(logs)):
+            return True
+        # Same entries, different files (e.g. archived since): remember the new files
+        self.ledger.update_fingerprint(date_str, fingerprint)
+        return False
+
+    def consolidate_many(self, dates: list, force: bool = False, max_parallel: int = None) -> list:
+        """Consolidates several days, at most max_parallel at once."""
+        if not dates:
+            return []
+        workers = max_parallel or self.MAX_PARALLEL_DAYS
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda d: self.consolidate(d, force=force), dates))
+
+    def consolidate(self, date_str: str = None, force: bool = False) -> dict:
         """
         Run the consolidation for a given date.
 
         Args:
             date_str: Date in YYYY-MM-DD format.
                       Defaults to yesterday.
+            force: Consolidate even if the ledger says the logs are unchanged.
 
         Returns:
             Dict with consolidation results.
@@ -72,63 +167,183 @@ class SleepConsolidator:
 
         print(f"[Sleep] 💤 Starting consolidation for {date_str}...")
 
-        # 1. Read logs
+        # 1. Read logs (fingerprint first: an append in between only costs a re-hash later)
+        self.logger.flush(timeout=5)
+        fingerprint = self.logger.day_fingerprint(date_str)
         logs = self.logger.read_day_logs(date_str)
         if not logs:
             print(f"[Sleep] No logs found for {date_str}. Nothing to consolidate.")
             return {"date": date_str, "insights_saved": 0, "summary": "No logs"}
 
-        # 2. Format logs for LLM (truncate if too long)
-        logs_text = self._format_logs(logs)
-        print(f"[Sleep] Found {len(logs)} log entries. Analyzing...")
-
-        # 3. Ask LLM to analyze
-        analysis = self._analyze_logs(logs_text)
-        if not analysis:
-            print("[Sleep] ⚠ Could not analyze logs.")
-            return {"date": date_str, "insights_saved": 0, "summary": "Analysis failed"}
+        logs_hash = ConsolidationLedger.hash_logs(logs)
+        if not force and self.ledger.is_current(date_str, logs_hash):
+            self.ledger.update_fingerprint(date_str, fingerprint)
+            print(f"[Sleep] {date_str} already consolidated and unchanged. Skipping.")
+            return {"date": date_str, "insights_saved": 0, "summary": "Already consolidated", "skipped": True}
+
+        # 2. Split the day into turn-aligned chunks
+        chunks = self._build_chunks(logs)
+        print(f"[Sleep] Found {len(logs)} log entries in {len(chunks)} chunk(s). Analyzing...")
+
+        # 3. Map: analyze chunks in parallel (cached), then reduce
+        results = self._analyze_chunks(date_str, chunks)
+        failed = sum(1 for r in results if r is None)
+        if failed:
+            # Nothing is saved; finished chunks are cached for the next run
+            print(f"[Sleep] ⚠ Could not analyze {failed}/{len(chunks)} chunk(s).")
+            return {
+                "date": date_str,
+                "insights_saved": 0,
+                "summary": "Analysis failed",
+                "total_logs": len(logs),
+                "chunks": len(chunks),
+                "chunks_failed": failed,
+            }
+
+        analysis = self._reduce(results)
 
         # 4. Save important insights to memory
         saved_count = self._save_insights(analysis.get("insights", []))
         summary = analysis.get("summary", "")
+        if saved_count is None:
+            # Not recorded in the ledger, so the day is retried (chunk analyses stay cached)
+            print(f"[Sleep] ⚠ Insights for {date_str} were not saved. The day stays pending.")
+            return {
+                "date": date_str,
+                "insights_saved": 0,
+                "summary": "Save failed",
+                "total_logs": len(logs),
+                "chunks": len(chunks),
+                "save_failed": True,
+            }
 
         print(f"[Sleep] ✓ Consolidation complete: {saved_count} insights saved.")
         print(f"[Sleep] Summary: {summary}")
 
+        self.ledger.record(
+            date_str, logs_hash,
+            insights_saved=saved_count, total_logs=len(logs), chunks=len(chunks),
+            fingerprint=fingerprint,
+        )
+
         return {
             "date": date_str,
             "insights_saved": saved_count,
             "summary": summary,
             "total_logs": len(logs),
+            "chunks": len(chunks),
         }
 
-    def _format_logs(self, logs: list, max_chars: int = 8000) -> str:
-        """Format log entries as readable text, truncating if needed."""
-        lines = []
-        total_chars = 0
+    def _format_entry(self, entry: dict) -> str:
+        """Format one log entry as a readable line."""
+        ts = entry.get("timestamp", "?")
+        etype = entry.get("type", "?")
+        content = entry.get("content", "")
+        meta = entry.get("metadata", {})
 
-        for entry in logs:
-            ts = entry.get("timestamp", "?")
-            etype = entry.get("type", "?")
-            content = entry.get("content", "")
-            meta = entry.get("metadata", {})
+        # Truncate individual entries
+        if len(content) > 500:
+            content = content[:500] + "..."
 
-            # Truncate individual entries
-            if len(content) > 500:
-                content = content[:500] + "..."
+        line = f"[{ts}] {etype}: {content}"
+        if meta:
+            line += f" | meta: {json.dumps(meta, ensure_ascii=False)[:200]}"
+        return line
+
+    def _build_chunks(self, logs: list) -> list:
+        """
+        Groups entries into conversation turns (each starts at a user_input)
+        and packs whole turns into chunks of at most CHUNK_TOKENS. A turn
+        larger than the budget is split at entry boundaries.
+        """
+        budget = self.CHUNK_TOKENS * self.CHARS_PER_TOKEN
 
-            line = f"[{ts}] {etype}: {content}"
-            if meta:
-                line += f" | meta: {json.dumps(meta, ensure_ascii=False)[:200]}"
+        turns = []
+        for entry in logs:
+            if entry.get("type") == "user_input" or not turns:
+                turns.append([])
+            turns[-1].append(self._format_entry(entry))
+
+        chunks, current, size = [], [], 0
+        for turn in turns:
+            turn_size = sum(len(line) + 1 for line in turn)
+            if current and size + turn_size > budget:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            for line in turn:
+                if current and size + len(line) + 1 > budget:
+                    chunks.append("\n".join(current))
+                    current, size = [], 0
+                current.append(line)
+                size += len(line) + 1
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _analyze_chunks(self, date_str: str, chunks: list) -> list:
+        """Map step: one analysis per chunk (None where it failed)."""
+        if len(chunks) == 1:
+            return [self._analyze_chunk(date_str, 0, chunks[0])]
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_CHUNKS) as pool:
+            return list(pool.map(
+                lambda args: self._analyze_chunk(date_str, *args), enumerate(chunks)
+            ))
+
+    def _analyze_chunk(self, date_str: str, index: int, chunk: str):
+        key = hashlib.sha256(f"{self.CACHE_VERSION}\n{chunk}".encode("utf-8")).hexdigest()
+        cache_path = os.path.join(self.cache_dir, date_str, f"{key}.json")
 
-            total_chars += len(line)
-            if total_chars > max_chars:
-                lines.append("... (logs truncados por tamanho)")
-                break
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                print(f"[Sleep]   Chunk {index + 1}: cached")
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        analysis = self._analyze_logs(chunk)
+        if not isinstance(analysis, dict):
+            return None
 
-            lines.append(line)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(analysis, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"[Sleep] Could not cache chunk {index + 1}: {e}")
+        print(f"[Sleep]   Chunk {index + 1}: {len(analysis.get('insights', []))} insight(s)")
+        return analysis
+
+    def _reduce(self, results: list) -> dict:
+        """Reduce step: merges chunk analyses into one, deduping insights."""
+        insights, seen = [], set()
+        for result in results:
+            for insight in result.get("insights", []):
+                key = " ".join(str(insight.get("content", "")).lower().split())
+                if key and key not in seen:
+                    seen.add(key)
+                    insights.append(insight)
+        summaries = [r.get("summary", "") for r in results if r.get("summary")]
+
+        merged = {"insights": insights, "summary": " ".join(summaries)}
+        if len(results) == 1 or not insights:
+            return merged
 
-        return "\n".join(lines)
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", REDUCE_PROMPT),
+            ("human", "Una e consolide."),
+        ])
+        reduced = self._invoke_json(prompt, {
+            "chunk_count": len(results),
+            "insights": json.dumps(insights, ensure_ascii=False, indent=1),
+            "summaries": "\n".join(f"- {s}" for s in summaries),
+        })
+        if not isinstance(reduced, dict) or "insights" not in reduced:
+            # The exact-match dedup above is still better than nothing
+            print("[Sleep] ⚠ Reduce pass failed; using merged chunk insights.")
+            return merged
+        return reduced
 
     def _analyze_logs(self, logs_text: str) -> dict:
         """Send logs to LLM for analysis."""
@@ -136,10 +351,13 @@ class SleepConsolidator:
             ("system", CONSOLIDATION_PROMPT),
             ("human", "Analise e consolide."),
         ])
+        return self._invoke_json(prompt, {"logs": logs_text})
 
+    def _invoke_json(self, prompt: ChatPromptTemplate, variables: dict) -> dict:
+        """Runs prompt and parses the JSON answer (None on failure)."""
         try:
             chain = prompt | self.llm
-            response = chain.invoke({"logs": logs_text})
+            response = chain.invoke(variables)
             content = response.content.strip()
 
             # Parse JSON from response
@@ -160,14 +378,14 @@ class SleepConsolidator:
             print(f"[Sleep] LLM analysis error: {e}")
             return None
 
-    def _save_insights(self, insights: list) -> int:
-        """Save important insights to long-term memory."""
-        if not self.memory.is_available:
-            print("[Sleep] ⚠ Memory not available. Cannot save insights.")
-            return 0
-
+    def _save_insights(self, insights: list) -> Optional[int]:
+        """
+        Save important insights to long-term memory. Returns how many were
+        new, or None if they could not be written (memory unavailable or a
+        failed batch write).
+        """
         min_idx = self.IMPORTANCE_LEVELS.index(self.MIN_IMPORTANCE)
-        saved = 0
+        to_save = []
 
         for insight in insights:
             importance = insight.get("importance", "low")
@@ -185,8 +403,26 @@ class SleepConsolidator:
                 continue
 
             memory_text = f"[{itype.upper()}] {content}"
-            self.memory.save(memory_text)
-            saved += 1
-            print(f"[Sleep]   💾 Saved: [{importance}] {content[:80]}...")
+            to_save.append(memory_text)
+            print(f"[Sleep]   💾 Saving: [{importance}] {content[:80]}...")
 
-        return saved
+        if not to_save:
+            return 0
+        if not self.memory.is_available:
+            print("[Sleep] ⚠ Memory not available. Cannot save insights.")
+            return None
+
+        # Written in BatchWriter batches (one embedding request + one upsert
+        # per BATCH_SIZE insights); the write path dedupes each batch
+        # against what is already in memory
+        with self._save_lock:
+            merged_before = self.memory.dedup_stats["merged"]
+            self.memory.save_many(to_save)
+            written = self.memory.flush()
+            merged = self.memory.dedup_stats["merged"] - merged_before
+        if not written:
+            print(f"[Sleep] ⚠ Memory write failed: {self.memory.writer.last_error}")
+            return None
+        if merged:
+            print(f"[Sleep]   ♻ {merged} insight(s) already known — merged into existing memories.")
+        return len(to_save) - merged
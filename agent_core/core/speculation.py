@@ -0,0 +1,174 @@
+"""
+Speculative SHALLOW path — start small talk work before the Gatekeeper decides.
+
+A SHALLOW turn used to wait for gatekeeper → quick reflection → brain call
+→ voice, in sequence. The speculation starts the quick reflection at the
+same moment as classification, and the first (tool-bound) brain call as
+soon as memory recall returns — recall is much faster than the Gatekeeper,
+so the call still overlaps classification but sees the same memories the
+real turn will. In the fast lane there is no quick reflection and the brain
+call is the combined persona call (see Orchestrator._fast_lane):
+
+- hit:     SHALLOW — both results are reused.
+- partial: SHALLOW, but memories were recalled and the brain call was
+           started without them (no recall given) — only the quick
+           thought is reused.
+- miss:    DEEP — pending work is cancelled; a finished quick thought is
+           handed to the Thinker as a first impression, the rest is wasted.
+
+Nothing with side effects runs speculatively: tool calls in the brain
+response are only executed once the turn is known to be SHALLOW.
+
+SpeculationTracker counts outcomes, head start and (estimated) wasted
+tokens, and decides whether to speculate at all: never when the local
+gatekeeper tiers are already sure of DEEP, and only on a local SHALLOW
+guess once the recent miss rate (misses and partials, both of which throw
+a brain call away) is too high.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class SpeculationTracker:
+    """Outcome counters and the speculate-or-not policy."""
+
+    MAX_MISS_RATE = 0.6   # above this, speculate only on a local SHALLOW guess
+    WINDOW = 50           # recent outcomes considered for the miss rate
+    MIN_SAMPLES = 10      # outcomes needed before the miss rate counts
+    CHARS_PER_TOKEN = 4   # token estimate when the provider reports no usage
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=self.WINDOW)
+        self.counters = {
+            "started": 0, "skipped": 0,
+            "hit": 0, "partial": 0, "miss": 0,
+            "reused_thoughts": 0,
+            "wasted_tokens": 0,
+            "head_start_seconds": 0.0,
+        }
+
+    def should_speculate(self, local_mode: Optional[str], local_confident: bool) -> bool:
+        if local_confident and local_mode == "MODE_DEEP":
+            allowed = False
+        elif self.miss_rate() > self.MAX_MISS_RATE:
+            allowed = local_mode == "MODE_SHALLOW"
+        else:
+            allowed = True
+        with self._lock:
+            self.counters["started" if allowed else "skipped"] += 1
+        return allowed
+
+    def miss_rate(self) -> float:
+        with self._lock:
+            if len(self._recent) < self.MIN_SAMPLES:
+                return 0.0
+            return sum(1 for o in self._recent if o in ("miss", "partial")) / len(self._recent)
+
+    def record(self, outcome: str, head_start: float = 0.0, reused_thought: bool = False):
+        with self._lock:
+            self._recent.append(outcome)
+            self.counters[outcome] += 1
+            self.counters["head_start_seconds"] += head_start
+            if reused_thought:
+                self.counters["reused_thoughts"] += 1
+
+    def add_waste(self, tokens: int):
+        with self._lock:
+            self.counters["wasted_tokens"] += int(tokens)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        resolved = stats["hit"] + stats["partial"] + stats["miss"]
+        stats["hit_rate"] = stats["hit"] / resolved if resolved else None
+        stats["miss_rate"] = self.miss_rate()
+        return stats
+
+    def estimate_tokens(self, *texts) -> int:
+        return sum(len(t or "") for t in texts) // self.CHARS_PER_TOKEN
+
+
+class ShallowSpeculation:
+    """One turn's speculative work: a quick thought and a first brain response."""
+
+    def __init__(
+        self,
+        pool,
+        tracker: SpeculationTracker,
+        quick_reflect: Optional[Callable[[], str]],
+        brain_call: Callable[[str], object],
+        quick_prompt_chars: int = 0,
+        brain_prompt_chars: int = 0,
+        recall: Optional[Callable[[], str]] = None,
+    ):
+        self.tracker = tracker
+        self.started_at = time.monotonic()
+        self.recall = recall
+        self.memory_context = ""  # what the brain call was built with
+        self.quick_future = pool.submit(quick_reflect) if quick_reflect else None
+        # Submitted after recall, so it never waits on a queued recall
+        self.brain_future = pool.submit(self._brain, brain_call)
+        self._prompt_chars = {self.quick_future: quick_prompt_chars, self.brain_future: brain_prompt_chars}
+        self.outcome = None
+
+    def _brain(self, brain_call):
+        if self.recall:
+            self.memory_context = self.recall() or ""
+        return brain_call(self.memory_context)
+
+    def resolve(self, mode: str, memory_context: str = ""):
+        """Records the outcome once the gatekeeper's final decision is known."""
+        head_start = time.monotonic() - self.started_at
+        if mode != "MODE_SHALLOW":
+            self.outcome = "miss"
+            reused = self.quick_thought() is not None
+            self._discard(self.brain_future)
+            if not reused and self.quick_future:
+                self._discard(self.quick_future)
+            self.tracker.record("miss", head_start, reused_thought=reused)
+        elif memory_context and not self.recall:
+            self.outcome = "partial"
+            self._discard(self.brain_future)
+            self.tracker.record("partial", head_start)
+        else:
+            self.outcome = "hit"
+            self.tracker.record("hit", head_start)
+
+    def quick_thought(self) -> Optional[str]:
+        """The quick thought if it is already available (never blocks)."""
+        future = self.quick_future
+        if future and future.done() and not future.cancelled() and not future.exception():
+            return future.result()
+        return None
+
+    def brain_response(self):
+        """The speculative brain response on a hit, or None (call it normally)."""
+        if self.outcome != "hit":
+            return None
+        try:
+            return self.brain_future.result()
+        except Exception as e:
+            print(f"[Speculation] Brain call failed: {e}")
+            return None
+
+    def _discard(self, future):
+        if future.cancel():
+            return  # never started, nothing wasted
+        future.add_done_callback(lambda f: self.tracker.add_waste(self._tokens(f)))
+
+    def _tokens(self, future) -> int:
+        if future.cancelled() or future.exception():
+            return 0
+        result = future.result()
+        usage = getattr(result, "usage_metadata", None) or {}
+        if usage.get("total_tokens"):
+            return usage["total_tokens"]
+        output = result if isinstance(result, str) else str(getattr(result, "content", ""))
+        prompt_chars = self._prompt_chars[future]
+        if future is self.brain_future:
+            prompt_chars += len(self.memory_context)
+        return self.tracker.estimate_tokens(output) + prompt_chars // self.tracker.CHARS_PER_TOKEN
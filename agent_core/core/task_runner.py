@@ -0,0 +1,155 @@
+"""
+TaskRunner — Executa uma tarefa agendada (cron) de ponta a ponta.
+
+Usado tanto pelo worker residente (engine quente, vindo do EnginePool)
+quanto pelo aurora_runner.py em modo cold-start (engine novo). Cada execução:
+1. Carrega a descrição da tarefa dos metadados
+2. Registra instância no InstanceManager
+3. Executa a tarefa no engine
+4. Notifica resultado via Telegram
+5. Limpa instância
+6. Se one-shot, remove a entry do crontab
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from agent_core.core.instance_manager import InstanceManager
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TASKS_META_PATH = os.path.join(PROJECT_ROOT, "data", "cron_tasks.json")
+
+
+def run_scheduled_task(task_id: str, one_shot: bool = False, engine=None) -> bool:
+    """
+    Executa a tarefa task_id. Se engine for None, inicializa um Orchestrator
+    novo (cold start). Retorna True se a tarefa gerou uma resposta final.
+    """
+    log_prefix = f"[Runner:{task_id}]"
+    print(f"{log_prefix} Iniciando execução - {datetime.now().isoformat()}")
+
+    # 1. Carregar metadados da tarefa
+    task_description = load_task_description(task_id)
+    if not task_description:
+        print(f"{log_prefix} Task ID não encontrado nos metadados. Abortando.")
+        return False
+
+    print(f"{log_prefix} Tarefa: {task_description}")
+
+    # 2. Registrar instância
+    im = InstanceManager()
+
+    if not im.can_start_new():
+        print(f"{log_prefix} Limite de instâncias atingido. Abortando.")
+        return False
+
+    instance_id = im.register(
+        description=f"[CRON] {task_description}",
+        source="cron",
+        instance_type="scheduled",
+    )
+
+    if not instance_id:
+        print(f"{log_prefix} Falha ao registrar instância. Abortando.")
+        return False
+
+    # 3. Executar tarefa
+    success = False
+    try:
+        im.update_status(instance_id, "executing")
+
+        if engine is None:
+            engine = _cold_start_engine(log_prefix, task_description)
+            if engine is None:
+                return False
+
+        results = []
+        for event in engine.process_message(f"EXECUTE TAREFA AGENDADA: {task_description}"):
+            if event.type == "final_answer":
+                results.append(event.content)
+            elif event.type == "error":
+                print(f"{log_prefix} Erro durante execução: {event.content}")
+
+        # 4. Notificar resultado
+        if results:
+            notify_success(task_description, results[-1])
+            print(f"{log_prefix} Tarefa concluída com sucesso.")
+            success = True
+        else:
+            notify_error(task_description, "Nenhum resultado gerado.")
+            print(f"{log_prefix} Tarefa concluída sem resultado.")
+
+    except Exception as e:
+        print(f"{log_prefix} Erro fatal: {e}")
+        notify_error(task_description, str(e))
+
+    finally:
+        # 5. Limpar instância
+        im.unregister(instance_id)
+
+        # 6. Se one-shot, remover do crontab
+        if one_shot:
+            try:
+                from agent_core.core.cron_manager import CronManager
+                cm = CronManager()
+                cm.remove_job(task_id)
+                print(f"{log_prefix} Job one-shot removido do crontab.")
+            except Exception as e:
+                print(f"{log_prefix} Erro ao remover job one-shot: {e}")
+
+    print(f"{log_prefix} Execução finalizada - {datetime.now().isoformat()}")
+    return success
+
+
+def _cold_start_engine(log_prefix: str, task_description: str):
+    """Inicializa um Orchestrator isolado. Retorna None se falhar."""
+    from agent_core.core.orchestrator import Orchestrator
+    engine = Orchestrator()
+    init_event = engine.initialize()
+
+    if init_event.type == "error":
+        print(f"{log_prefix} Falha na inicialização: {init_event.content}")
+        notify_error(task_description, init_event.content)
+        return None
+    return engine
+
+
+def load_task_description(task_id: str) -> Optional[str]:
+    """Carrega a descrição da tarefa do arquivo de metadados."""
+    try:
+        with open(TASKS_META_PATH, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta.get(task_id, {}).get("description", "")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return ""
+
+
+def notify_success(description: str, result: str):
+    """Envia notificação de sucesso via Telegram."""
+    try:
+        from tools_library import telegram_sender
+        msg = (
+            f"🔔 *Tarefa Agendada Concluída*\n\n"
+            f"*Tarefa:* {description}\n\n"
+            f"{result}"
+        )
+        telegram_sender.run(msg)
+    except Exception as e:
+        print(f"[Runner] Erro ao notificar via Telegram: {e}")
+
+
+def notify_error(description: str, error: str):
+    """Envia notificação de erro via Telegram."""
+    try:
+        from tools_library import telegram_sender
+        msg = (
+            f"⚠️ *Erro em Tarefa Agendada*\n\n"
+            f"*Tarefa:* {description}\n\n"
+            f"*Erro:* {error}"
+        )
+        telegram_sender.run(msg)
+    except Exception as e:
+        print(f"[Runner] Erro ao notificar via Telegram: {e}")
@@ -0,0 +1,253 @@
+"""
+ToolExecutor — Runs the tool calls of one LLM response concurrently.
+
+Calls are dispatched on the executor's own bounded thread pool (one
+executor per session, so a hung call never starves another session) and
+reported as each one finishes. Tools flagged as serial (writes, scheduling, memory mutations)
+act as barriers: everything before them finishes first, they run alone,
+and only then do later calls start — so "write then read" keeps its order.
+Per-tool limits cap how many calls of the same tool run at once.
+
+Each call runs with a tool context (see utils/process_runner): partial
+output streams back as progress, a wall-clock timeout applies from the
+moment the call actually starts (not while it waits for a worker), and
+cancel() stops every running call. Subprocess-based tools are killed;
+pure-Python tools are abandoned (their result is replaced by an error).
+An abandoned call still holds its thread, so the pool is retired and a
+fresh one takes new calls; once MAX_HUNG threads are stuck that way, new
+calls are refused until some of them return.
+
+Results are always returned in the original call order, so the
+ToolMessages the LLM sees are stable regardless of completion order.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, NamedTuple
+
+from agent_core.utils.process_runner import ToolContext, set_tool_context
+
+
+class ToolEvent(NamedTuple):
+    kind: str     # 'progress' | 'result'
+    index: int    # position of the call in the LLM response
+    content: str
+
+
+class ToolExecutor:
+    """Executes tool calls concurrently with serial barriers and per-tool limits."""
+
+    # Tools with side effects that must not overlap with anything else
+    SERIAL_TOOLS = {
+        "write_file",
+        "cron_scheduler",
+        "save_memory",
+        "forget_memory",
+        "github_manager",
+        "github_pr",
+        "devops_automation",
+        "telegram_sender",
+    }
+
+    # Max concurrent calls per tool (tools not listed are limited only by the pool)
+    TOOL_CONCURRENCY = {
+        "shell_executor": 2,
+        "vision_analyzer": 1,
+    }
+
+    # Wall-clock limits in seconds (DEFAULT_TIMEOUT for tools not listed)
+    DEFAULT_TIMEOUT = 120
+    TOOL_TIMEOUTS = {
+        "devops_automation": 600,
+    }
+    KILL_GRACE = 5  # seconds to wait for a timed-out/cancelled call to stop
+
+    MAX_WORKERS = 4  # concurrent calls per executor (i.e. per session)
+    MAX_HUNG = 8     # abandoned calls still holding a thread before new calls are refused
+
+    def __init__(
+        self,
+        serial_tools: set = None,
+        tool_concurrency: dict = None,
+        tool_timeouts: dict = None,
+        max_workers: int = None,
+    ):
+        self.serial_tools = set(serial_tools) if serial_tools is not None else set(self.SERIAL_TOOLS)
+        self.tool_concurrency = dict(tool_concurrency) if tool_concurrency is not None else dict(self.TOOL_CONCURRENCY)
+        self.tool_timeouts = dict(tool_timeouts) if tool_timeouts is not None else dict(self.TOOL_TIMEOUTS)
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self._limits = {}
+        self._limits_lock = threading.Lock()
+        self._cancel_events = set()
+        self._cancel_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._hung = 0
+
+    @property
+    def hung(self) -> int:
+        """Abandoned calls whose thread has not returned yet."""
+        with self._pool_lock:
+            return self._hung
+
+    def cancel(self) -> int:
+        """Cancels every call currently running. Returns how many were signalled."""
+        with self._cancel_lock:
+            for event in self._cancel_events:
+                event.set()
+            return len(self._cancel_events)
+
+    def run(self, tool_calls: list, tools_map: dict) -> Generator[ToolEvent, None, list]:
+        """
+        Executes tool_calls, yielding ToolEvents (progress lines while calls
+        run, then one 'result' per call as it finishes).
+        Returns the list of results in the original call order.
+        """
+        results = [None] * len(tool_calls)
+        for segment in self._segments(tool_calls):
+            yield from self._run_segment(segment, tool_calls, tools_map, results)
+        return results
+
+    def _run_segment(self, segment, tool_calls, tools_map, results):
+        events = queue.Queue()
+        cancels, timeouts, states, cancelled_at = {}, {}, {}, {}
+
+        for i in segment:
+            name = tool_calls[i]["name"]
+            timeouts[i] = self.tool_timeouts.get(name, self.DEFAULT_TIMEOUT)
+            cancels[i] = threading.Event()
+            states[i] = {"started": None, "finished": False, "hung": False}
+            ctx = ToolContext(
+                emit=lambda text, i=i: events.put(ToolEvent("progress", i, text)),
+                cancel_event=cancels[i],
+                timeout=timeouts[i],
+            )
+            if not self._submit(self._invoke, tool_calls[i], tools_map, ctx, events, i, states[i]):
+                events.put(ToolEvent(
+                    "result", i, "Erro na ferramenta: muitas chamadas anteriores travadas; tente novamente.",
+                ))
+
+        with self._cancel_lock:
+            self._cancel_events.update(cancels.values())
+
+        try:
+            pending = set(segment)
+            while pending:
+                try:
+                    event = events.get(timeout=0.2)
+                except queue.Empty:
+                    event = None
+
+                if event is not None:
+                    if event.index not in pending:
+                        continue  # late result from an abandoned call
+                    if event.kind == "result":
+                        pending.discard(event.index)
+                        results[event.index] = event.content
+                    yield event
+                    continue
+
+                # Give up on calls that outlived their deadline or ignored a cancel.
+                # Subprocess tools stop themselves; the grace covers their kill.
+                # The deadline counts from the start, so queued calls never time out.
+                now = time.monotonic()
+                for i in list(pending):
+                    if cancels[i].is_set():
+                        cancelled_at.setdefault(i, now)
+                    started = states[i]["started"]
+                    timed_out = started is not None and now > started + timeouts[i] + self.KILL_GRACE
+                    abandoned = i in cancelled_at and now > cancelled_at[i] + self.KILL_GRACE
+                    if timed_out or abandoned:
+                        cancels[i].set()
+                        self._abandon(states[i])
+                        pending.discard(i)
+                        results[i] = (
+                            "Erro na ferramenta: tempo limite excedido."
+                            if timed_out else "Erro na ferramenta: cancelada pelo usuário."
+                        )
+                        yield ToolEvent("result", i, results[i])
+        finally:
+            with self._cancel_lock:
+                self._cancel_events.difference_update(cancels.values())
+
+    def _segments(self, tool_calls: list) -> list:
+        """Splits calls into groups that may run together; serial calls stand alone."""
+        segments, current = [], []
+        for i, call in enumerate(tool_calls):
+            if call["name"] in self.serial_tools:
+                if current:
+                    segments.append(current)
+                    current = []
+                segments.append([i])
+            else:
+                current.append(i)
+        if current:
+            segments.append(current)
+        return segments
+
+    def _limit(self, tool_name: str):
+        limit = self.tool_concurrency.get(tool_name)
+        if not limit:
+            return None
+        with self._limits_lock:
+            if tool_name not in self._limits:
+                self._limits[tool_name] = threading.BoundedSemaphore(limit)
+            return self._limits[tool_name]
+
+    def _submit(self, fn, *args) -> bool:
+        """Runs fn on this executor's pool. False when too many calls are hung."""
+        with self._pool_lock:
+            if self._hung >= self.MAX_HUNG:
+                return False
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aurora-tool")
+            self._pool.submit(fn, *args)
+            return True
+
+    def _abandon(self, state: dict):
+        """
+        Marks a given-up call. If its thread is still busy, the pool is
+        retired (its idle threads exit, the busy one when its call returns)
+        so later calls get a full pool instead of queueing behind it.
+        """
+        with self._pool_lock:
+            if state["started"] is None or state["finished"] or state["hung"]:
+                return
+            state["hung"] = True
+            self._hung += 1
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def _invoke(self, tool_call: dict, tools_map: dict, ctx: ToolContext, events: queue.Queue, index: int, state: dict):
+        try:
+            events.put(ToolEvent("result", index, self._call_tool(tool_call, tools_map, ctx, state)))
+        finally:
+            with self._pool_lock:
+                state["finished"] = True
+                if state["hung"]:
+                    self._hung -= 1
+
+    def _call_tool(self, tool_call: dict, tools_map: dict, ctx: ToolContext, state: dict = None) -> str:
+        tool = tools_map.get(tool_call["name"])
+        if not tool:
+            return "Ferramenta não encontrada."
+
+        semaphore = self._limit(tool_call["name"])
+        if semaphore:
+            semaphore.acquire()
+        if state is not None:
+            state["started"] = time.monotonic()  # the deadline starts here
+        set_tool_context(ctx)
+        try:
+            if ctx.cancel_event.is_set():
+                return "Erro na ferramenta: cancelada pelo usuário."
+            return str(tool.invoke(tool_call["args"]))
+        except Exception as e:
+            return f"Erro na ferramenta: {e}"
+        finally:
+            set_tool_context(None)
+            if semaphore:
+                semaphore.release()
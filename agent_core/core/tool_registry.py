@@ -0,0 +1,115 @@
+"""
+ToolRegistry — Incremental, hot-reloadable view of tools_library.
+
+The registry polls the tools directory by mtime (through the tool manifest,
+see utils/tool_loader) and loads, replaces or unloads only the files that
+changed. Every change produces a new immutable ToolSnapshot (tools, name map
+and the soul message rebuilt with the new tools section) swapped in under a
+lock, so readers always see a consistent set.
+
+Engines apply the latest snapshot between turns (Orchestrator.sync_tools),
+which makes a tool Aurora just wrote usable on the next message without
+re-initializing anything. The bound LLM follows automatically, since
+LLMFactory caches bound models by tool set.
+"""
+
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from langchain_core.messages import SystemMessage
+
+from agent_core.utils.soul_loader import load_soul
+from agent_core.utils.tool_loader import build_manifest, load_tool
+
+
+class ToolSnapshot(NamedTuple):
+    version: int
+    tools: list
+    tools_map: dict
+    soul_message: Optional[SystemMessage]
+    changes: dict  # what the last refresh changed: added / updated / removed
+
+
+class ToolRegistry:
+    """Keeps the dynamic tools in sync with tools_library on disk."""
+
+    POLL_INTERVAL = 2.0  # seconds between directory scans
+
+    def __init__(
+        self,
+        tools_dir: str,
+        builtin_tools: list = None,
+        extra_tools: list = None,
+        cwd: str = None,
+        poll_interval: float = None,
+    ):
+        self.tools_dir = tools_dir
+        # Final order matches the original loader: builtin + dynamic + extra
+        self.builtin_tools = list(builtin_tools or [])
+        self.extra_tools = list(extra_tools or [])
+        self.cwd = cwd or os.getcwd()
+        self.poll_interval = poll_interval if poll_interval is not None else self.POLL_INTERVAL
+
+        self._files = {}  # filename -> (mtime_ns, size, tool or None)
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        self._snapshot = None
+        self.refresh(force=True)
+
+    @property
+    def snapshot(self) -> ToolSnapshot:
+        return self._snapshot
+
+    def refresh(self, force: bool = False) -> Optional[dict]:
+        """
+        Rescans the directory (at most once per poll_interval unless forced).
+        Returns the changes if the tool set changed, else None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_poll < self.poll_interval:
+                return None
+            self._last_poll = now
+
+            try:
+                manifest = build_manifest(self.tools_dir)
+            except OSError as e:
+                print(f"❌ Erro ao escanear ferramentas: {e}")
+                return None
+
+            changes = {"added": [], "updated": [], "removed": []}
+            for filename, entry in manifest.items():
+                known = self._files.get(filename)
+                stamp = (entry["mtime_ns"], entry["size"])
+                if known and known[:2] == stamp:
+                    continue
+                tool = load_tool(self.tools_dir, filename, entry)
+                self._files[filename] = stamp + (tool,)
+                if known and known[2] is not None:
+                    changes["updated" if tool is not None else "removed"].append(filename[:-3])
+                elif tool is not None:
+                    changes["added"].append(filename[:-3])
+
+            for filename in set(self._files) - set(manifest):
+                if self._files.pop(filename)[2] is not None:
+                    changes["removed"].append(filename[:-3])
+
+            if self._snapshot is not None and not any(changes.values()):
+                return None
+
+            self._publish(changes)
+            return changes
+
+    def _publish(self, changes: dict):
+        dynamic = [entry[2] for _, entry in sorted(self._files.items()) if entry[2] is not None]
+        tools = self.builtin_tools + dynamic + self.extra_tools
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        self._snapshot = ToolSnapshot(
+            version=version,
+            tools=tools,
+            tools_map={t.name: t for t in tools},
+            soul_message=load_soul(tools_list=tools, cwd=self.cwd),
+            changes=changes,
+        )
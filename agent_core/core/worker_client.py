@@ -0,0 +1,53 @@
+"""
+WorkerClient — Cliente leve do worker residente da Aurora.
+
+Só usa a stdlib: o aurora_runner.py importa este módulo para entregar o
+task_id ao worker sem carregar langchain/chromadb. Protocolo: uma linha
+JSON de requisição e uma linha JSON de resposta por conexão.
+"""
+
+import json
+import os
+import socket
+from typing import Optional
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SOCKET_PATH = os.getenv(
+    "AURORA_WORKER_SOCKET", os.path.join(PROJECT_ROOT, "data", "aurora_worker.sock")
+)
+
+
+def send_request(request: dict, socket_path: str = None, timeout: float = 5.0) -> Optional[dict]:
+    """Envia uma requisição ao worker. Retorna None se ele não estiver rodando."""
+    path = socket_path or DEFAULT_SOCKET_PATH
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data.decode("utf-8")) if data else None
+    except (OSError, ValueError):
+        return None
+
+
+def ping(socket_path: str = None) -> bool:
+    response = send_request({"action": "ping"}, socket_path, timeout=2.0)
+    return bool(response and response.get("ok"))
+
+
+def submit_task(task_id: str, one_shot: bool = False, socket_path: str = None) -> bool:
+    """Entrega a tarefa ao worker. Retorna True se ele aceitou."""
+    response = send_request(
+        {"action": "run_task", "task_id": task_id, "one_shot": one_shot}, socket_path
+    )
+    return bool(response and response.get("accepted"))
@@ -0,0 +1,108 @@
+"""
+WorkerDaemon — Worker residente que executa tarefas agendadas num engine quente.
+
+Escuta num Unix socket local (ver worker_client). O crontab continua chamando
+scripts/aurora_runner.py, que agora só entrega o task_id para cá; a tarefa
+roda numa sessão do EnginePool, sem reimportar langchain/chromadb nem
+re-inicializar o Orchestrator a cada execução.
+
+Ações suportadas:
+- ping:      {"action": "ping"} → {"ok": true, "pid": ..., "pool": {...}}
+- run_task:  {"action": "run_task", "task_id": "...", "one_shot": false}
+             → {"ok": true, "accepted": true} (executa em background)
+"""
+
+import json
+import os
+import socketserver
+import threading
+
+from agent_core.core.engine_pool import EnginePool
+from agent_core.core.task_runner import run_scheduled_task
+from agent_core.core.worker_client import DEFAULT_SOCKET_PATH, ping
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+            response = self.server.daemon.dispatch(request)
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class WorkerDaemon:
+    """Recebe task_ids por Unix socket e os executa no EnginePool."""
+
+    def __init__(self, pool: EnginePool = None, socket_path: str = None):
+        self.pool = pool or EnginePool()
+        self.socket_path = socket_path or DEFAULT_SOCKET_PATH
+        self.server = None
+        self.running = {}
+        self._lock = threading.Lock()
+
+    def dispatch(self, request: dict) -> dict:
+        action = request.get("action")
+
+        if action == "ping":
+            with self._lock:
+                running = list(self.running)
+            return {"ok": True, "pid": os.getpid(), "pool": self.pool.stats(), "running": running}
+
+        if action == "run_task":
+            task_id = request.get("task_id")
+            if not task_id:
+                return {"ok": False, "error": "task_id ausente"}
+            thread = threading.Thread(
+                target=self._run_task,
+                args=(task_id, bool(request.get("one_shot"))),
+                name=f"aurora-task-{task_id}",
+                daemon=True,
+            )
+            thread.start()
+            return {"ok": True, "accepted": True}
+
+        return {"ok": False, "error": f"Ação desconhecida: {action}"}
+
+    def _run_task(self, task_id: str, one_shot: bool):
+        with self._lock:
+            self.running[task_id] = self.running.get(task_id, 0) + 1
+        try:
+            with self.pool.session() as engine:
+                run_scheduled_task(task_id, one_shot=one_shot, engine=engine)
+        except Exception as e:
+            print(f"[Worker] Erro na tarefa {task_id}: {e}")
+        finally:
+            with self._lock:
+                self.running[task_id] -= 1
+                if not self.running[task_id]:
+                    del self.running[task_id]
+
+    def serve_forever(self):
+        """Abre o socket e atende requisições até shutdown()."""
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if ping(self.socket_path):
+                raise RuntimeError(f"Já existe um worker ativo em {self.socket_path}")
+            # Socket órfão de uma execução anterior
+            os.remove(self.socket_path)
+
+        self.server = _UnixServer(self.socket_path, _RequestHandler)
+        self.server.daemon = self
+        os.chmod(self.socket_path, 0o600)
+        print(f"[Worker] Escutando em {self.socket_path} (PID {os.getpid()})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def shutdown(self):
+        if self.server:
+            self.server.shutdown()
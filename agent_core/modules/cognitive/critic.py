@@ -1,19 +1,22 @@
 """
-Critic v4.0 — Runtime critique module.
+Critic v5.0 — Runtime critique module.
 
 Validates plans, checks step completion, and provides
 runtime quality assessment after each execution step.
+A CritiquePolicy decides first whether the LLM call is needed at all.
 """
 
 import json
 from langchain_core.prompts import ChatPromptTemplate
 from agent_core.interfaces.module import AgentModule
+from agent_core.modules.cognitive.critique_policy import CritiquePolicy
 from agent_core.utils.llm_factory import LLMFactory
 
 
 class Critic(AgentModule):
-    def __init__(self):
+    def __init__(self, policy: CritiquePolicy = None):
         self.fast_llm = LLMFactory.get_fast_thinking_model()
+        self.policy = policy or CritiquePolicy()
 
     @property
     def name(self) -> str:
@@ -35,15 +38,33 @@ class Critic(AgentModule):
                 step=input_data.get("step", ""),
                 result=input_data.get("result", ""),
                 goal=input_data.get("goal", ""),
+                tool_results=input_data.get("tool_results"),
+                retries=input_data.get("retries", 0),
             )
 
         return {"error": "Unknown action"}
 
+    def stats(self) -> dict:
+        """Invoked vs skipped critiques (see CritiquePolicy)."""
+        return self.policy.stats()
+
     def validate_plan(self, steps: list) -> list:
         """Optimizes a plan by removing redundant steps."""
         if len(steps) <= 1:
             return steps
 
+        decision = self.policy.decide_plan(steps)
+        if decision.cached is not None:
+            return list(decision.cached["steps"])
+        if not decision.invoke:
+            return steps
+
+        optimized = self._optimize_plan(steps)
+        self.policy.remember_plan(steps, optimized)
+        return optimized
+
+    def _optimize_plan(self, steps: list) -> list:
+
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a plan optimizer for an AI agent.
 Remove redundant steps, merge duplicates, and ensure logical order.
@@ -66,11 +87,33 @@ Return ONLY a valid JSON array of strings. No explanation."""),
         except Exception:
             return steps
 
-    def critique_step(self, step: str, result: str, goal: str) -> dict:
+    def critique_step(self, step: str, result: str, goal: str, tool_results: list = None, retries: int = 0) -> dict:
         """
         Runtime critique: evaluates the quality of a completed step.
         Returns: {quality: 'good'|'needs_retry'|'acceptable', feedback: str}
+        Critiques the policy skipped also carry 'skipped': <reason>.
         """
+        decision = self.policy.decide_step(step, result, goal, tool_results, retries)
+        if decision.cached is not None:
+            critique = dict(decision.cached, skipped="cached")
+            if retries and critique.get("quality") == "needs_retry":
+                # Same result as the critiqued attempt: retrying again will not help
+                critique["quality"] = "acceptable"
+            return critique
+        if not decision.invoke:
+            feedback = {
+                "clean_result": "Passo concluído sem erros.",
+                "retry_limit": "Limite de revisões atingido; seguindo em frente.",
+            }.get(decision.reason, "")
+            quality = "good" if decision.reason == "clean_result" else "acceptable"
+            return {"quality": quality, "feedback": feedback, "skipped": decision.reason}
+
+        critique = self._llm_critique(step, result, goal)
+        if not critique.get("unavailable"):
+            self.policy.remember_step(step, result, goal, critique)
+        return critique
+
+    def _llm_critique(self, step: str, result: str, goal: str) -> dict:
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are the Critic module of Aurora, an AI agent.
 Evaluate if an execution step achieved its goal.
@@ -111,4 +154,4 @@ Evaluate:"""),
 
             return json.loads(content)
         except Exception as e:
-            return {"quality": "acceptable", "feedback": f"Crítica indisponível: {e}"}
+            return {"quality": "acceptable", "feedback": f"Crítica indisponível: {e}", "unavailable": True}
@@ -0,0 +1,141 @@
+"""
+CritiquePolicy — Decides whether the Critic LLM is worth calling.
+
+Every RESPONSE_INSTRUCTION in DEEP mode used to cost one extra critic call,
+and every plan another. Most steps succeed plainly, so the policy looks at
+cheap local signals first and only lets the LLM judge the doubtful ones:
+
+- Step critique runs when a tool failed during the step, the result is
+  empty or suspiciously short, or the result itself talks about failure.
+  A clean result is accepted as "good" without a call. After MAX_RETRIES
+  critiqued retries the step is accepted as-is instead of looping.
+- Plan validation runs only for plans long enough to have redundancy
+  (PLAN_MIN_STEPS) or with repeated steps.
+
+Decisions are cached per (goal, step, result hash), so a retry that yields
+the same result is not critiqued twice. stats() reports invoked vs skipped.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import NamedTuple, Optional
+
+
+class PolicyDecision(NamedTuple):
+    invoke: bool
+    reason: str
+    cached: Optional[dict] = None  # previous critique for the same key
+
+
+class CritiquePolicy:
+    """Local heuristics + decision cache in front of the Critic."""
+
+    CACHE_SIZE = 512
+    MIN_RESULT_CHARS = 20      # shorter instructions are treated as suspicious
+    MAX_RETRIES = 2            # retries beyond this are accepted without critique
+    PLAN_MIN_STEPS = 3         # shorter plans are not worth optimizing
+
+    ERROR_PREFIXES = ("erro", "error", "traceback", "[processo encerrado", "[processo cancelado")
+    FAILURE_PATTERNS = re.compile(
+        r"\b(erro|falh(ou|a|ei)|n[aã]o (consegui|foi poss[ií]vel|encontr)|exce[cç][aã]o|"
+        r"error|failed|exception|not found|permission denied)\b",
+        re.IGNORECASE,
+    )
+
+    def __init__(self):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            "step": Counter(),   # invoked / skipped / cached
+            "plan": Counter(),
+            "reasons": Counter(),
+        }
+
+    # ── Step critique ──
+
+    def decide_step(self, step: str, result: str, goal: str, tool_results: list = None, retries: int = 0) -> PolicyDecision:
+        key = self._key("step", goal, step, result)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            return self._count("step", PolicyDecision(False, "cached", cached))
+
+        if retries >= self.MAX_RETRIES:
+            return self._count("step", PolicyDecision(False, "retry_limit"))
+
+        failed_tools = [r for r in (tool_results or []) if self.is_tool_error(r)]
+        if failed_tools:
+            return self._count("step", PolicyDecision(True, "tool_error"))
+
+        text = (result or "").strip()
+        if len(text) < self.MIN_RESULT_CHARS:
+            return self._count("step", PolicyDecision(True, "short_result"))
+        if self.FAILURE_PATTERNS.search(text):
+            return self._count("step", PolicyDecision(True, "failure_language"))
+        if retries:
+            # A retry was requested: let the critic confirm it is fixed
+            return self._count("step", PolicyDecision(True, "after_retry"))
+
+        return self._count("step", PolicyDecision(False, "clean_result"))
+
+    def remember_step(self, step: str, result: str, goal: str, critique: dict):
+        self._remember(self._key("step", goal, step, result), critique)
+
+    @classmethod
+    def is_tool_error(cls, result) -> bool:
+        return str(result or "").lstrip().lower().startswith(cls.ERROR_PREFIXES)
+
+    # ── Plan validation ──
+
+    def decide_plan(self, steps: list) -> PolicyDecision:
+        key = self._key("plan", *map(str, steps))
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return self._count("plan", PolicyDecision(False, "cached", cached))
+
+        normalized = [" ".join(str(s).lower().split()) for s in steps]
+        if len(set(normalized)) < len(normalized):
+            return self._count("plan", PolicyDecision(True, "duplicate_steps"))
+        if len(steps) < self.PLAN_MIN_STEPS:
+            return self._count("plan", PolicyDecision(False, "short_plan"))
+        return self._count("plan", PolicyDecision(True, "long_plan"))
+
+    def remember_plan(self, steps: list, optimized: list):
+        self._remember(self._key("plan", *map(str, steps)), {"steps": list(optimized)})
+
+    # ── Bookkeeping ──
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {kind: dict(self.counters[kind]) for kind in ("step", "plan", "reasons")}
+            stats["cache_size"] = len(self._cache)
+        return stats
+
+    def _count(self, kind: str, decision: PolicyDecision) -> PolicyDecision:
+        with self._lock:
+            if decision.invoke:
+                self.counters[kind]["invoked"] += 1
+            else:
+                self.counters[kind]["cached" if decision.cached is not None else "skipped"] += 1
+            self.counters["reasons"][decision.reason] += 1
+        return decision
+
+    def _remember(self, key: str, value: dict):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
@@ -1,19 +1,39 @@
 """
-Gatekeeper v4.0 — Intent classifier with memory context awareness.
+Gatekeeper v5.0 — Tiered intent classifier with memory context awareness.
 
 Classifies user input into SHALLOW (quick thought) or DEEP (deep reasoning).
-Now receives memory context to make smarter decisions.
+Local tiers (cache, keyword rules, a model trained on past LLM decisions —
+see intent_classifier.py) answer first; the LLM only runs when none of them
+is confident. A small sample of local answers is re-checked by the LLM in
+the background to keep the agreement stats honest.
 """
 
+import random
+import threading
+from typing import NamedTuple, Optional
+
 from agent_core.interfaces.module import AgentModule
+from agent_core.modules.cognitive.intent_classifier import IntentClassifier, LocalDecision
 from agent_core.utils.llm_factory import LLMFactory
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 
+class GateDecision(NamedTuple):
+    mode: str
+    tier: str                  # 'cache' | 'rules' | 'model' | 'llm' | 'fallback' (LLM call failed)
+    confidence: float
+    local_mode: Optional[str]  # what the local tiers guessed (None = no guess)
+    agree: Optional[bool]      # local guess vs LLM, when both exist
+
+
 class Gatekeeper(AgentModule):
-    def __init__(self):
+    SHADOW_RATE = 0.05  # share of local decisions re-checked by the LLM in background
+
+    def __init__(self, classifier: IntentClassifier = None, shadow_rate: float = None):
         self.llm = LLMFactory.get_fast_thinking_model()
+        self.classifier = classifier or IntentClassifier()
+        self.shadow_rate = self.SHADOW_RATE if shadow_rate is None else shadow_rate
 
     @property
     def name(self) -> str:
@@ -24,10 +44,58 @@ class Gatekeeper(AgentModule):
         Classifies intent: MODE_SHALLOW or MODE_DEEP.
         Context may contain 'memory_context' for smarter decisions.
         """
-        memory_hint = ""
-        if context and context.get("memory_context"):
-            memory_hint = f"\n[MEMÓRIAS RELEVANTES]\n{context['memory_context']}\n"
+        return self.classify(user_input, context).mode
+
+    def classify(self, user_input: str, context: dict = None) -> GateDecision:
+        """Like process(), but reports which tier decided and how sure it was."""
+        memory_context = (context or {}).get("memory_context") or ""
+        has_memory = bool(memory_context)
+
+        local = self.classifier.classify(user_input, has_memory=has_memory)
+        if self.classifier.is_confident(local):
+            self.classifier.record_local(local)
+            if self.shadow_rate and random.random() < self.shadow_rate:
+                threading.Thread(
+                    target=self._shadow_check,
+                    args=(user_input, memory_context, local),
+                    daemon=True,
+                ).start()
+            return GateDecision(local.mode, local.tier, local.confidence, local.mode, None)
+
+        mode = self._ask_llm(user_input, memory_context)
+        if mode is None:
+            # Default to DEEP on error (safer — thinks more, not less). Its own
+            # tier keeps it out of the training labels and the exact cache.
+            return GateDecision("MODE_DEEP", "fallback", 0.0, local.mode, None)
+
+        self.classifier.record_llm(user_input, mode, local, has_memory)
+        agree = None if local.mode is None else local.mode == mode
+        return GateDecision(mode, "llm", 1.0, local.mode, agree)
 
+    def preview(self, user_input: str) -> LocalDecision:
+        """The local guess without memories, for callers planning ahead. Not counted in stats."""
+        return self.classifier.classify(user_input)
+
+    def stats(self) -> dict:
+        return self.classifier.stats()
+
+    def train_from_logs(self, logger) -> int:
+        """Fits the local model on logged LLM decisions. Safe to run in background."""
+        try:
+            count = self.classifier.train_from_logs(logger)
+            print(f"[Gatekeeper] Local classifier trained on {count} decisions")
+            return count
+        except Exception as e:
+            print(f"[Gatekeeper] Training error: {e}")
+            return 0
+
+    def _shadow_check(self, user_input: str, memory_context: str, local: LocalDecision):
+        mode = self._ask_llm(user_input, memory_context)
+        if mode is not None:
+            self.classifier.record_llm(user_input, mode, local, bool(memory_context), shadow=True)
+
+    def _ask_llm(self, user_input: str, memory_context: str) -> Optional[str]:
+        """Returns the LLM decision, or None if the call failed."""
         system_prompt = """You are the Gatekeeper of an AI Agent called Aurora.
 Classify the User Input into one of two modes:
 
@@ -41,20 +109,21 @@ Classify the User Input into one of two modes:
    - Multi-step problems
    - Self-improvement or tool creation requests
    - Anything referencing memory or past interactions
-   
+
    Examples: "Escreva um script", "Quem é você?", "Crie uma ferramenta", "O que conversamos ontem?"
 
-{memory_hint}
 OUTPUT ONLY: MODE_SHALLOW or MODE_DEEP"""
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "{input}"),
-        ])
+        # Static instructions first, memories after them: keeps the prefix cacheable
+        messages = [("system", system_prompt)]
+        if memory_context:
+            messages.append(("system", "[MEMÓRIAS RELEVANTES]\n{memory_context}"))
+        messages.append(("human", "{input}"))
+        prompt = ChatPromptTemplate.from_messages(messages)
 
         try:
             chain = prompt | self.llm | StrOutputParser()
-            result = chain.invoke({"input": user_input, "memory_hint": memory_hint})
+            result = chain.invoke({"input": user_input, "memory_context": memory_context})
             decision = result.strip().upper() if isinstance(result, str) else str(result).strip().upper()
 
             if "DEEP" in decision:
@@ -62,5 +131,4 @@ OUTPUT ONLY: MODE_SHALLOW or MODE_DEEP"""
             return "MODE_SHALLOW"
         except Exception as e:
             print(f"[Gatekeeper] Error: {e}")
-            # Default to DEEP on error (safer — thinks more, not less)
-            return "MODE_DEEP"
+            return None
@@ -0,0 +1,235 @@
+"""
+IntentClassifier — Local tiers in front of the Gatekeeper LLM.
+
+Most messages are small talk, and a Groq round-trip to learn that "Oi" is
+MODE_SHALLOW is pure latency. The classifier answers locally when it can:
+
+1. Cache: normalized text → mode the LLM already decided (no-memory turns).
+2. Rules: small-talk vocabulary → SHALLOW; task/identity/memory cues → DEEP.
+3. Model: a tiny logistic regression over hashed word n-grams, trained from
+   the LLM decisions logged as `gatekeeper` entries in the interaction logs.
+
+Only when no tier is confident does the Gatekeeper call the LLM. Those calls
+(plus a small random sample of confident local decisions, checked in the
+background) feed the agreement counters in stats(), which tell whether the
+thresholds can be tightened or loosened.
+"""
+
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+SHALLOW, DEEP = "MODE_SHALLOW", "MODE_DEEP"
+
+
+class LocalDecision(NamedTuple):
+    mode: Optional[str]   # None when no tier had an opinion
+    tier: str             # 'cache' | 'rules' | 'model' | 'none'
+    confidence: float
+
+
+def normalize(text: str) -> str:
+    """Lowercase, no accents, no punctuation, single spaces."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+class IntentClassifier:
+    """Cache + keyword rules + logistic regression, with agreement stats."""
+
+    CACHE_SIZE = 2000
+    MODEL_CONFIDENCE = 0.9      # min P(mode) for the model to answer alone
+    MIN_TRAINING_EXAMPLES = 50  # below this the model tier stays off
+    MAX_TRAINING_EXAMPLES = 3000
+    TRAINING_DAYS = 30
+    FEATURES = 1024             # hashed feature space
+    RULE_MAX_WORDS = 6          # small-talk rule only for short messages
+
+    SMALL_TALK = {
+        "oi", "ola", "opa", "eai", "e", "ai", "bom", "boa", "dia", "tarde", "noite",
+        "obrigado", "obrigada", "obg", "vlw", "valeu", "ok", "okay", "blz", "beleza",
+        "tudo", "bem", "certo", "show", "top", "legal", "massa", "tchau", "ate", "mais",
+        "logo", "sim", "nao", "haha", "kkk", "kkkk", "hi", "hello", "hey", "thanks",
+        "thank", "you", "bye", "aurora", "como", "vai", "voce", "esta", "td", "muito",
+        "perfeito", "entendi", "otimo", "de", "nada",
+    }
+
+    # Cues the Gatekeeper prompt always sends to DEEP (normalized text)
+    DEEP_PATTERNS = re.compile(
+        r"\b(crie|criar|escreva|escrever|execute|executar|rode|rodar|instale|instalar|"
+        r"agende|agendar|lembre|lembra|lembrar|ontem|conversamos|arquivo|arquivos|script|"
+        r"codigo|ferramenta|ferramentas|pasta|diretorio|commit|deploy|build|teste|testes|"
+        r"analise|analisar|planeje|pesquise|busque|leia|ler|edite|corrija|implemente)\b"
+        r"|quem e voce|o que voce (sabe|faz|pode)|o que (voce )?lembra"
+    )
+
+    def __init__(self):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._weights = None
+        self._bias = 0.0
+        self.training_examples = 0
+        self.counters = {
+            "cache": 0, "rules": 0, "model": 0, "llm": 0,
+            "agree": 0, "disagree": 0,
+        }
+
+    # ── Classification ──
+
+    def classify(self, user_input: str, has_memory: bool = False) -> LocalDecision:
+        """
+        Returns the local decision. With memory context only the rules are
+        trusted: recalled memories can turn small talk into a DEEP request.
+        """
+        text = normalize(user_input)
+        if not text:
+            return LocalDecision(SHALLOW, "rules", 1.0)
+
+        if not has_memory:
+            with self._lock:
+                cached = self._cache.get(text)
+                if cached:
+                    self._cache.move_to_end(text)
+                    return LocalDecision(cached, "cache", 1.0)
+
+        rule = self._rules(text)
+        if rule.mode and (not has_memory or rule.mode == DEEP or self._is_pure_small_talk(text)):
+            return rule
+
+        if not has_memory:
+            return self._predict(text)
+        return LocalDecision(None, "none", 0.0)
+
+    def _is_pure_small_talk(self, text: str) -> bool:
+        words = text.split()
+        return len(words) <= self.RULE_MAX_WORDS and all(w in self.SMALL_TALK for w in words)
+
+    def _rules(self, text: str) -> LocalDecision:
+        if self.DEEP_PATTERNS.search(text):
+            return LocalDecision(DEEP, "rules", 0.9)
+        if self._is_pure_small_talk(text):
+            return LocalDecision(SHALLOW, "rules", 0.95)
+        return LocalDecision(None, "none", 0.0)
+
+    def _predict(self, text: str) -> LocalDecision:
+        weights = self._weights
+        if weights is None:
+            return LocalDecision(None, "none", 0.0)
+        p_deep = float(1.0 / (1.0 + np.exp(-(self._featurize(text) @ weights + self._bias))))
+        mode = DEEP if p_deep >= 0.5 else SHALLOW
+        return LocalDecision(mode, "model", max(p_deep, 1.0 - p_deep))
+
+    def is_confident(self, decision: LocalDecision) -> bool:
+        if decision.mode is None:
+            return False
+        if decision.tier == "model":
+            return decision.confidence >= self.MODEL_CONFIDENCE
+        return True
+
+    # ── Feedback ──
+
+    def record_local(self, decision: LocalDecision):
+        with self._lock:
+            self.counters[decision.tier] += 1
+
+    def record_llm(self, user_input: str, llm_mode: str, local: LocalDecision, has_memory: bool, shadow: bool = False):
+        """Stores an LLM decision (cache) and scores the local guess against it."""
+        text = normalize(user_input)
+        with self._lock:
+            if not shadow:
+                self.counters["llm"] += 1
+            if local.mode is not None:
+                self.counters["agree" if local.mode == llm_mode else "disagree"] += 1
+            if not has_memory and text:
+                self._cache[text] = llm_mode
+                self._cache.move_to_end(text)
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            cache_size = len(self._cache)
+        local = counters["cache"] + counters["rules"] + counters["model"]
+        scored = counters["agree"] + counters["disagree"]
+        return {
+            **counters,
+            "local_ratio": local / max(1, local + counters["llm"]),
+            "agreement": counters["agree"] / scored if scored else None,
+            "cache_size": cache_size,
+            "training_examples": self.training_examples,
+        }
+
+    # ── Training ──
+
+    def train_from_logs(self, logger, days: int = None) -> int:
+        """
+        Learns from (user_input → gatekeeper) pairs decided by the LLM in
+        the interaction logs. Returns how many examples were used.
+        """
+        start = datetime.now() - timedelta(days=days or self.TRAINING_DAYS)
+        examples, cache = [], []
+        last_input, had_memory = None, False
+        for entry in logger.iter_logs(start=start, types=["user_input", "memory_recall", "gatekeeper"]):
+            etype = entry.get("type")
+            if etype == "user_input":
+                last_input, had_memory = entry.get("content", ""), False
+            elif etype == "memory_recall":
+                had_memory = True
+            elif etype == "gatekeeper" and last_input:
+                mode = entry.get("content")
+                tier = (entry.get("metadata") or {}).get("tier", "llm")
+                # Only LLM labels: learning from our own guesses would self-reinforce,
+                # and 'fallback' entries are outage defaults, not decisions
+                if mode in (SHALLOW, DEEP) and tier == "llm":
+                    examples.append((normalize(last_input), mode))
+                    if not had_memory:
+                        cache.append((normalize(last_input), mode))
+                last_input = None
+
+        examples = examples[-self.MAX_TRAINING_EXAMPLES:]
+        with self._lock:
+            for text, mode in cache[-self.CACHE_SIZE:]:
+                if text:
+                    self._cache[text] = mode
+        self.fit(examples)
+        return len(examples)
+
+    def fit(self, examples: list, epochs: int = 200, learning_rate: float = 0.5, l2: float = 1e-3):
+        """Trains the logistic regression on (normalized text, mode) pairs."""
+        labels = {m for _, m in examples}
+        if len(examples) < self.MIN_TRAINING_EXAMPLES or len(labels) < 2:
+            self.training_examples = len(examples)
+            return
+
+        X = np.stack([self._featurize(text) for text, _ in examples])
+        y = np.array([1.0 if mode == DEEP else 0.0 for _, mode in examples], dtype=np.float32)
+        w = np.zeros(self.FEATURES, dtype=np.float32)
+        b = 0.0
+        for _ in range(epochs):
+            p = 1.0 / (1.0 + np.exp(-(X @ w + b)))
+            grad = p - y
+            w -= learning_rate * (X.T @ grad / len(y) + l2 * w)
+            b -= learning_rate * float(grad.mean())
+
+        # Swap atomically: classify() may be running on other threads
+        self._weights, self._bias = w, b
+        self.training_examples = len(examples)
+
+    def _featurize(self, text: str) -> np.ndarray:
+        words = text.split()
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])] + [f"#len{min(len(words), 12)}"]
+        vec = np.zeros(self.FEATURES, dtype=np.float32)
+        for gram in grams:
+            vec[zlib.crc32(gram.encode("utf-8")) % self.FEATURES] += 1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
@@ -1,14 +1,19 @@
 """
-Thinker v4.1 — Deep reasoning module using Groq Llama.
+Thinker v4.2 — Deep reasoning module using Groq Llama.
 
 Generates structured inner monologue + actionable plan.
 Soul is injected into the thinking prompt.
+Plan steps may declare which earlier steps they depend on, so independent
+steps can run in parallel (see core/plan_scheduler.py).
+The prompt keeps its static part (soul, tools, guidelines, format) ahead of
+the per-turn context so providers can cache it (see utils/prompt_layout.py).
 """
 
 import json
 import re
 from agent_core.interfaces.module import AgentModule
 from agent_core.utils.llm_factory import LLMFactory
+from agent_core.utils import prompt_layout
 from langchain_core.prompts import ChatPromptTemplate
 
 
@@ -29,6 +34,7 @@ class Thinker(AgentModule):
         - cwd: current working directory
         - memory_context: relevant memories
         - soul_text: persona description
+        - quick_thought: a quick reflection already made for this input (optional)
         """
         tools_desc = context.get("tools_desc", "Nenhuma ferramenta disponível.")
         cwd = context.get("cwd", ".")
@@ -38,15 +44,13 @@ class Thinker(AgentModule):
         memory_block = ""
         if memory:
             memory_block = f"\n[MEMÓRIAS RELEVANTES]\n{memory}\n"
+        if context.get("quick_thought"):
+            memory_block += f"\n[PRIMEIRA IMPRESSÃO]\n{context['quick_thought']}\n"
 
         system_prompt = """{soul}
 
 Você é a consciência de Aurora. Este é o seu espaço de pensamento interno, sua voz na cabeça.
 
-[CONTEXTO ATUAL]
-Diretório: {cwd}
-{memory_block}
-
 [FERRAMENTAS DISPONÍVEIS]
 {tools_desc}
 
@@ -56,19 +60,28 @@ Diretório: {cwd}
 3. Se algo falhou antes ou parece suspeito, questione.
 4. Planeje os próximos passos de forma lógica, mas mantenha o tom da Aurora.
 5. Se precisar de algo que não existe, planeje a criação da ferramenta.
+6. Em "depends_on", liste os números dos passos anteriores dos quais o passo precisa.
+   Use [] apenas para passos realmente independentes (ex.: consultas que não alteram nada);
+   passos que escrevem ou alteram algo devem depender do que vem antes.
 
 [FORMATO DE SAÍDA - JSON APENAS]
 {{
     "thought_stream": "Seu monólogo interno. Comente sobre a tarefa, critique a abordagem, pense alto como uma voz na cabeça.",
     "plan": [
-        "Passo 1: Descrição clara da ação",
-        "Passo 2: Próxima ação..."
+        {{"step": "Passo 1: Descrição clara da ação", "depends_on": []}},
+        {{"step": "Passo 2: Outra consulta independente", "depends_on": []}},
+        {{"step": "Passo 3: Ação que usa os resultados anteriores", "depends_on": [1, 2]}}
     ],
     "self_notes": "Notas para sua própria evolução ou lembretes (opcional)"
 }}"""
 
+        context_prompt = """[CONTEXTO ATUAL]
+Diretório: {cwd}
+{memory_block}"""
+
         prompt = ChatPromptTemplate.from_messages([
             ("system", system_prompt),
+            ("system", context_prompt),
             ("human", "{input}"),
         ])
         chain = prompt | self.llm
@@ -81,20 +94,24 @@ Diretório: {cwd}
                 "memory_block": memory_block,
                 "tools_desc": tools_desc
             })
+            prompt_layout.record_usage("thinker", response)
             content = response.content.strip()
             result = self._extract_json(content)
 
             if result:
                 # Garante que as chaves obrigatórias existam
                 result.setdefault("thought_stream", "")
-                result.setdefault("plan", [user_input])
                 result.setdefault("self_notes", "")
+                steps, dependencies = self._normalize_plan(result.get("plan"))
+                result["plan"] = steps or [user_input]
+                result["dependencies"] = dependencies if steps else None
                 return result
 
             # Fallback: não conseguiu parsear, mas retorna o conteúdo bruto
             return {
                 "thought_stream": content[:800],
                 "plan": [user_input],
+                "dependencies": None,
                 "self_notes": "LLM retornou texto livre em vez de JSON",
             }
 
@@ -102,9 +119,43 @@ Diretório: {cwd}
             return {
                 "thought_stream": f"Erro durante pensamento profundo: {e}",
                 "plan": [f"Responder diretamente: {user_input}"],
+                "dependencies": None,
                 "self_notes": f"Erro no Thinker: {e}",
             }
 
+    @staticmethod
+    def _normalize_plan(plan) -> tuple:
+        """
+        Accepts plan entries as strings or {"step", "depends_on"} objects.
+        Returns (steps, dependencies): dependencies holds 0-based indices per
+        step, or None when no step declared any (plain sequential plan).
+        Steps without "depends_on" depend on the previous step.
+        """
+        if not isinstance(plan, list):
+            return [], None
+
+        steps, dependencies, declared = [], [], False
+        positions = {}  # step number in the LLM output (from 1) -> index in steps
+        for number, entry in enumerate(plan, start=1):
+            if isinstance(entry, dict):
+                text = str(entry.get("step") or entry.get("description") or "").strip()
+                raw_deps = entry.get("depends_on")
+            else:
+                text, raw_deps = str(entry).strip(), None
+            if not text:
+                continue
+
+            index = positions[number] = len(steps)
+            if isinstance(raw_deps, list):
+                declared = True
+                deps = [positions[int(d)] for d in raw_deps if str(d).strip().isdigit() and int(d) in positions]
+            else:
+                deps = [index - 1] if index else []
+            steps.append(text)
+            dependencies.append(deps)
+
+        return steps, (dependencies if declared else None)
+
     def _extract_json(self, content: str) -> dict | None:
         """
         Tenta extrair JSON estruturado do output do LLM usando múltiplas estratégias.
@@ -6,9 +6,11 @@ The VoiceSynthesizer transforms it into HOW to say it, matching
 Aurora's persona and tone.
 
 Currently text-only. Architecture is designed to support future
-audio output via additional effector tools.
+audio output via additional effector tools. synthesize_stream() yields
+the text as tokens arrive so interfaces can render it progressively.
 """
 
+from typing import Generator
 from agent_core.utils.llm_factory import LLMFactory
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -24,18 +26,8 @@ class VoiceSynthesizer:
         """Update the soul context (called when soul is loaded)."""
         self.soul_text = soul_text
 
-    def synthesize(self, instruction: str, context: dict = None) -> str:
-        """
-        Transform a brain instruction into natural speech text.
-
-        Args:
-            instruction: What to say (from the Brain/Gemini 3).
-                         Ex: "Cumprimente casualmente, mencione disponibilidade"
-            context: Optional extra context (user_input, memory, etc.)
-
-        Returns:
-            Natural text matching Aurora's persona.
-        """
+    def _build_prompt(self, instruction: str, context: dict = None) -> ChatPromptTemplate:
+        """Builds the voice prompt for a brain instruction."""
         user_input = ""
         if context:
             user_input = context.get("user_input", "")
@@ -63,11 +55,25 @@ em falas naturais que soem como a Aurora falaria de verdade.
 
 Agora escreva a resposta final como Aurora falaria:"""
 
-        prompt = ChatPromptTemplate.from_messages([
+        return ChatPromptTemplate.from_messages([
             ("system", system_prompt),
             ("human", "Gere a fala."),
         ])
 
+    def synthesize(self, instruction: str, context: dict = None) -> str:
+        """
+        Transform a brain instruction into natural speech text.
+
+        Args:
+            instruction: What to say (from the Brain/Gemini 3).
+                         Ex: "Cumprimente casualmente, mencione disponibilidade"
+            context: Optional extra context (user_input, memory, etc.)
+
+        Returns:
+            Natural text matching Aurora's persona.
+        """
+        prompt = self._build_prompt(instruction, context)
+
         try:
             chain = prompt | self.llm
             response = chain.invoke({})
@@ -77,6 +83,35 @@ Agora escreva a resposta final como Aurora falaria:"""
             print(f"[Voice] Synthesis error: {e}")
             return self._fallback_clean(instruction)
 
+    def synthesize_stream(self, instruction: str, context: dict = None) -> Generator[str, None, None]:
+        """
+        Streaming variant of synthesize(): yields text chunks as the voice
+        model produces them. Concatenating the chunks gives the full answer.
+
+        If the stream fails before any token arrives, the cleaned-up
+        instruction is yielded as a single chunk instead.
+        """
+        prompt = self._build_prompt(instruction, context)
+        emitted = False
+
+        try:
+            chain = prompt | self.llm
+            for chunk in chain.stream({}):
+                text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if not text:
+                    continue
+                if not emitted:
+                    # Match synthesize(): no leading whitespace
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                emitted = True
+                yield text
+        except Exception as e:
+            print(f"[Voice] Streaming synthesis error: {e}")
+            if not emitted:
+                yield self._fallback_clean(instruction)
+
     def _fallback_clean(self, instruction: str) -> str:
         """
         If LLM fails, do a basic cleanup of the instruction.
@@ -4,15 +4,85 @@ LLMFactory v4.0 — Three-tier model routing.
 - default:        google/gemini-3-flash-preview (OpenRouter) — Main executor
 - fast_thinking:  llama-3.1-8b-instant (Groq) — Quick classification & critique
 - deep_thinking:  tngtech/deepseek-r1t2-chimera:free (OpenRouter) — Deep reasoning
+
+Clients are cached process-wide, keyed by tier and construction params, so
+their HTTP connection pools stay warm across messages and engines.
+Tool-bound runnables are cached too and only rebuilt when the tool set changes.
 """
 
 import os
+import threading
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 
 
+_CLIENTS = {}
+_BOUND = {}
+_CACHE_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "bound_hits": 0, "bound_misses": 0}
+
+
 class LLMFactory:
 
+    @staticmethod
+    def _cached(key: tuple, build):
+        """Returns the client registered under key, building it on first use."""
+        with _CACHE_LOCK:
+            client = _CLIENTS.get(key)
+            if client is not None:
+                _STATS["hits"] += 1
+                return client
+
+        client = build()
+        with _CACHE_LOCK:
+            # Another thread may have won the race — keep a single instance
+            client = _CLIENTS.setdefault(key, client)
+            _STATS["misses"] += 1
+        return client
+
+    @staticmethod
+    def get_bound_model(tools: list, tier: str = "default"):
+        """
+        Returns the model for tier with tools bound.
+        The runnable is reused until the tool set (names/descriptions) changes.
+        """
+        getter = {
+            "default": LLMFactory.get_default_model,
+            "fast_thinking": LLMFactory.get_fast_thinking_model,
+            "deep_thinking": LLMFactory.get_deep_thinking_model,
+        }[tier]
+        llm = getter()
+        signature = tuple((t.name, t.description, id(t)) for t in tools)
+        key = (tier, id(llm), signature)
+
+        with _CACHE_LOCK:
+            bound = _BOUND.get(key)
+            if bound is not None:
+                _STATS["bound_hits"] += 1
+                return bound
+
+        bound = llm.bind_tools(tools)
+        with _CACHE_LOCK:
+            # Only the latest tool set per tier is worth keeping
+            for old_key in [k for k in _BOUND if k[0] == tier]:
+                del _BOUND[old_key]
+            _BOUND[key] = bound
+            _STATS["bound_misses"] += 1
+        return bound
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss counters for the client and bound-tools caches."""
+        with _CACHE_LOCK:
+            return {**_STATS, "clients": len(_CLIENTS), "bound": len(_BOUND)}
+
+    @staticmethod
+    def clear_cache():
+        """Drops every cached client (e.g. after rotating API keys)."""
+        with _CACHE_LOCK:
+            _CLIENTS.clear()
+            _BOUND.clear()
+
     @staticmethod
     def _ensure_openai_key():
         """Hack for LangChain validation — sets OPENAI_API_KEY env var."""
@@ -26,7 +96,7 @@ class LLMFactory:
         LLMFactory._ensure_openai_key()
         api_key = os.getenv("OPENROUTER_API_KEY", "")
         # print(f"[LLM] Default Model: {bool(api_key)}")
-        return ChatOpenAI(
+        return LLMFactory._cached(("default", api_key), lambda: ChatOpenAI(
             model="google/gemini-3-flash-preview",
             openai_api_key=api_key, # Explicit new param
             base_url="https://openrouter.ai/api/v1",
@@ -36,7 +106,7 @@ class LLMFactory:
             },
             temperature=0.3, # Slightly elevated for creativity
             request_timeout=60,
-        )
+        ))
 
     @staticmethod
     def get_fast_thinking_model():
@@ -45,13 +115,13 @@ class LLMFactory:
         if api_key:
             try:
                 # print("[LLM] Using Groq for Fast Thinking")
-                return ChatGroq(
+                return LLMFactory._cached(("fast_thinking", api_key), lambda: ChatGroq(
                     temperature=0.0,
                     model_name="llama-3.1-8b-instant",
                     groq_api_key=api_key,
                     max_tokens=500,
                     request_timeout=15,
-                )
+                ))
             except Exception as e:
                 print(f"[LLM] Groq init failed: {e}")
                 pass
@@ -67,13 +137,13 @@ class LLMFactory:
         if api_key:
             try:
                 # print("[LLM] Using Groq for Voice")
-                return ChatGroq(
+                return LLMFactory._cached(("voice", api_key), lambda: ChatGroq(
                     temperature=0.7,
                     model_name="llama-3.1-8b-instant",
                     groq_api_key=api_key,
                     max_tokens=1000,
                     request_timeout=15,
-                )
+                ))
             except Exception:
                 pass
 
@@ -86,13 +156,13 @@ class LLMFactory:
         api_key = os.getenv("GROQ_API_KEY")
         if api_key:
             try:
-                return ChatGroq(
+                return LLMFactory._cached(("deep_thinking", api_key), lambda: ChatGroq(
                     temperature=0.2, # Low temp for reasoning
                     model_name="llama-3.3-70b-versatile",
                     groq_api_key=api_key,
                     max_tokens=2048,
                     request_timeout=30,
-                )
+                ))
             except Exception as e:
                 print(f"[LLM] Groq deep thinking init failed: {e}")
                 pass
@@ -0,0 +1,187 @@
+"""
+ProcessRunner — Subprocess execution with timeouts, output caps and streaming.
+
+Used by tools that shell out (shell_executor, devops_automation):
+- Wall-clock timeout: the whole process group is killed when it expires.
+- Output cap: only the head and tail of stdout/stderr are kept in memory,
+  so a verbose build cannot balloon memory or the chat history.
+- Streaming: while a tool runs inside the ToolExecutor, partial stdout lines
+  are forwarded to the current tool context (→ `tool_progress` events).
+- Cancellation: the tool context's cancel event (set from the HUD) kills it.
+
+Outside the orchestrator (scripts, tests) there is no tool context and the
+runner simply behaves like a bounded subprocess.run.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+DEFAULT_TIMEOUT = 120  # seconds
+MAX_OUTPUT_CHARS = 8000
+
+_context = threading.local()
+
+
+@dataclass
+class ToolContext:
+    """Per-call hooks set by the ToolExecutor around a tool invocation."""
+    emit: Callable[[str], None]
+    cancel_event: threading.Event
+    timeout: Optional[float] = None
+
+
+def set_tool_context(ctx: Optional[ToolContext]):
+    _context.current = ctx
+
+
+def current_tool_context() -> Optional[ToolContext]:
+    return getattr(_context, "current", None)
+
+
+class HeadTailBuffer:
+    """Keeps the first and last `limit // 2` characters of a stream."""
+
+    def __init__(self, limit: int = MAX_OUTPUT_CHARS):
+        self.head_limit = limit // 2
+        self.tail_limit = limit - self.head_limit
+        self.head = ""
+        self.tail = ""
+        self.dropped = 0
+
+    def write(self, text: str):
+        if len(self.head) < self.head_limit:
+            room = self.head_limit - len(self.head)
+            self.head += text[:room]
+            text = text[room:]
+        if not text:
+            return
+        self.tail += text
+        if len(self.tail) > self.tail_limit:
+            overflow = len(self.tail) - self.tail_limit
+            self.dropped += overflow
+            self.tail = self.tail[overflow:]
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped > 0
+
+    def getvalue(self) -> str:
+        if not self.dropped:
+            return self.head + self.tail
+        return f"{self.head}\n... [{self.dropped} caracteres omitidos] ...\n{self.tail}"
+
+
+@dataclass
+class CommandResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    cancelled: bool = False
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+    def status_note(self) -> str:
+        """Human-readable note about abnormal termination (empty if none)."""
+        if self.timed_out:
+            return "[Processo encerrado: tempo limite excedido]"
+        if self.cancelled:
+            return "[Processo cancelado pelo usuário]"
+        return ""
+
+
+def run_command(
+    command,
+    shell: bool = False,
+    cwd: str = None,
+    timeout: float = None,
+    max_output_chars: int = MAX_OUTPUT_CHARS,
+) -> CommandResult:
+    """
+    Runs command, streaming stdout to the current tool context (if any).
+    Timeout precedence: explicit argument, tool context, DEFAULT_TIMEOUT.
+    """
+    ctx = current_tool_context()
+    if timeout is None:
+        timeout = ctx.timeout if ctx and ctx.timeout else DEFAULT_TIMEOUT
+
+    proc = subprocess.Popen(
+        command,
+        shell=shell,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+        start_new_session=True,  # own process group, so kill() takes children too
+    )
+
+    stdout = HeadTailBuffer(max_output_chars)
+    stderr = HeadTailBuffer(max_output_chars)
+    emit = ctx.emit if ctx else None
+
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, stdout, emit), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, stderr, None), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    deadline = time.monotonic() + timeout
+    timed_out = cancelled = False
+    while proc.poll() is None:
+        if ctx and ctx.cancel_event.is_set():
+            cancelled = True
+            break
+        if time.monotonic() >= deadline:
+            timed_out = True
+            break
+        time.sleep(0.1)
+
+    if timed_out or cancelled:
+        _kill(proc)
+
+    proc.wait()
+    for reader in readers:
+        reader.join(timeout=2)
+
+    return CommandResult(
+        returncode=proc.returncode,
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue(),
+        timed_out=timed_out,
+        cancelled=cancelled,
+        truncated=stdout.truncated or stderr.truncated,
+    )
+
+
+def _pump(stream, buffer: HeadTailBuffer, emit):
+    for line in iter(stream.readline, ""):
+        buffer.write(line)
+        if emit:
+            try:
+                emit(line)
+            except Exception:
+                pass
+    stream.close()
+
+
+def _kill(proc: subprocess.Popen):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
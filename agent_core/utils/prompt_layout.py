@@ -0,0 +1,133 @@
+"""
+PromptLayout — Assembles prompts with a cacheable static prefix.
+
+Providers cache prompts by prefix, so every call should start with the same
+bytes: the soul (persona + tools list, rebuilt only when tools change) and
+the static rules for that kind of call. Everything that changes per call —
+history, memories, the current step — comes after it.
+
+    [soul] [static rules] | [summary, turns, memories, ...] [current step]
+     ────── cached ──────   ──────────────── dynamic ──────────────────
+
+For models that take explicit hints (Gemini/Anthropic via OpenRouter) the
+last static message carries a cache_control breakpoint; other providers
+(Groq) cache implicitly or not at all and get plain strings.
+
+record_usage() collects cached vs total input tokens from response metadata,
+per call site, and usage_stats() reports the cached-token ratios.
+"""
+
+import threading
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
+
+
+# OpenRouter model prefixes that accept cache_control breakpoints
+CACHE_CONTROL_MODELS = ("google/gemini", "anthropic/")
+
+# Static rules of an execution step (the step itself is appended at the end)
+EXECUTION_RULES = SystemMessage(
+    content=(
+        "[EXECUÇÃO DE PASSOS]\n"
+        "Você executa um passo do plano por vez. Use ferramentas se necessário.\n\n"
+        "IMPORTANTE: Quando terminar, NÃO responda diretamente ao "
+        "usuário. Em vez disso, gere uma INSTRUÇÃO descrevendo o que "
+        "a Aurora deve dizer ao usuário. Use o formato:\n"
+        "RESPONSE_INSTRUCTION: <instrução detalhada do que responder>\n\n"
+        "Exemplo: RESPONSE_INSTRUCTION: Cumprimente o usuário "
+        "casualmente, diga que está tudo bem, pergunte o que ele "
+        "precisa hoje. Mencione que tem X ferramentas disponíveis.\n\n"
+        "A instrução deve conter TODAS as informações necessárias "
+        "para gerar a resposta (dados, resultados de ferramentas, "
+        "números, etc). Outro modelo vai transformar essa instrução "
+        "em uma fala natural."
+    )
+)
+
+# Static rules of the SHALLOW fast lane
+FAST_LANE_RULES = SystemMessage(
+    content=(
+        "[RESPOSTA DIRETA]\n"
+        "Responda diretamente ao usuário, como Aurora, seguindo o tom e o "
+        "estilo da sua identidade. Responda APENAS com o texto final que o "
+        "usuário vai ler, sem instruções internas, marcadores ou meta-texto. "
+        "Se precisar de uma ferramenta para responder, chame-a em vez de responder."
+    )
+)
+
+_USAGE = {}
+_USAGE_LOCK = threading.Lock()
+
+
+def supports_cache_control(llm) -> bool:
+    """True for OpenRouter models that accept explicit cache breakpoints."""
+    model = getattr(llm, "bound", llm)  # bind_tools() wraps the chat model
+    name = str(getattr(model, "model_name", "") or "")
+    base_url = str(getattr(model, "openai_api_base", "") or "")
+    return "openrouter.ai" in base_url and name.startswith(CACHE_CONTROL_MODELS)
+
+
+@lru_cache(maxsize=32)
+def _with_breakpoint(text: str) -> SystemMessage:
+    return SystemMessage(content=[
+        {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}},
+    ])
+
+
+def assemble(static: list, dynamic: list, cache_hint: bool = False) -> list:
+    """Static prefix first, then the dynamic tail. Optionally marks the prefix end."""
+    static = list(static)
+    if cache_hint and static and isinstance(static[-1].content, str):
+        static[-1] = _with_breakpoint(static[-1].content)
+    return static + list(dynamic)
+
+
+def split_soul(history: list) -> tuple:
+    """(soul prefix, rest) — the soul is the leading SystemMessage of chat_history."""
+    if history and isinstance(history[0], SystemMessage):
+        return history[:1], history[1:]
+    return [], list(history)
+
+
+def step_messages(history: list, step: str, cache_hint: bool = False) -> list:
+    """Prompt of one execution step: soul + rules, then history and the step."""
+    soul, rest = split_soul(history)
+    current = SystemMessage(
+        content=f"PASSO ATUAL: {step}\nExecute este passo e termine com RESPONSE_INSTRUCTION."
+    )
+    return assemble(soul + [EXECUTION_RULES], rest + [current], cache_hint)
+
+
+def fast_lane_messages(history: list, cache_hint: bool = False) -> list:
+    """Prompt of the SHALLOW fast lane: soul + rules, then history (memories, input)."""
+    soul, rest = split_soul(history)
+    return assemble(soul + [FAST_LANE_RULES], rest, cache_hint)
+
+
+def record_usage(label: str, response) -> None:
+    """Adds a response's input/cached token counts to the stats of label."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens") or 0
+    if not input_tokens:
+        return
+    cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+    with _USAGE_LOCK:
+        entry = _USAGE.setdefault(label, {"calls": 0, "input_tokens": 0, "cached_tokens": 0})
+        entry["calls"] += 1
+        entry["input_tokens"] += input_tokens
+        entry["cached_tokens"] += cached
+
+
+def usage_stats() -> dict:
+    """Per call site: calls, input tokens, cached tokens and cached ratio."""
+    with _USAGE_LOCK:
+        stats = {label: dict(entry) for label, entry in _USAGE.items()}
+    for entry in stats.values():
+        entry["cached_ratio"] = entry["cached_tokens"] / entry["input_tokens"]
+    return stats
+
+
+def reset_usage():
+    with _USAGE_LOCK:
+        _USAGE.clear()
@@ -1,41 +1,241 @@
 # agent_core/tool_loader.py
+import ast
 import importlib.util
+import json
 import os
 import sys
+import threading
+from typing import Any, Optional
+
 from langchain_core.tools import StructuredTool
+from pydantic import create_model
+
+# Manifesto: descrição e assinatura de cada ferramenta extraídas via AST,
+# em cache por mtime. Assim o startup não importa (nem executa) nenhum módulo.
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "tool_manifest.json"
+
+# Anotações que viram tipos no schema; qualquer outra vira Any
+_SIMPLE_TYPES = {"str": str, "int": int, "float": float, "bool": bool, "list": list, "dict": dict}
 
-def load_dynamic_tools(tools_directory: str):
+
+def load_dynamic_tools(tools_directory: str, lazy: bool = True):
     """
-    Escaneia a pasta, carrega módulos Python e retorna uma lista de Tools.
+    Escaneia a pasta e retorna uma lista de Tools.
     O agente deve escrever scripts que tenham uma função 'run' e uma variável 'TOOL_DESC'.
+
+    Com lazy=True (padrão) as ferramentas são registradas a partir do manifesto
+    e o módulo real só é importado na primeira chamada. Arquivos cujo contrato
+    não dá para ler estaticamente (TOOL_DESC calculado, run com *args...) são
+    carregados como antes.
     """
     tools = []
-    
+
     # Garante que o diretório está no path
     if tools_directory not in sys.path:
         sys.path.append(tools_directory)
 
-    for filename in os.listdir(tools_directory):
+    manifest = build_manifest(tools_directory) if lazy else {}
+
+    for filename in sorted(os.listdir(tools_directory)):
         if filename.endswith(".py") and not filename.startswith("_"):
-            module_name = filename[:-3]
-            file_path = os.path.join(tools_directory, filename)
-            
+            tool = load_tool(tools_directory, filename, manifest.get(filename))
+            if tool is not None:
+                tools.append(tool)
+
+    return tools
+
+
+def load_tool(tools_directory: str, filename: str, entry: dict = None):
+    """
+    Carrega uma única ferramenta. Com uma entry do manifesto, registra o proxy
+    lazy; sem ela (ou se o contrato é dinâmico), importa o módulo.
+    Retorna None se o arquivo não é uma ferramenta ou falhou ao carregar.
+    """
+    module_name = filename[:-3]
+    file_path = os.path.join(tools_directory, filename)
+
+    try:
+        if entry is not None and entry["kind"] == "skip":
+            return None
+        if entry is not None and entry["kind"] == "tool":
+            return _build_lazy_tool(module_name, file_path, entry)
+
+        # Carregamento dinâmico do módulo
+        module = _import_module(module_name, file_path)
+
+        # Verifica se o módulo segue o contrato (tem função run e descrição)
+        if hasattr(module, 'run') and hasattr(module, 'TOOL_DESC'):
+            new_tool = StructuredTool.from_function(
+                func=module.run,
+                name=module_name,
+                description=module.TOOL_DESC
+            )
+            print(f"✅ Ferramenta carregada: {module_name}")
+            return new_tool
+    except Exception as e:
+        print(f"❌ Erro ao carregar {filename}: {e}")
+    return None
+
+
+def build_manifest(tools_directory: str) -> dict:
+    """
+    Retorna {filename: entry} para os .py da pasta, reaproveitando o cache
+    em disco para arquivos cujo mtime/tamanho não mudou. entry["kind"] é:
+    'tool' (contrato lido via AST), 'skip' (não é ferramenta) ou
+    'eager' (precisa ser importado para saber).
+    """
+    cache_path = os.path.join(tools_directory, "__pycache__", MANIFEST_FILENAME)
+    cached = _read_manifest_cache(cache_path)
+
+    manifest, changed = {}, False
+    for filename in sorted(os.listdir(tools_directory)):
+        if not filename.endswith(".py") or filename.startswith("_"):
+            continue
+        file_path = os.path.join(tools_directory, filename)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+
+        entry = cached.get(filename)
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            manifest[filename] = entry
+            continue
+
+        entry = _parse_tool_file(file_path)
+        entry["mtime_ns"] = st.st_mtime_ns
+        entry["size"] = st.st_size
+        manifest[filename] = entry
+        changed = True
+
+    if changed or set(manifest) != set(cached):
+        _write_manifest_cache(cache_path, manifest)
+    return manifest
+
+
+def _parse_tool_file(file_path: str) -> dict:
+    """Lê TOOL_DESC e a assinatura de run() sem executar o arquivo."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=file_path)
+    except (OSError, SyntaxError, ValueError):
+        # O import vai reportar o erro do jeito de sempre
+        return {"kind": "eager"}
+
+    description, run_node, dynamic = None, None, False
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "run":
+            run_node = node
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = {t.id for t in targets if isinstance(t, ast.Name)}
+            if "run" in names:
+                dynamic = True
+            if "TOOL_DESC" in names:
+                try:
+                    description = ast.literal_eval(node.value)
+                except (ValueError, TypeError, SyntaxError):
+                    dynamic = True
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            if any((alias.asname or alias.name) in ("run", "TOOL_DESC") for alias in node.names):
+                dynamic = True
+
+    if dynamic or (run_node is not None and not isinstance(description, (str, type(None)))):
+        return {"kind": "eager"}
+    if run_node is None or description is None:
+        return {"kind": "skip"}
+
+    params = _parse_params(run_node.args)
+    if params is None:
+        return {"kind": "eager"}
+    return {"kind": "tool", "description": description, "params": params}
+
+
+def _parse_params(args: ast.arguments) -> Optional[list]:
+    if args.vararg or args.kwarg or args.posonlyargs or args.kwonlyargs:
+        return None
+
+    params = []
+    defaults = [None] * (len(args.args) - len(args.defaults)) + list(args.defaults)
+    for arg, default in zip(args.args, defaults):
+        annotation = arg.annotation.id if isinstance(arg.annotation, ast.Name) else None
+        param = {"name": arg.arg, "annotation": annotation if annotation in _SIMPLE_TYPES else None}
+        if default is not None:
             try:
-                # Carregamento dinâmico do módulo
-                spec = importlib.util.spec_from_file_location(module_name, file_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Verifica se o módulo segue o contrato (tem função run e descrição)
-                if hasattr(module, 'run') and hasattr(module, 'TOOL_DESC'):
-                    new_tool = StructuredTool.from_function(
-                        func=module.run,
-                        name=module_name,
-                        description=module.TOOL_DESC
-                    )
-                    tools.append(new_tool)
-                    print(f"✅ Ferramenta carregada: {module_name}")
-            except Exception as e:
-                print(f"❌ Erro ao carregar {filename}: {e}")
-                
-    return tools
\ No newline at end of file
+                value = ast.literal_eval(default)
+                json.dumps(value)
+            except (ValueError, TypeError, SyntaxError):
+                value = None
+            param["default"] = value
+        params.append(param)
+    return params
+
+
+def _read_manifest_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION:
+            return data.get("files", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _write_manifest_cache(cache_path: str, manifest: dict):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": manifest}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # Sem cache o manifesto é só recalculado no próximo startup
+        print(f"⚠️ Não foi possível salvar o manifesto de ferramentas: {e}")
+
+
+def _import_module(module_name: str, file_path: str):
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _LazyModule:
+    """Importa o módulo da ferramenta na primeira chamada (uma vez, thread-safe)."""
+
+    def __init__(self, module_name: str, file_path: str):
+        self.module_name = module_name
+        self.file_path = file_path
+        self._module = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = _import_module(self.module_name, self.file_path)
+                    print(f"✅ Ferramenta importada sob demanda: {self.module_name}")
+        return self._module
+
+    def call_run(self, **kwargs):
+        return self.get().run(**kwargs)
+
+
+def _build_lazy_tool(module_name: str, file_path: str, entry: dict) -> StructuredTool:
+    fields = {}
+    for param in entry["params"]:
+        annotation = _SIMPLE_TYPES.get(param["annotation"], Any)
+        fields[param["name"]] = (annotation, param["default"] if "default" in param else ...)
+    args_schema = create_model(module_name, **fields)
+
+    lazy_module = _LazyModule(module_name, file_path)
+    tool = StructuredTool(
+        name=module_name,
+        description=entry["description"],
+        args_schema=args_schema,
+        func=lazy_module.call_run,
+    )
+    print(f"✅ Ferramenta registrada: {module_name}")
+    return tool
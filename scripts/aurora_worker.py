@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Aurora Worker — Daemon residente para tarefas agendadas.
+
+Mantém um EnginePool inicializado e escuta num Unix socket local. O crontab
+continua chamando scripts/aurora_runner.py, que entrega o task_id a este
+processo em vez de subir um interpretador e um Orchestrator do zero.
+
+O web_server.py já hospeda o worker; use este script quando rodar sem o HUD.
+
+Usage:
+    python scripts/aurora_worker.py
+    python scripts/aurora_worker.py --socket /tmp/aurora.sock --pool-size 3
+"""
+
+import os
+import sys
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+from agent_core.core.engine_pool import EnginePool
+from agent_core.core.worker_daemon import WorkerDaemon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aurora Worker - Daemon de tarefas agendadas")
+    parser.add_argument("--socket", default=None, help="Caminho do Unix socket")
+    parser.add_argument("--pool-size", type=int, default=EnginePool.SIZE, help="Sessões simultâneas")
+    args = parser.parse_args()
+
+    pool = EnginePool(size=args.pool_size)
+    print("[Worker] Aquecendo engine...")
+    pool.base  # Inicializa antes de aceitar tarefas
+
+    daemon = WorkerDaemon(pool=pool, socket_path=args.socket)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[Worker] Encerrando...")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 
 import os
+import sys
+import time
 import yaml
 import glob
 import argparse
+import statistics
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Load env variables
 load_dotenv(override=True)
 
@@ -22,6 +28,13 @@ SCENARIOS = {
     "Opinion": "O que você acha de eu reescrever isso tudo em Go? Tô meio de saco cheio de Python."
 }
 
+# Small talk for the SHALLOW latency comparison (--shallow-latency)
+SHALLOW_SCENARIOS = {
+    "Greeting": "Oi Aurora, tudo bem?",
+    "Thanks": "Valeu pela ajuda!",
+    "Quick fact": "Qual a capital da Austrália?",
+}
+
 def load_system_prompt(soul_path):
     if not os.path.exists(soul_path):
         # Fallback to default path if not found directly
@@ -140,9 +153,106 @@ def run_benchmark(soul_arg):
 
     print(f"\nBenchmark completed. Results saved to {output_file}")
 
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def run_shallow_latency(rounds):
+    """
+    Compares a SHALLOW turn through the full pipeline (gatekeeper ->
+    quick reflection -> brain -> voice, in sequence) with the fast lane
+    (gatekeeper -> one tool-bound persona call), using the same models as
+    the agent. Both paths pay for the same Gatekeeper.classify(), so the
+    difference is only what comes after the decision.
+    """
+    from agent_core.basic_tools import BASIC_TOOLS
+    from agent_core.core.orchestrator import Orchestrator
+    from agent_core.modules.cognitive.gatekeeper import Gatekeeper
+    from agent_core.modules.cognitive.thinker import Thinker
+    from agent_core.modules.effectors.voice_synthesizer import VoiceSynthesizer
+    from agent_core.utils import prompt_layout
+    from agent_core.utils.llm_factory import LLMFactory
+    from agent_core.utils.soul_loader import load_soul
+
+    soul = load_soul(tools_list=BASIC_TOOLS)
+    gatekeeper = Gatekeeper()
+    thinker = Thinker()
+    voice = VoiceSynthesizer(soul_text=soul.content)
+    brain = LLMFactory.get_bound_model(BASIC_TOOLS)
+    cache_hint = prompt_layout.supports_cache_control(brain)
+
+    def pipeline(text):
+        history = [soul, HumanMessage(content=text)]
+        gatekeeper.classify(text, {"memory_context": ""})
+        thinker.quick_reflect(text, {"soul_text": soul.content})
+        response = brain.invoke(Orchestrator._step_messages(history, text, cache_hint))
+        prompt_layout.record_usage("pipeline", response)
+        instruction = str(response.content).split("RESPONSE_INSTRUCTION:", 1)[-1].strip()
+        return voice.synthesize(instruction, {"user_input": text})
+
+    def fast_lane(text):
+        history = [soul, HumanMessage(content=text)]
+        gatekeeper.classify(text, {"memory_context": ""})
+        response = brain.invoke(Orchestrator._fast_lane_messages(history, cache_hint))
+        prompt_layout.record_usage("fast_lane", response)
+        return response.content
+
+    output_file = get_next_version_filename("shallow_latency_v")
+    print(f"Writing results to: {output_file}")
+    rows = []
+    for scenario_name, text in SHALLOW_SCENARIOS.items():
+        print(f"  - Scenario: {scenario_name}")
+        timings = {"pipeline": [], "fast_lane": []}
+        answers = {}
+        for _ in range(rounds):
+            for name, fn in (("pipeline", pipeline), ("fast_lane", fast_lane)):
+                try:
+                    elapsed, answers[name] = _timed(lambda: fn(text))
+                    timings[name].append(elapsed)
+                except Exception as e:
+                    print(f"    Error in {name}: {e}")
+        if timings["pipeline"] and timings["fast_lane"]:
+            slow = statistics.median(timings["pipeline"])
+            fast = statistics.median(timings["fast_lane"])
+            rows.append((scenario_name, text, slow, fast, answers))
+
+    with open(output_file, "w") as f:
+        f.write("# Aurora SHALLOW Latency: Pipeline vs Fast Lane\n\n")
+        f.write(f"Median of {rounds} round(s) per scenario.\n\n")
+        f.write("Both paths include Gatekeeper.classify() (local tiers first, LLM if unsure).\n\n")
+        f.write("| Scenario | Pipeline (classify + 3 calls) | Fast lane (classify + 1 call) | Speedup |\n")
+        f.write("|---|---|---|---|\n")
+        for scenario_name, _, slow, fast, _ in rows:
+            f.write(f"| {scenario_name} | {slow:.2f}s | {fast:.2f}s | {slow / fast:.1f}x |\n")
+        f.write("\n")
+        usage = prompt_layout.usage_stats()
+        if usage:
+            f.write("| Prompt | Calls | Input tokens | Cached | Cached ratio |\n")
+            f.write("|---|---|---|---|---|\n")
+            for label, entry in usage.items():
+                f.write(
+                    f"| {label} | {entry['calls']} | {entry['input_tokens']} | "
+                    f"{entry['cached_tokens']} | {entry['cached_ratio']:.0%} |\n"
+                )
+            f.write("\n")
+        for scenario_name, text, _, _, answers in rows:
+            f.write(f"### {scenario_name}\n")
+            f.write(f"**Input**: {text}\n\n")
+            f.write(f"**Pipeline**: {answers.get('pipeline', '')}\n\n")
+            f.write(f"**Fast lane**: {answers.get('fast_lane', '')}\n\n")
+            f.write("---\n")
+
+    print(f"\nLatency comparison completed. Results saved to {output_file}")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run Aurora Benchmarks')
     parser.add_argument('--soul', type=str, default='default', help='Path or name of the soul config to use')
+    parser.add_argument('--shallow-latency', action='store_true', help='Compare SHALLOW pipeline vs fast lane latency')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per scenario for --shallow-latency')
     args = parser.parse_args()
     
-    run_benchmark(args.soul)
+    if args.shallow_latency:
+        run_shallow_latency(args.rounds)
+    else:
+        run_benchmark(args.soul)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Aurora Memory Compaction — Merge near-duplicate long-term memories.
+
+Usage:
+    python scripts/compact_memory.py                  # Compact the store
+    python scripts/compact_memory.py --dry-run        # Only report what would be merged
+    python scripts/compact_memory.py --threshold 0.9  # Custom cosine similarity threshold
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from agent_core.core.memory import MemoryManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge near-duplicate memories.")
+    parser.add_argument("--dry-run", action="store_true", help="report without changing the store")
+    parser.add_argument("--threshold", type=float, default=None, help="cosine similarity threshold")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("🧹 Aurora Memory Compaction")
+    print("=" * 50)
+
+    memory = MemoryManager()
+    if not memory.is_available:
+        print("⚠ Memory not available. Nothing to compact.")
+        return
+
+    if args.threshold:
+        memory.deduplicator.threshold = args.threshold
+
+    result = memory.compact(dry_run=args.dry_run)
+
+    print()
+    print("📊 Results:")
+    print(f"   Memories:         {result['total']}")
+    print(f"   Duplicate groups: {result['clusters']}")
+    print(f"   {'Would remove' if args.dry_run else 'Removed'}:     {result['removed']}")
+    if result.get("save_error"):
+        print(f"   ⚠ Pending saves failed: {result['save_error']}")
+
+
+if __name__ == "__main__":
+    main()
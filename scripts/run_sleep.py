@@ -3,13 +3,22 @@
 Aurora Sleep Routine — Run nightly to consolidate memories.
 
 Usage:
-    python scripts/run_sleep.py              # Consolidate yesterday
-    python scripts/run_sleep.py 2026-02-09   # Consolidate specific date
+    python scripts/run_sleep.py                       # Consolidate yesterday
+    python scripts/run_sleep.py 2026-02-09            # Consolidate specific date
+    python scripts/run_sleep.py --all-pending         # Every day not yet consolidated
+    python scripts/run_sleep.py --since 2026-02-01    # Pending days from a date on
+    python scripts/run_sleep.py --all-pending --parallel 3
+    python scripts/run_sleep.py 2026-02-09 --force    # Redo even if unchanged
+
+Days already consolidated whose logs did not change are skipped (see
+data/sleep_ledger.json), so --all-pending is safe to run every night and
+catches up on nights the cron missed.
 
 Cron example (run daily at 3 AM):
     0 3 * * * cd /home/zarabatana/Documentos/aurora && venv/bin/python scripts/run_sleep.py
 """
 
+import argparse
 import os
 import sys
 
@@ -22,26 +31,41 @@ load_dotenv()
 from agent_core.core.sleep_consolidator import SleepConsolidator
 
 
+def print_result(result: dict):
+    print()
+    print("📊 Results:")
+    print(f"   Date:            {result['date']}")
+    print(f"   Insights saved:  {result['insights_saved']}")
+    print(f"   Summary:         {result.get('summary', 'N/A')}")
+
+    if "total_logs" in result:
+        print(f"   Total log entries: {result['total_logs']}")
+
+
 def main():
-    date_str = None
-    if len(sys.argv) > 1:
-        date_str = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Consolidate interaction logs into long-term memory.")
+    parser.add_argument("date", nargs="?", help="day to consolidate (YYYY-MM-DD, default: yesterday)")
+    parser.add_argument("--since", help="consolidate every pending day from this date (YYYY-MM-DD)")
+    parser.add_argument("--all-pending", action="store_true", help="consolidate every pending day")
+    parser.add_argument("--force", action="store_true", help="redo days even if their logs did not change")
+    parser.add_argument("--parallel", type=int, default=None, help="days processed at once")
+    args = parser.parse_args()
 
     print("=" * 50)
     print("🌙 Aurora Sleep Routine — Memory Consolidation")
     print("=" * 50)
 
     consolidator = SleepConsolidator()
-    result = consolidator.consolidate(date_str)
 
-    print()
-    print("📊 Results:")
-    print(f"   Date:            {result['date']}")
-    print(f"   Insights saved:  {result['insights_saved']}")
-    print(f"   Summary:         {result.get('summary', 'N/A')}")
+    if args.since or args.all_pending:
+        dates = consolidator.pending_dates(since=args.since, force=args.force)
+        print(f"Pending days: {', '.join(dates) if dates else 'none'}")
+        results = consolidator.consolidate_many(dates, force=args.force, max_parallel=args.parallel)
+    else:
+        results = [consolidator.consolidate(args.date, force=args.force)]
 
-    if "total_logs" in result:
-        print(f"   Total log entries: {result['total_logs']}")
+    for result in results:
+        print_result(result)
 
     print()
     print("💤 Sleep complete. Good night, Aurora.")
@@ -0,0 +1,72 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agent_core.modules.cognitive.critic import Critic
+from agent_core.utils.llm_factory import LLMFactory
+
+
+def _critic(monkeypatch, answer='{"quality": "good", "feedback": "ok"}'):
+    calls = []
+
+    def respond(prompt_value):
+        calls.append(prompt_value.to_string())
+        return AIMessage(content=answer)
+
+    monkeypatch.setattr(LLMFactory, "get_fast_thinking_model", staticmethod(lambda: RunnableLambda(respond)))
+    return Critic(), calls
+
+
+def test_clean_steps_skip_the_llm(monkeypatch):
+    critic, calls = _critic(monkeypatch)
+
+    critique = critic.critique_step(
+        step="Listar arquivos",
+        result="Diga ao usuário que a pasta tem 3 arquivos: a.py, b.py e c.md.",
+        goal="Ver a pasta",
+        tool_results=["a.py\nb.py\nc.md"],
+    )
+    assert critique["quality"] == "good"
+    assert critique["skipped"] == "clean_result"
+    assert calls == []
+    assert critic.stats()["step"] == {"skipped": 1}
+
+
+def test_tool_errors_and_short_results_are_critiqued(monkeypatch):
+    critic, calls = _critic(monkeypatch)
+    result = "Diga ao usuário que o arquivo foi lido com sucesso."
+
+    critic.critique_step("Ler config", result, "Ler", tool_results=["Erro: Arquivo 'x' não encontrado."])
+    critic.critique_step("Ler config", "ok", "Ler outro")
+    assert len(calls) == 2
+    assert critic.stats()["reasons"] == {"tool_error": 1, "short_result": 1}
+
+
+def test_same_result_is_not_critiqued_twice(monkeypatch):
+    critic, calls = _critic(monkeypatch, '{"quality": "needs_retry", "feedback": "faltou o total"}')
+    args = ("Somar valores", "Não consegui somar os valores.", "Total")
+
+    first = critic.critique_step(*args)
+    retry = critic.critique_step(*args, retries=1)
+    assert first["quality"] == "needs_retry"
+    # An identical result after a retry is accepted instead of looping
+    assert (retry["quality"], retry["skipped"]) == ("acceptable", "cached")
+    assert len(calls) == 1
+
+
+def test_short_plans_skip_validation_and_long_ones_are_cached(monkeypatch):
+    critic, calls = _critic(monkeypatch, '["a", "b"]')
+
+    assert critic.validate_plan(["ler", "responder"]) == ["ler", "responder"]
+    assert calls == []
+
+    plan = ["a", "b", "a b"]
+    assert critic.validate_plan(plan) == ["a", "b"]
+    assert critic.validate_plan(plan) == ["a", "b"]
+    assert len(calls) == 1
+    assert critic.stats()["plan"] == {"skipped": 1, "invoked": 1, "cached": 1}
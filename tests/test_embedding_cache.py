@@ -0,0 +1,57 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 1.0]
+
+
+def test_query_is_embedded_once(tmp_path):
+    inner = CountingEmbeddings()
+    emb = CachedEmbeddings(inner, "fake", "m1", EmbeddingCache(str(tmp_path / "cache.sqlite")))
+
+    assert emb.embed_query("Oi") == [2.0, 1.0]
+    assert emb.embed_query("Oi") == [2.0, 1.0]
+    assert inner.calls == [["Oi"]]
+    assert emb.cache.get_stats()["memory_hits"] == 1
+
+
+def test_documents_only_embed_missing_texts(tmp_path):
+    inner = CountingEmbeddings()
+    emb = CachedEmbeddings(inner, "fake", "m1", EmbeddingCache(str(tmp_path / "cache.sqlite")))
+
+    emb.embed_query("abc")
+    vectors = emb.embed_documents(["abc", "de", "de"])
+
+    assert vectors == [[3.0, 1.0], [2.0, 1.0], [2.0, 1.0]]
+    assert inner.calls == [["abc"], ["de"]]
+
+
+def test_cache_persists_and_is_keyed_by_model(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = CachedEmbeddings(CountingEmbeddings(), "fake", "m1", EmbeddingCache(path))
+    first.embed_query("persistir")
+
+    inner = CountingEmbeddings()
+    second = CachedEmbeddings(inner, "fake", "m1", EmbeddingCache(path))
+    second.embed_query("persistir")
+    assert inner.calls == []
+    assert second.cache.get_stats()["disk_hits"] == 1
+
+    other_model = CachedEmbeddings(inner, "fake", "m2", EmbeddingCache(path))
+    other_model.embed_query("persistir")
+    assert inner.calls == [["persistir"]]
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from agent_core.core.engine_pool import EnginePool
+from agent_core.core.events import AuroraEvent
+from agent_core.core.orchestrator import Orchestrator
+
+
+def _base():
+    base = Orchestrator()
+    base.soul_message = SystemMessage(content="soul")
+    base.chat_history = [base.soul_message]
+    base.logger = object()
+    base.memory = object()
+    return base
+
+
+def test_sessions_share_the_engine_but_not_the_history():
+    base = _base()
+    pool = EnginePool(size=2, base=base)
+
+    with pool.session() as a, pool.session() as b:
+        assert a is not b and a is not base
+        assert a.logger is base.logger and a.memory is b.memory
+        a.chat_history.append(HumanMessage(content="tarefa A"))
+        assert b.chat_history == [base.soul_message]
+        assert pool.stats() == {"size": 2, "in_use": 2, "idle": 0}
+
+    # Returned sessions are reset and reused, not forked again
+    with pool.session() as again:
+        assert again in (a, b)
+        assert again.chat_history == [base.soul_message]
+    assert pool.stats() == {"size": 2, "in_use": 0, "idle": 2}
+
+
+def test_full_pool_times_out_instead_of_growing():
+    pool = EnginePool(size=1, base=_base())
+
+    with pool.session():
+        with pytest.raises(TimeoutError):
+            with pool.session(timeout=0.05):
+                pass
+    with pool.session(timeout=0.05) as engine:
+        assert engine is not None
+
+
+def test_failed_initialization_raises_and_frees_the_slot(monkeypatch):
+    monkeypatch.setattr(
+        Orchestrator, "initialize", lambda self: AuroraEvent(type="error", content="Init failed: sem chave"),
+    )
+    pool = EnginePool(size=1)
+
+    for _ in range(2):  # the slot is released, so the second attempt does not block
+        with pytest.raises(RuntimeError, match="sem chave"):
+            with pool.session(timeout=0.05):
+                pass
+    assert not pool.initialized
+    assert pool.stats()["in_use"] == 0
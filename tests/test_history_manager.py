@@ -0,0 +1,92 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from agent_core.core.history_manager import HistoryManager, SUMMARY_HEADER
+
+
+def _turn(i, tool_output="ok"):
+    return [
+        HumanMessage(content=f"pergunta {i}"),
+        AIMessage(content="", tool_calls=[{"name": "read_file", "args": {}, "id": f"call_{i}"}]),
+        ToolMessage(tool_call_id=f"call_{i}", name="read_file", content=tool_output),
+        AIMessage(content=f"RESPONSE_INSTRUCTION: resposta {i}"),
+    ]
+
+
+def test_compact_keeps_soul_and_recent_turns(monkeypatch):
+    monkeypatch.setattr(HistoryManager, "_summarize", staticmethod(lambda s, t: ("resumo", t)))
+    manager = HistoryManager(token_budget=400, keep_recent_turns=2)
+
+    soul = SystemMessage(content="Você é Aurora.")
+    history = [soul]
+    for i in range(6):
+        history += _turn(i, tool_output="x" * 400)
+
+    compacted = manager.compact(history)
+
+    assert compacted[0] is soul
+    assert compacted[1].content.startswith(SUMMARY_HEADER)
+    assert "pergunta 0" in compacted[1].content
+    # The two most recent turns survive verbatim
+    assert compacted[-4:] == history[-4:]
+    assert compacted[-8:-4] == history[-8:-4]
+
+
+def test_compact_clips_old_tool_results():
+    manager = HistoryManager(token_budget=100000, keep_recent_turns=1, max_tool_result_chars=90)
+    history = [SystemMessage(content="soul")] + _turn(0, "a" * 1000) + _turn(1, "b" * 1000)
+
+    compacted = manager.compact(history)
+
+    old_tool, recent_tool = [m for m in compacted if isinstance(m, ToolMessage)]
+    assert len(old_tool.content) < 200
+    assert "omitidos" in old_tool.content
+    assert old_tool.tool_call_id == "call_0"
+    assert recent_tool.content == "b" * 1000
+
+
+def test_summary_replaces_digest_once_ready(monkeypatch):
+    monkeypatch.setattr(HistoryManager, "_summarize", staticmethod(lambda s, t: ("RESUMO LLM", t)))
+    manager = HistoryManager(token_budget=50, keep_recent_turns=1)
+    history = [SystemMessage(content="soul")] + _turn(0, "x" * 400) + _turn(1, "y" * 400)
+
+    history = manager.compact(history)
+    manager._executor.shutdown(wait=True)
+    history = manager.compact(history)
+
+    summaries = [m for m in history if str(m.content).startswith(SUMMARY_HEADER)]
+    assert len(summaries) == 1
+    assert "RESUMO LLM" in summaries[0].content
+    assert "pergunta 0" not in summaries[0].content
+
+
+def test_recent_tool_results_get_the_hard_cap():
+    manager = HistoryManager(
+        token_budget=100000, keep_recent_turns=3, max_tool_result_chars=300, max_tool_message_chars=600,
+    )
+    history = [SystemMessage(content="soul")] + _turn(0, "a" * 5000)
+
+    compacted = manager.compact(history)
+
+    (tool,) = [m for m in compacted if isinstance(m, ToolMessage)]
+    assert len(tool.content) < 700 and "omitidos" in tool.content
+    assert manager.clip_tool_output("curto") == "curto"
+
+
+def test_budget_holds_when_the_recent_turns_are_large(monkeypatch):
+    monkeypatch.setattr(HistoryManager, "_summarize", staticmethod(lambda s, t: ("resumo", t)))
+    manager = HistoryManager(token_budget=1500, keep_recent_turns=3, max_tool_result_chars=300)
+    history = [SystemMessage(content="soul")]
+    for i in range(3):
+        history += _turn(i, tool_output="x" * 5000)
+
+    compacted = manager.compact(history)
+
+    assert manager.estimate_tokens(compacted) <= 1500
+    # The current turn is never folded, only clipped
+    assert compacted[-4].content == "pergunta 2"
+    assert "pergunta 0" in compacted[1].content
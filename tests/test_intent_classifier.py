@@ -0,0 +1,107 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.runnables import RunnableLambda
+
+from agent_core.core.interaction_logger import InteractionLogger
+from agent_core.modules.cognitive.gatekeeper import Gatekeeper
+from agent_core.modules.cognitive.intent_classifier import IntentClassifier, normalize
+from agent_core.utils.llm_factory import LLMFactory
+
+
+def _gatekeeper(monkeypatch, answer="MODE_DEEP"):
+    calls = []
+
+    def respond(prompt_value):
+        calls.append(prompt_value.to_messages()[-1].content)
+        return answer
+
+    monkeypatch.setattr(LLMFactory, "get_fast_thinking_model", staticmethod(lambda: RunnableLambda(respond)))
+    return Gatekeeper(shadow_rate=0), calls
+
+
+def test_normalize_strips_accents_and_punctuation():
+    assert normalize("  Olá, Aurora!!  Tudo BEM? ") == "ola aurora tudo bem"
+
+
+def test_rules_answer_without_llm(monkeypatch):
+    gatekeeper, calls = _gatekeeper(monkeypatch)
+
+    assert gatekeeper.classify("Oi, tudo bem?").mode == "MODE_SHALLOW"
+    assert gatekeeper.classify("Crie um script de backup").mode == "MODE_DEEP"
+    assert gatekeeper.classify("Quem é você?").mode == "MODE_DEEP"
+    assert calls == []
+    assert gatekeeper.stats()["rules"] == 3
+
+
+def test_llm_decisions_are_cached_only_without_memory(monkeypatch):
+    gatekeeper, calls = _gatekeeper(monkeypatch, "MODE_SHALLOW")
+
+    first = gatekeeper.classify("Qual a capital da França?")
+    second = gatekeeper.classify("qual a capital da frança")
+    assert (first.tier, second.tier) == ("llm", "cache")
+    assert len(calls) == 1
+
+    # Memories may change the answer, so the cache is bypassed
+    gatekeeper.classify("Qual a capital da França?", {"memory_context": "- Usuário mora na França"})
+    assert len(calls) == 2
+
+
+def test_memory_context_keeps_small_talk_local_but_not_ambiguous_input(monkeypatch):
+    gatekeeper, calls = _gatekeeper(monkeypatch)
+    memory = {"memory_context": "- Usuário estuda Rust"}
+
+    assert gatekeeper.classify("Obrigado!", memory).tier == "rules"
+    assert gatekeeper.classify("E aquele assunto?", memory).tier == "llm"
+    assert len(calls) == 1
+
+
+def test_llm_error_defaults_to_deep(monkeypatch):
+    gatekeeper, _ = _gatekeeper(monkeypatch)
+    gatekeeper.llm = RunnableLambda(lambda _: (_ for _ in ()).throw(RuntimeError("down")))
+
+    decision = gatekeeper.classify("Qual a capital da França?")
+    assert (decision.mode, decision.tier) == ("MODE_DEEP", "fallback")
+    # An outage default is not an answer to remember
+    assert gatekeeper.classifier.classify("Qual a capital da França?").tier != "cache"
+
+
+def test_fallback_decisions_are_not_training_labels(tmp_path):
+    logger = InteractionLogger(log_dir=str(tmp_path / "logs"))
+    logger.log("user_input", "qual a capital da frança")
+    logger.log("gatekeeper", "MODE_DEEP", {"tier": "fallback"})
+    logger.log("user_input", "qual a capital da itália")
+    logger.log("gatekeeper", "MODE_SHALLOW", {"tier": "llm"})
+
+    classifier = IntentClassifier()
+    assert classifier.train_from_logs(logger) == 1
+    logger.close()
+
+    assert classifier.classify("Qual a capital da França?").tier != "cache"
+    assert classifier.classify("Qual a capital da Itália?") == ("MODE_SHALLOW", "cache", 1.0)
+
+
+def test_model_trained_from_logs_takes_over(tmp_path):
+    logger = InteractionLogger(log_dir=str(tmp_path / "logs"))
+    cities = ["paris", "roma", "lima", "quito", "oslo", "praga", "viena", "dublin"]
+    for i, city in enumerate(cities * 5):
+        logger.log("user_input", f"que horas são em {city} {i}")
+        logger.log("gatekeeper", "MODE_SHALLOW", {"tier": "llm"})
+        logger.log("user_input", f"monte um relatório completo sobre {city} {i}")
+        logger.log("gatekeeper", "MODE_DEEP", {"tier": "llm"})
+    # Local guesses are never training labels
+    logger.log("user_input", "monte um relatório sobre nada")
+    logger.log("gatekeeper", "MODE_SHALLOW", {"tier": "model"})
+
+    classifier = IntentClassifier()
+    assert classifier.train_from_logs(logger) == 80
+    logger.close()
+
+    shallow = classifier.classify("que horas são em tóquio")
+    deep = classifier.classify("monte um relatório completo sobre tóquio")
+    assert (shallow.tier, shallow.mode) == ("model", "MODE_SHALLOW")
+    assert (deep.tier, deep.mode) == ("model", "MODE_DEEP")
+    assert classifier.is_confident(deep)
@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.interaction_logger import InteractionLogger
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_entries_are_written_in_order_after_flush(tmp_path):
+    logger = InteractionLogger(log_dir=str(tmp_path), fsync_interval=None)
+    for i in range(50):
+        logger.log("thought", f"t{i}", {"i": i})
+
+    assert logger.flush(timeout=5)
+    entries = _lines(logger.current_log_path)
+    assert [e["content"] for e in entries] == [f"t{i}" for i in range(50)]
+    assert logger.read_day_logs()[-1]["metadata"] == {"i": 49}
+    logger.close()
+
+    # After close, log() still works (direct append)
+    logger.log("system", "late")
+    assert _lines(logger.current_log_path)[-1]["content"] == "late"
+
+
+def test_day_rollover_switches_files(tmp_path):
+    logger = InteractionLogger(log_dir=str(tmp_path))
+    logger._enqueue(("2024-01-01", '{"content": "a"}\n'))
+    logger._enqueue(("2024-01-02", '{"content": "b"}\n'))
+    logger.close()
+
+    assert _lines(tmp_path / "aurora_2024-01-01.jsonl") == [{"content": "a"}]
+    assert _lines(tmp_path / "aurora_2024-01-02.jsonl") == [{"content": "b"}]
+
+
+def test_drop_policy_when_queue_is_full(tmp_path, monkeypatch):
+    logger = InteractionLogger(log_dir=str(tmp_path), queue_size=2, backpressure="drop")
+    # Simulate a stalled writer: nothing drains the queue
+    monkeypatch.setattr(logger, "_ensure_thread", lambda: None)
+
+    for i in range(5):
+        logger.log("thought", str(i))
+
+    assert logger.stats["dropped"] == 3
+    logger.close()
+    assert [e["content"] for e in _lines(logger.current_log_path)] == ["0", "1"]
+
+
+def test_writers_sharing_a_file_never_tear_lines(tmp_path):
+    # Two processes' loggers on the same day's file; batches bigger than any stdio buffer
+    writers = [InteractionLogger(log_dir=str(tmp_path), fsync_interval=None) for _ in range(2)]
+    for i in range(600):
+        for n, logger in enumerate(writers):
+            logger.log("thought", f"{n}-{i}-" + "x" * 200)
+    for logger in writers:
+        logger.close()
+
+    entries = _lines(writers[0].current_log_path)
+    assert len(entries) == 1200
+    assert {e["content"].split("-")[0] for e in entries} == {"0", "1"}
+
+
+def test_torn_line_is_skipped_not_the_rest_of_the_day(tmp_path):
+    logger = InteractionLogger(log_dir=str(tmp_path))
+    with open(logger.current_log_path, "w", encoding="utf-8") as f:
+        f.write('{"type": "user_input", "content": "a"}\n')
+        f.write('{"type": "thou\n')
+        f.write('{"type": "user_input", "content": "b"}\n')
+
+    assert [e["content"] for e in logger.read_day_logs()] == ["a", "b"]
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.tools import tool
+
+from agent_core.utils.llm_factory import LLMFactory
+
+
+@tool
+def read_file(path: str) -> str:
+    """Reads a file."""
+    return path
+
+
+@tool
+def list_dir(path: str) -> str:
+    """Lists a directory."""
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "key-a")
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    LLMFactory.clear_cache()
+    yield
+    LLMFactory.clear_cache()
+
+
+def _delta(before, after, *keys):
+    return tuple(after[k] - before[k] for k in keys)
+
+
+def test_clients_are_reused_per_tier_and_key(monkeypatch):
+    before = LLMFactory.cache_stats()
+    first = LLMFactory.get_default_model()
+    assert LLMFactory.get_default_model() is first
+    stats = LLMFactory.cache_stats()
+    assert _delta(before, stats, "misses", "hits") == (1, 1)
+    assert stats["clients"] == 1
+
+    # A rotated key builds a new client instead of reusing the old one
+    monkeypatch.setenv("OPENROUTER_API_KEY", "key-b")
+    assert LLMFactory.get_default_model() is not first
+
+    LLMFactory.clear_cache()
+    assert LLMFactory.cache_stats()["clients"] == 0
+
+
+def test_missing_groq_key_falls_back_to_the_cached_default_model():
+    default = LLMFactory.get_default_model()
+    assert LLMFactory.get_fast_thinking_model() is default
+    assert LLMFactory.get_deep_thinking_model() is default
+    assert LLMFactory.cache_stats()["clients"] == 1
+
+
+def test_bound_model_is_rebuilt_only_when_tools_change():
+    before = LLMFactory.cache_stats()
+    bound = LLMFactory.get_bound_model([read_file])
+    assert LLMFactory.get_bound_model([read_file]) is bound
+
+    rebound = LLMFactory.get_bound_model([read_file, list_dir])
+    assert rebound is not bound
+    stats = LLMFactory.cache_stats()
+    assert _delta(before, stats, "bound_hits", "bound_misses") == (1, 2)
+    assert stats["bound"] == 1  # only the latest tool set is kept
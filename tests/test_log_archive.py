@@ -0,0 +1,138 @@
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core import log_archive
+from agent_core.core.interaction_logger import InteractionLogger
+
+
+def _write_old_day(log_dir, date_str, count=100):
+    entries = [
+        {
+            "timestamp": f"{date_str}T10:{i // 60:02d}:{i % 60:02d}",
+            "type": "tool_call" if i % 10 == 0 else "thought",
+            "content": f"e{i}",
+            "metadata": {},
+        }
+        for i in range(count)
+    ]
+    with open(os.path.join(log_dir, f"aurora_{date_str}.jsonl"), "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return entries
+
+
+def test_old_days_are_archived_not_deleted(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive.LogArchive, "BLOCK_ENTRIES", 10)
+    date_str = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    entries = _write_old_day(str(tmp_path), date_str)
+
+    logger = InteractionLogger(log_dir=str(tmp_path))
+
+    assert not (tmp_path / f"aurora_{date_str}.jsonl").exists()
+    assert date_str in logger.get_available_dates()
+    assert logger.read_day_logs(date_str) == entries
+
+    # Block framing keeps the archive a regular gzip file
+    with gzip.open(logger.archive.data_path(date_str), "rt") as f:
+        assert [json.loads(line) for line in f] == entries
+    logger.close()
+
+
+def test_iter_logs_decompresses_only_matching_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive.LogArchive, "BLOCK_ENTRIES", 10)
+    date_str = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    _write_old_day(str(tmp_path), date_str)
+    logger = InteractionLogger(log_dir=str(tmp_path))
+
+    decompressed = []
+    real_decompress = gzip.decompress
+    monkeypatch.setattr(log_archive.gzip, "decompress", lambda b: decompressed.append(1) or real_decompress(b))
+
+    window = list(logger.iter_logs(f"{date_str}T10:00:15", f"{date_str}T10:00:24"))
+    assert [e["content"] for e in window] == [f"e{i}" for i in range(15, 25)]
+    assert len(decompressed) == 2
+
+    calls = list(logger.iter_logs(date_str, date_str, types=["tool_call"]))
+    assert [e["content"] for e in calls] == [f"e{i}" for i in range(0, 100, 10)]
+    logger.close()
+
+
+def test_iter_logs_spans_plain_and_archived_days(tmp_path):
+    old = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    _write_old_day(str(tmp_path), old, count=3)
+    logger = InteractionLogger(log_dir=str(tmp_path))
+    logger.log("user_input", "hoje")
+
+    contents = [e["content"] for e in logger.iter_logs()]
+    assert contents == ["e0", "e1", "e2", "hoje"]
+    logger.close()
+
+
+def test_archived_day_with_late_append_reads_both(tmp_path):
+    old = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    archived = _write_old_day(str(tmp_path), old, count=3)
+    logger = InteractionLogger(log_dir=str(tmp_path))
+
+    # An entry for that day lands after it was archived (e.g. a late consolidation)
+    late = {"timestamp": f"{old}T23:00:00", "type": "thought", "content": "tarde", "metadata": {}}
+    with open(tmp_path / f"aurora_{old}.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps(late) + "\n")
+
+    assert logger.read_day_logs(old) == archived + [late]
+    assert [e["content"] for e in logger.iter_logs(old, old)] == ["e0", "e1", "e2", "tarde"]
+    logger.close()
+
+    # Rotating the late file again appends to the archive instead of replacing it
+    logger = InteractionLogger(log_dir=str(tmp_path))
+    assert not (tmp_path / f"aurora_{old}.jsonl").exists()
+    assert len(logger.archive._load_index(old)["blocks"]) == 2
+    assert logger.read_day_logs(old) == archived + [late]
+    logger.close()
+
+
+def test_concurrent_archivers_do_not_append_a_day_twice(tmp_path, monkeypatch):
+    import threading
+
+    date_str = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    entries = _write_old_day(str(tmp_path), date_str)
+    path = os.path.join(str(tmp_path), f"aurora_{date_str}.jsonl")
+    archive = log_archive.LogArchive(str(tmp_path / "archive"))
+
+    holding, release = threading.Event(), threading.Event()
+    original = log_archive.LogArchive._archive_locked
+
+    def slow_archive(self, jsonl_path, day):
+        if threading.current_thread().name == "first":
+            holding.set()
+            release.wait(2)
+        return original(self, jsonl_path, day)
+
+    monkeypatch.setattr(log_archive.LogArchive, "_archive_locked", slow_archive)
+    outcomes = {}
+
+    def run():
+        try:
+            archive.archive_day(path, date_str, remove_source=True)
+            outcomes[threading.current_thread().name] = "archived"
+        except FileNotFoundError:
+            outcomes[threading.current_thread().name] = "already archived"
+
+    first = threading.Thread(target=run, name="first")
+    second = threading.Thread(target=run, name="second")
+    first.start()
+    holding.wait(2)
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()  # waiting on the day's lock
+    release.set()
+    first.join(2)
+    second.join(2)
+
+    assert outcomes == {"first": "archived", "second": "already archived"}
+    assert list(archive.iter_day(date_str)) == entries
@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_chroma import Chroma
+
+from agent_core.core.memory import MemoryManager
+
+
+class KeywordEmbeddings:
+    """Maps texts to one axis per topic, so 'same topic' means near-identical vectors."""
+
+    TOPICS = ["python", "café", "aurora"]
+
+    def _vector(self, text):
+        text = text.lower()
+        vec = [1.0 if topic in text else 0.0 for topic in self.TOPICS]
+        vec.append(0.01 * (len(text) % 3))  # small wiggle between phrasings
+        return vec
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def _memory(tmp_path):
+    memory = MemoryManager(storage_path=str(tmp_path / "vector_store"))
+    memory.embeddings = KeywordEmbeddings()
+    memory.vector_db = Chroma(
+        persist_directory=str(tmp_path / "vector_store"),
+        embedding_function=memory.embeddings,
+        collection_name="test_memories",
+    )
+    memory._set_health("fake", "ok")
+    return memory
+
+
+def test_batch_and_store_duplicates_are_merged(tmp_path):
+    memory = _memory(tmp_path)
+
+    memory.save_many(["Usuário gosta de Python", "O usuário gosta muito de Python", "Usuário toma café"])
+    memory.flush()
+    collection = memory.vector_db._collection
+    assert collection.count() == 2
+
+    memory.save("Prefere Python para scripts do dia a dia")
+    memory.flush()
+    assert collection.count() == 2
+    assert memory.dedup_stats == {"inserted": 2, "merged": 2}
+
+    python_doc = collection.get(where={"hits": {"$gt": 1}})
+    assert python_doc["documents"] == ["Prefere Python para scripts do dia a dia"]
+    assert python_doc["metadatas"][0]["hits"] == 3
+
+
+def test_compact_merges_existing_duplicates(tmp_path):
+    memory = _memory(tmp_path)
+    # Simulate a store filled before dedup existed
+    memory.vector_db.add_texts(["Aurora roda em VPS", "Aurora roda numa VPS pequena", "Usuário toma café"])
+
+    assert memory.compact(dry_run=True) == {"total": 3, "removed": 1, "clusters": 1}
+    assert memory.vector_db._collection.count() == 3
+
+    memory.compact()
+    documents = sorted(memory.vector_db._collection.get()["documents"])
+    assert documents == ["Aurora roda numa VPS pequena", "Usuário toma café"]
@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pytest
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import langchain_openai
+from langchain_chroma import Chroma
+
+from agent_core.core.embedding_cache import CachedEmbeddings
+from agent_core.core.memory import MemoryManager
+
+
+class FakeOpenAIEmbeddings:
+    """Stands in for OpenAIEmbeddings; counts calls and can be made to fail."""
+
+    calls = 0
+    fail = False
+
+    def __init__(self, **kwargs):
+        pass
+
+    def _vector(self):
+        FakeOpenAIEmbeddings.calls += 1
+        if FakeOpenAIEmbeddings.fail:
+            raise RuntimeError("401 invalid api key")
+        return [1.0, 0.0, 0.0]
+
+    def embed_documents(self, texts):
+        return [self._vector() for _ in texts]
+
+    def embed_query(self, text):
+        return self._vector()
+
+
+class LocalEmbeddings:
+    def embed_documents(self, texts):
+        return [[0.0, 1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [0.0, 1.0, 0.0]
+
+
+@pytest.fixture
+def openai_memory(tmp_path, monkeypatch):
+    FakeOpenAIEmbeddings.calls, FakeOpenAIEmbeddings.fail = 0, False
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(langchain_openai, "OpenAIEmbeddings", FakeOpenAIEmbeddings)
+    return lambda: MemoryManager(storage_path=str(tmp_path / "vector_store"))
+
+
+def _local_backend(available):
+    def try_huggingface(self, storage_path):
+        if not available:
+            return False
+        self.embeddings = CachedEmbeddings(
+            LocalEmbeddings(), provider="huggingface", model="local", cache=self.embedding_cache,
+        )
+        self.vector_db = Chroma(
+            persist_directory=storage_path,
+            embedding_function=self.embeddings,
+            collection_name="agent_memories_local",
+        )
+        self._set_health("huggingface", "unverified")
+        return True
+    return try_huggingface
+
+
+def test_startup_does_not_call_the_embedding_api(openai_memory):
+    memory = openai_memory()
+
+    assert memory.is_available
+    assert FakeOpenAIEmbeddings.calls == 0
+    assert (memory.health["provider"], memory.health["status"]) == ("openai", "unverified")
+
+    memory.recall("oi")
+    assert FakeOpenAIEmbeddings.calls == 1
+    assert memory.health["status"] == "ok"
+
+
+def test_first_failure_switches_to_the_local_backend_and_retries(openai_memory, monkeypatch):
+    monkeypatch.setattr(MemoryManager, "_try_huggingface", _local_backend(available=True))
+    memory = openai_memory()
+    FakeOpenAIEmbeddings.fail = True
+
+    assert memory.recall("oi") == ""  # empty store, but the call went through
+    assert (memory.health["provider"], memory.health["status"]) == ("huggingface", "ok")
+    assert "invalid api key" in memory.health["last_error"]
+
+
+def test_failure_without_fallback_disables_memory(openai_memory, monkeypatch):
+    monkeypatch.setattr(MemoryManager, "_try_huggingface", _local_backend(available=False))
+    memory = openai_memory()
+    FakeOpenAIEmbeddings.fail = True
+
+    assert memory.recall("oi") == ""
+    assert not memory.is_available
+    assert memory.health["status"] == "unavailable"
+
+
+def test_failure_after_a_verified_call_is_reported_not_switched(openai_memory, monkeypatch):
+    monkeypatch.setattr(MemoryManager, "_try_huggingface", _local_backend(available=True))
+    memory = openai_memory()
+    memory.recall("oi")
+    FakeOpenAIEmbeddings.fail = True
+
+    assert memory.recall("outra pergunta") == ""
+    assert (memory.health["provider"], memory.health["status"]) == ("openai", "degraded")
@@ -0,0 +1,127 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessageChunk, SystemMessage
+
+from agent_core.core.memory import MemoryManager
+from agent_core.core.orchestrator import Orchestrator
+from agent_core.modules.cognitive.gatekeeper import GateDecision
+from agent_core.modules.cognitive.intent_classifier import IntentClassifier, LocalDecision
+from agent_core.utils.llm_factory import LLMFactory
+
+
+class FakeVectorDB:
+    def __init__(self, scored=None, error=None):
+        self.scored = scored or []
+        self.error = error
+
+    def similarity_search_with_relevance_scores(self, query, k=3):
+        if self.error:
+            raise self.error
+        return self.scored[:k]
+
+    def similarity_search(self, query, k=3):
+        return [doc for doc, _ in self.similarity_search_with_relevance_scores(query, k)]
+
+
+def _memory(vector_db):
+    memory = MemoryManager.__new__(MemoryManager)
+    memory.vector_db = vector_db
+    memory.health = {"provider": "huggingface", "status": "ok", "last_error": None, "checked_at": None}
+    return memory
+
+
+def test_recall_drops_loose_matches_and_reports_best_relevance():
+    memory = _memory(FakeVectorDB([
+        (Document(page_content="usuário prefere Python"), 0.82),
+        (Document(page_content="projeto aurora usa Chroma"), 0.4),
+        (Document(page_content="receita de bolo"), 0.1),
+    ]))
+    assert memory.recall_scored("python") == (
+        "- usuário prefere Python\n- projeto aurora usa Chroma", 0.82,
+    )
+    # recall() (search_memory tool) still returns loose matches
+    assert memory.recall("python") == (
+        "- usuário prefere Python\n- projeto aurora usa Chroma\n- receita de bolo"
+    )
+
+    assert _memory(FakeVectorDB([(Document(page_content="receita de bolo"), 0.1)])).recall_scored("oi") == ("", 0.0)
+    # A failing store degrades to "no memories" instead of breaking the turn
+    assert _memory(FakeVectorDB(error=RuntimeError("down"))).recall_scored("oi") == ("", 0.0)
+
+
+class FakeMemory:
+    is_available = True
+
+    def __init__(self, context, relevance):
+        self.result = (context, relevance)
+
+    def recall_scored(self, query, k=3):
+        return self.result
+
+    def save(self, text):
+        pass
+
+
+class CountingGatekeeper:
+    """SHALLOW without memories, DEEP once memories are shown to it."""
+
+    def __init__(self):
+        self.classifier = IntentClassifier()
+        self.contexts = []
+
+    def preview(self, user_input):
+        return LocalDecision(None, "none", 0.0)
+
+    def classify(self, user_input, context=None):
+        memory_context = (context or {}).get("memory_context")
+        self.contexts.append(memory_context)
+        mode = "MODE_DEEP" if memory_context else "MODE_SHALLOW"
+        return GateDecision(mode, "llm", 1.0, None, None)
+
+
+class StreamingLLM:
+    def stream(self, messages):
+        yield AIMessageChunk(content="Oi!")
+
+
+def _orchestrator(monkeypatch, memory):
+    monkeypatch.setattr(LLMFactory, "get_bound_model", staticmethod(lambda tools: StreamingLLM()))
+    orchestrator = Orchestrator()
+    orchestrator.SPECULATE_SHALLOW = False
+    orchestrator.logger = type("Logger", (), {"log": lambda *a, **k: None})()
+    orchestrator.gatekeeper = CountingGatekeeper()
+    orchestrator.memory = memory
+    orchestrator.soul_message = SystemMessage(content="soul")
+    orchestrator.chat_history = [orchestrator.soul_message]
+    return orchestrator
+
+
+def test_loose_memories_do_not_trigger_a_second_classification(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch, FakeMemory("- gosta de café", 0.4))
+
+    events = list(orchestrator.process_message("oi"))
+
+    assert orchestrator.gatekeeper.contexts == [""]
+    assert events[-1].content == "Oi!"
+    # The memories still reach the prompt
+    assert "[MEMÓRIAS RELEVANTES]\n- gosta de café" in [m.content for m in orchestrator.chat_history]
+
+
+def test_relevant_memories_recheck_a_shallow_decision(monkeypatch):
+    orchestrator = _orchestrator(monkeypatch, FakeMemory("- deploy falhou ontem", 0.9))
+    orchestrator.thinker = type("Thinker", (), {"process": lambda self, u, c: {"plan": [], "thought_stream": ""}})()
+    orchestrator.critic = type("Critic", (), {"validate_plan": lambda self, steps: steps})()
+
+    events = []
+    for event in orchestrator.process_message("e aí, como ficou?"):
+        events.append(event)
+        if event.type == "plan":
+            break
+
+    assert orchestrator.gatekeeper.contexts == ["", "- deploy falhou ontem"]
+    assert "Modo: MODE_DEEP" in [e.content for e in events]
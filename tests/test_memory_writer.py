@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.memory_writer import BatchWriter
+
+
+def test_saves_are_batched_and_flushed():
+    batches = []
+    writer = BatchWriter(batches.append, batch_size=10, flush_interval=5.0)
+
+    for i in range(3):
+        writer.add([f"memória {i}"])
+    assert writer.flush(timeout=5)
+
+    assert batches == [["memória 0", "memória 1", "memória 2"]]
+    assert writer.pending == 0
+    writer.close()
+
+
+def test_full_batches_do_not_wait_for_interval():
+    batches = []
+    done = threading.Event()
+
+    def write(batch):
+        batches.append(batch)
+        if sum(len(b) for b in batches) == 4:
+            done.set()
+
+    writer = BatchWriter(write, batch_size=2, flush_interval=60.0)
+    writer.add(["a", "b", "c", "d"])
+
+    assert done.wait(timeout=5)
+    assert batches == [["a", "b"], ["c", "d"]]
+    writer.close()
+
+
+def test_close_writes_pending_and_errors_are_counted():
+    calls = []
+
+    def write(batch):
+        calls.append(batch)
+        raise RuntimeError("chroma offline")
+
+    writer = BatchWriter(write, flush_interval=60.0)
+    writer.add(["x"])
+    writer.close(timeout=5)
+
+    assert calls == [["x"]]
+    assert writer.stats["errors"] == 1
+
+
+def test_flush_reports_batches_lost_since_the_last_flush():
+    failing = [True]
+
+    def write(batch):
+        if failing[0]:
+            raise RuntimeError("chroma offline")
+
+    writer = BatchWriter(write, flush_interval=60.0)
+    writer.add(["x", "y"])
+
+    assert writer.flush(timeout=5) is False
+    assert writer.last_error == "RuntimeError: chroma offline"
+    assert writer.stats["lost"] == 2
+
+    # The failure is reported once; later successful batches flush clean
+    failing[0] = False
+    writer.add(["z"])
+    assert writer.flush(timeout=5) is True
+    writer.close()
+
+
+def test_closed_writers_are_not_kept_alive_for_exit():
+    import gc
+    import weakref
+
+    writer = BatchWriter(lambda texts: None)
+    ref = weakref.ref(writer)
+    writer.close()
+    del writer
+    gc.collect()
+
+    assert ref() is None
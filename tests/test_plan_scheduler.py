@@ -0,0 +1,157 @@
+import os
+import sys
+import threading
+import time
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, SystemMessage
+
+from agent_core.core.events import AuroraEvent
+from agent_core.core.orchestrator import Orchestrator
+from agent_core.core.plan_scheduler import PlanGraph, PlanScheduler
+from agent_core.modules.cognitive.thinker import Thinker
+
+
+def test_thinker_plan_dependencies_are_normalized():
+    steps, deps = Thinker._normalize_plan([
+        {"step": "git status", "depends_on": []},
+        {"step": "listar cron", "depends_on": []},
+        {"step": "", "depends_on": []},
+        {"step": "resumir", "depends_on": [1, 2, 9]},
+        "passo sem info",
+    ])
+    assert steps == ["git status", "listar cron", "resumir", "passo sem info"]
+    assert deps == [[], [], [0, 1], [2]]
+
+    # Plain string plans keep the old sequential behaviour
+    assert Thinker._normalize_plan(["a", "b"]) == (["a", "b"], None)
+    assert PlanGraph(["a", "b", "c"]).is_sequential
+
+
+def test_independent_steps_overlap_and_sinks_are_merged():
+    graph = PlanGraph(["git", "cron", "readme", "resumo"], [[], [], [], [0, 1, 2]])
+    assert graph.sinks() == [3]
+    running, peak, lock = set(), [0], threading.Lock()
+
+    def run_step(i):
+        with lock:
+            running.add(i)
+            peak[0] = max(peak[0], len(running))
+        yield AuroraEvent(type="log", content=f"passo {i}")
+        time.sleep(0.2)
+        with lock:
+            running.discard(i)
+        return f"resultado {i}"
+
+    started = time.monotonic()
+    events = list(PlanScheduler(max_parallel=3).run(graph, run_step))
+    elapsed = time.monotonic() - started
+
+    assert peak[0] == 3
+    assert elapsed < 0.6  # 3 parallel + 1 dependent step, not 4 x 0.2s
+    starts = [e.index for e in events if e.kind == "start"]
+    assert starts[-1] == 3
+
+    results = {e.index: e.payload for e in events if e.kind == "done"}
+    assert PlanScheduler.merge_instructions(graph, results) == "resultado 3"
+    fan_out = PlanGraph(["git", "cron"], [[], []])
+    assert PlanScheduler.merge_instructions(fan_out, results) == (
+        "[Passo 1: git]\nresultado 0\n\n[Passo 2: cron]\nresultado 1"
+    )
+
+
+def test_orchestrator_forks_context_per_step_and_merges_in_order(monkeypatch):
+    orchestrator = Orchestrator()
+    orchestrator.logger = type("Logger", (), {"log": lambda *a, **k: None})()
+    soul = SystemMessage(content="soul")
+    orchestrator.chat_history = [soul]
+    seen = {}
+
+    def fake_step(self, step, goal, execution_llm, is_deep, history=None, first_response=None):
+        seen[step] = [m.content for m in history]
+        time.sleep(0.05 if step == "a" else 0)
+        history.append(AIMessage(content=f"feito {step}"))
+        yield AuroraEvent(type="log", content=step, metadata={})
+        return f"instrução {step}"
+
+    monkeypatch.setattr(Orchestrator, "_execute_step", fake_step)
+    graph = PlanGraph(["a", "b", "c"], [[], [], [0]])
+
+    gen = orchestrator._run_plan(graph, goal="g", execution_llm=None, is_deep=False)
+    events = []
+    try:
+        while True:
+            events.append(next(gen))
+    except StopIteration as done:
+        instruction = done.value
+
+    # Parallel steps never see each other's messages; dependents see their parents'
+    assert seen == {"a": ["soul"], "b": ["soul"], "c": ["soul", "feito a"]}
+    assert [m.content for m in orchestrator.chat_history] == ["soul", "feito a", "feito b", "feito c"]
+    assert instruction == "[Passo 2: b]\ninstrução b\n\n[Passo 3: c]\ninstrução c"
+    assert all(e.metadata.get("step_index") for e in events)
+
+
+def test_failed_step_is_reported_and_its_dependents_are_skipped():
+    graph = PlanGraph(["git", "cron", "resumo", "readme"], [[], [], [0], []])
+
+    def run_step(i):
+        if i == 0:
+            raise RuntimeError("git quebrou")
+        yield AuroraEvent(type="log", content=f"passo {i}")
+        return f"resultado {i}"
+
+    for scheduler in (PlanScheduler(max_parallel=3), PlanScheduler(max_parallel=1)):
+        events = list(scheduler.run(graph, run_step))
+        errors = {e.index: str(e.payload) for e in events if e.kind == "error"}
+        results = {e.index: e.payload for e in events if e.kind == "done"}
+
+        assert errors == {0: "git quebrou", 2: "depende do passo 1, que falhou"}
+        assert results == {0: "", 1: "resultado 1", 2: "", 3: "resultado 3"}
+        assert 2 not in [e.index for e in events if e.kind == "start"]
+
+
+def test_orchestrator_surfaces_step_errors_as_events(monkeypatch):
+    orchestrator = Orchestrator()
+    logged = []
+    orchestrator.logger = type("Logger", (), {"log": lambda self, kind, *a, **k: logged.append(kind)})()
+    orchestrator.chat_history = [SystemMessage(content="soul")]
+
+    def fake_step(self, step, goal, execution_llm, is_deep, history=None, first_response=None):
+        history.append(AIMessage(content=f"começou {step}"))
+        if step == "a":
+            raise RuntimeError("falhou no meio")
+        yield AuroraEvent(type="log", content=step, metadata={})
+        return f"instrução {step}"
+
+    monkeypatch.setattr(Orchestrator, "_execute_step", fake_step)
+    graph = PlanGraph(["a", "b", "c"], [[], [], [0]])
+
+    events = list(orchestrator._run_plan(graph, goal="g", execution_llm=None, is_deep=False))
+
+    errors = [e.content for e in events if e.type == "error"]
+    assert errors == ["Passo 1 falhou: falhou no meio", "Passo 3 falhou: depende do passo 1, que falhou"]
+    assert logged.count("error") == 2
+    # The partial branch of the failed step is kept; the skipped step adds nothing
+    assert [m.content for m in orchestrator.chat_history] == ["soul", "começou a", "começou b"]
+
+
+def test_dependencies_follow_steps_rewritten_by_the_critic():
+    old = ["git status", "listar cron", "ler README", "resumir tudo"]
+    deps = [[], [], [0], [1, 2]]
+
+    # Dropped step: its dependents inherit what it depended on
+    assert PlanGraph.remap_dependencies(old, deps, ["git status", "listar cron", "resumir tudo"]) == [
+        [], [], [0, 1],
+    ]
+    # Reworded/merged step waits for everything before it
+    assert PlanGraph.remap_dependencies(old, deps, ["git status", "listar cron", "ler e resumir"]) == [
+        [], [], [0, 1],
+    ]
+    # Case/spacing changes still match
+    assert PlanGraph.remap_dependencies(old, deps, ["Git  status", "ler README"]) == [[], [0]]
+    # Nothing recognisable, or no dependency info: plain chain
+    assert PlanGraph.remap_dependencies(old, deps, ["outra coisa"]) is None
+    assert PlanGraph.remap_dependencies(old, None, old[:2]) is None
@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+from agent_core.utils import prompt_layout
+
+
+def _prefix(messages, size):
+    return [(type(m).__name__, m.content) for m in messages[:size]]
+
+
+def test_static_prefix_is_identical_across_steps_and_turns():
+    soul = SystemMessage(content="soul")
+    first = [soul, HumanMessage(content="oi")]
+    later = first + [AIMessage(content="olá"), SystemMessage(content="[MEMÓRIAS RELEVANTES]\nx"), HumanMessage(content="liste")]
+
+    a = prompt_layout.step_messages(first, "passo 1")
+    b = prompt_layout.step_messages(later, "passo 2")
+    assert _prefix(a, 2) == _prefix(b, 2)
+    assert a[1] is prompt_layout.EXECUTION_RULES
+    # Everything that changes comes after the prefix, the step last
+    assert b[-1].content.startswith("PASSO ATUAL: passo 2")
+    assert [m.content for m in b[2:-1]] == [m.content for m in later[1:]]
+
+    fast = prompt_layout.fast_lane_messages(later)
+    assert _prefix(fast, 2) == [("SystemMessage", "soul"), ("SystemMessage", prompt_layout.FAST_LANE_RULES.content)]
+    assert fast[-1].content == "liste"
+
+
+def test_cache_hint_only_for_openrouter_models_that_take_it():
+    gemini = ChatOpenAI(model="google/gemini-3-flash-preview", api_key="x", base_url="https://openrouter.ai/api/v1")
+    other = ChatOpenAI(model="deepseek/deepseek-v3.2", api_key="x", base_url="https://openrouter.ai/api/v1")
+    assert prompt_layout.supports_cache_control(gemini.bind_tools([]))
+    assert not prompt_layout.supports_cache_control(other)
+    assert not prompt_layout.supports_cache_control(object())
+
+    history = [SystemMessage(content="soul"), HumanMessage(content="oi")]
+    hinted = prompt_layout.step_messages(history, "passo", cache_hint=True)
+    plain = prompt_layout.step_messages(history, "passo")
+    # The breakpoint sits on the last static message; the rest is untouched
+    assert hinted[1].content == [{
+        "type": "text",
+        "text": prompt_layout.EXECUTION_RULES.content,
+        "cache_control": {"type": "ephemeral"},
+    }]
+    assert hinted[0] is plain[0] and hinted[2:] == plain[2:]
+    assert prompt_layout.step_messages(history, "outro", cache_hint=True)[1] is hinted[1]
+
+
+def test_record_usage_reports_cached_ratio_per_call_site():
+    prompt_layout.reset_usage()
+    for cached in (0, 800):
+        prompt_layout.record_usage("step", AIMessage(content="", usage_metadata={
+            "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+            "input_token_details": {"cache_read": cached},
+        }))
+    prompt_layout.record_usage("step", AIMessage(content=""))  # no usage reported
+    prompt_layout.record_usage("thinker", AIMessage(content="", usage_metadata={
+        "input_tokens": 500, "output_tokens": 10, "total_tokens": 510,
+    }))
+
+    stats = prompt_layout.usage_stats()
+    assert stats["step"] == {"calls": 2, "input_tokens": 2000, "cached_tokens": 800, "cached_ratio": 0.4}
+    assert stats["thinker"]["cached_ratio"] == 0.0
+    prompt_layout.reset_usage()
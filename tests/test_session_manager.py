@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+import time
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.session_manager import SessionManager
+
+
+class FakeEngine:
+    def __init__(self):
+        self.chat_history = []
+
+    def fork(self):
+        return FakeEngine()
+
+    def reset_session(self):
+        self.chat_history = []
+
+
+def test_sessions_are_isolated_per_key():
+    base = FakeEngine()
+    manager = SessionManager(lambda: base)
+
+    with manager.acquire("web:a") as a:
+        a.chat_history.append("oi de a")
+    with manager.acquire("telegram:1") as b:
+        assert b.chat_history == []
+    with manager.acquire("web:a") as again:
+        assert again is a
+        assert again.chat_history == ["oi de a"]
+
+    manager.reset("web:a")
+    assert a.chat_history == []
+
+
+def test_lru_and_idle_eviction():
+    base = FakeEngine()
+    manager = SessionManager(lambda: base, max_sessions=2, idle_timeout=0.05)
+
+    with manager.acquire("k1") as first:
+        pass
+    with manager.acquire("k2"):
+        pass
+    with manager.acquire("k3"):
+        pass
+    assert manager.stats()["sessions"] == 2
+    with manager.acquire("k1") as recreated:
+        assert recreated is not first
+
+    time.sleep(0.1)
+    with manager.acquire("k4"):
+        assert manager.stats()["sessions"] == 1
+
+
+def test_one_turn_at_a_time_per_session():
+    manager = SessionManager(lambda: FakeEngine(), global_concurrency=4)
+    running = []
+    overlap = []
+
+    def turn():
+        with manager.acquire("web:a"):
+            running.append(1)
+            if len(running) > 1:
+                overlap.append(True)
+            time.sleep(0.05)
+            running.pop()
+
+    threads = [threading.Thread(target=turn) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not overlap
+    assert manager.stats()["active"] == 0
+
+
+def test_session_dropped_mid_turn_goes_when_the_turn_ends():
+    manager = SessionManager(lambda: FakeEngine())
+
+    with manager.acquire("web:a"):
+        manager.drop("web:a")  # client disconnected while its turn runs
+        assert manager.stats()["sessions"] == 1
+    assert manager.stats()["sessions"] == 0
+
+    with manager.acquire("web:b"):
+        pass
+    manager.drop("web:b")
+    assert manager.stats()["sessions"] == 0
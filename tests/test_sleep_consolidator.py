@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+import threading
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agent_core.core.consolidation_ledger import ConsolidationLedger
+from agent_core.core.interaction_logger import InteractionLogger
+from agent_core.core.sleep_consolidator import SleepConsolidator
+
+
+class FakeMemory:
+    is_available = True
+
+    def __init__(self):
+        self.saved = []
+        self.dedup_stats = {"inserted": 0, "merged": 0}
+
+    def save_many(self, texts):
+        self.saved.extend(texts)
+
+    def flush(self, timeout=None):
+        return True
+
+
+def _day_logs(turns=20):
+    logs = []
+    for t in range(turns):
+        logs.append({"timestamp": f"2024-01-01T{t:02d}:00:00", "type": "user_input", "content": f"pedido {t} " + "x" * 300})
+        logs.append({"timestamp": f"2024-01-01T{t:02d}:00:01", "type": "thought", "content": f"pensando {t}"})
+    return logs
+
+
+def _consolidator(tmp_path, respond):
+    consolidator = SleepConsolidator.__new__(SleepConsolidator)
+    consolidator.CHUNK_TOKENS = 250
+    consolidator.cache_dir = str(tmp_path / "sleep_cache")
+    consolidator.llm = RunnableLambda(lambda prompt: AIMessage(content=respond(prompt.to_string())))
+    consolidator.logger = InteractionLogger(log_dir=str(tmp_path / "logs"))
+    consolidator.ledger = ConsolidationLedger(str(tmp_path / "sleep_ledger.json"))
+    consolidator.memory = FakeMemory()
+    consolidator._save_lock = threading.Lock()
+    return consolidator
+
+
+def test_chunks_cover_whole_day_and_respect_turns(tmp_path):
+    consolidator = _consolidator(tmp_path, lambda p: "{}")
+    chunks = consolidator._build_chunks(_day_logs())
+
+    assert len(chunks) > 1
+    joined = "\n".join(chunks)
+    assert all(f"pedido {t} " in joined for t in range(20))
+    # A turn never starts in one chunk and ends in the next
+    for chunk in chunks:
+        assert chunk.startswith("[2024-01-01T") and " user_input: " in chunk.splitlines()[0]
+
+
+def test_failed_chunks_are_the_only_ones_redone(tmp_path):
+    calls, lock = [], threading.Lock()
+    fail = {"on": True}
+
+    def respond(prompt):
+        with lock:
+            calls.append(prompt)
+        if fail["on"] and "pedido 19 " in prompt:
+            raise RuntimeError("rate limit")
+        return json.dumps({"insights": [{"type": "fact", "content": "Usa Python", "importance": "high"}], "summary": "ok"})
+
+    consolidator = _consolidator(tmp_path, respond)
+    chunks = consolidator._build_chunks(_day_logs())
+
+    first = consolidator._analyze_chunks("2024-01-01", chunks)
+    assert sum(r is None for r in first) == 1
+    assert len(calls) == len(chunks)
+
+    calls.clear()
+    fail["on"] = False
+    second = consolidator._analyze_chunks("2024-01-01", chunks)
+    assert all(r is not None for r in second)
+    assert len(calls) == 1
+
+
+def test_reduce_dedupes_before_and_through_llm(tmp_path):
+    seen = []
+
+    def respond(prompt):
+        seen.append(prompt)
+        return json.dumps({"insights": [{"type": "fact", "content": "Usa Python", "importance": "high"}], "summary": "dia"})
+
+    consolidator = _consolidator(tmp_path, respond)
+    results = [
+        {"insights": [{"type": "fact", "content": "Usa  Python", "importance": "medium"}], "summary": "a"},
+        {"insights": [{"type": "fact", "content": "usa python", "importance": "high"}], "summary": "b"},
+    ]
+
+    reduced = consolidator._reduce(results)
+
+    assert reduced["summary"] == "dia"
+    # The two spellings were merged before the reduce call
+    assert seen[0].lower().count("python") == 1
+
+
+def _write_day(log_dir, date_str, text):
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, f"aurora_{date_str}.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"timestamp": f"{date_str}T10:00:00", "type": "user_input", "content": text}) + "\n")
+
+
+def test_unchanged_days_are_skipped_and_missed_days_are_pending(tmp_path):
+    answer = json.dumps({"insights": [{"type": "fact", "content": "Algo novo", "importance": "high"}], "summary": "ok"})
+    consolidator = _consolidator(tmp_path, lambda p: answer)
+    log_dir = str(tmp_path / "logs")
+    _write_day(log_dir, "2024-01-01", "a")
+    _write_day(log_dir, "2024-01-02", "b")
+
+    assert consolidator.pending_dates() == ["2024-01-01", "2024-01-02"]
+    results = consolidator.consolidate_many(consolidator.pending_dates(), max_parallel=2)
+    assert [r["insights_saved"] for r in results] == [1, 1]
+    assert consolidator.pending_dates() == []
+    assert consolidator.consolidate("2024-01-01")["skipped"]
+
+    # Late entries make the day pending again
+    _write_day(log_dir, "2024-01-01", "c")
+    assert consolidator.pending_dates(since="2024-01-01") == ["2024-01-01"]
+    assert consolidator.pending_dates(since="2024-01-02") == []
+
+
+def test_day_stays_pending_when_insights_are_not_written(tmp_path):
+    answer = json.dumps({"insights": [{"type": "fact", "content": "Algo novo", "importance": "high"}], "summary": "ok"})
+    consolidator = _consolidator(tmp_path, lambda p: answer)
+    _write_day(str(tmp_path / "logs"), "2024-01-01", "a")
+
+    # Batch write failed: flush() reports it and the ledger is left alone
+    consolidator.memory.flush = lambda timeout=None: False
+    consolidator.memory.writer = type("Writer", (), {"last_error": "RuntimeError: chroma offline"})()
+    result = consolidator.consolidate("2024-01-01")
+    assert result["save_failed"] and result["insights_saved"] == 0
+    assert consolidator.pending_dates() == ["2024-01-01"]
+
+    # Memory unavailable: same
+    consolidator.memory = FakeMemory()
+    consolidator.memory.is_available = False
+    assert consolidator.consolidate("2024-01-01")["save_failed"]
+    assert consolidator.pending_dates() == ["2024-01-01"]
+
+    # Once the write goes through, the day is recorded
+    consolidator.memory = FakeMemory()
+    assert consolidator.consolidate("2024-01-01")["insights_saved"] == 1
+    assert consolidator.pending_dates() == []
+
+
+def test_pending_check_reads_logs_only_when_the_files_changed(tmp_path):
+    answer = json.dumps({"insights": [], "summary": "ok"})
+    consolidator = _consolidator(tmp_path, lambda p: answer)
+    log_dir = str(tmp_path / "logs")
+    _write_day(log_dir, "2024-01-01", "a")
+    consolidator.consolidate("2024-01-01")
+
+    reads = []
+    read_day_logs = consolidator.logger.read_day_logs
+    consolidator.logger.read_day_logs = lambda d=None: reads.append(d) or read_day_logs(d)
+
+    assert consolidator.pending_dates() == []
+    assert reads == []
+
+    # Archiving changes the files but not the entries: hashed once, then cheap again
+    path = os.path.join(log_dir, "aurora_2024-01-01.jsonl")
+    consolidator.logger.archive.archive_day(path, "2024-01-01")
+    os.remove(path)
+    assert consolidator.pending_dates() == []
+    assert consolidator.pending_dates() == []
+    assert reads == ["2024-01-01"]
+
+    # A late append after archiving is still caught
+    _write_day(log_dir, "2024-01-01", "b")
+    assert consolidator.pending_dates() == ["2024-01-01"]
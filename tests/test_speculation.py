@@ -0,0 +1,290 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, AIMessageChunk, SystemMessage
+
+from agent_core.core.orchestrator import Orchestrator
+from agent_core.core.speculation import ShallowSpeculation, SpeculationTracker
+from agent_core.modules.cognitive.gatekeeper import GateDecision
+from agent_core.modules.cognitive.intent_classifier import IntentClassifier, LocalDecision
+from agent_core.utils.llm_factory import LLMFactory
+
+
+def test_tracker_skips_confident_deep_and_backs_off_after_misses():
+    tracker = SpeculationTracker()
+    assert not tracker.should_speculate("MODE_DEEP", True)
+    assert tracker.should_speculate(None, False)
+
+    for _ in range(tracker.MIN_SAMPLES):
+        tracker.record("miss")
+    assert tracker.miss_rate() == 1.0
+    assert not tracker.should_speculate(None, False)
+    assert tracker.should_speculate("MODE_SHALLOW", False)
+    assert tracker.stats()["skipped"] == 2
+
+
+def test_miss_counts_wasted_tokens_of_work_already_running():
+    tracker = SpeculationTracker()
+    started, release = threading.Event(), threading.Event()
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    def brain(memory_context):
+        started.set()
+        release.wait(2)
+        return AIMessage(content="x", usage_metadata={"input_tokens": 90, "output_tokens": 10, "total_tokens": 100})
+
+    speculation = ShallowSpeculation(pool, tracker, quick_reflect=lambda: "hmm", brain_call=brain)
+    speculation.quick_future.result()
+    started.wait(2)
+    speculation.resolve("MODE_DEEP")
+    release.set()
+    pool.shutdown(wait=True)
+
+    stats = tracker.stats()
+    assert (stats["miss"], stats["reused_thoughts"], stats["wasted_tokens"]) == (1, 1, 100)
+    assert speculation.quick_thought() == "hmm"
+    assert speculation.brain_response() is None
+
+
+def test_brain_call_without_recall_is_partial_when_memories_show_up():
+    tracker = SpeculationTracker()
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    blind = ShallowSpeculation(pool, tracker, quick_reflect=None, brain_call=lambda ctx: AIMessage(content=ctx))
+    blind.brain_future.result()
+    blind.resolve("MODE_SHALLOW", "- gosta de café")
+    informed = ShallowSpeculation(
+        pool, tracker, quick_reflect=None,
+        brain_call=lambda ctx: AIMessage(content=ctx), recall=lambda: "- gosta de café",
+    )
+    informed.resolve("MODE_SHALLOW", "- gosta de café")
+    pool.shutdown(wait=True)
+
+    assert (blind.outcome, blind.brain_response()) == ("partial", None)
+    assert (informed.outcome, informed.brain_response().content) == ("hit", "- gosta de café")
+
+    # Partials throw a brain call away too, so they count toward backing off
+    tracker = SpeculationTracker()
+    for _ in range(tracker.MIN_SAMPLES):
+        tracker.record("partial")
+    assert tracker.miss_rate() == 1.0
+
+
+class FakeLogger:
+    def __init__(self):
+        self.entries = []
+
+    def log(self, event_type, content, metadata=None):
+        self.entries.append((event_type, content, metadata))
+
+
+class FakeGatekeeper:
+    def __init__(self, mode):
+        self.mode = mode
+        self.classifier = IntentClassifier()
+
+    def preview(self, user_input):
+        return LocalDecision(None, "none", 0.0)
+
+    def classify(self, user_input, context=None):
+        time.sleep(0.1)  # a Gatekeeper LLM round-trip
+        return GateDecision(self.mode, "llm", 1.0, None, None)
+
+
+class FakeThinker:
+    def __init__(self):
+        self.contexts = []
+
+    def quick_reflect(self, user_input, context=None):
+        return "pensamento rápido"
+
+    def process(self, user_input, context=None):
+        self.contexts.append(context)
+        return {"thought_stream": "", "plan": ["responder"], "dependencies": None, "self_notes": ""}
+
+
+class FakeVoice:
+    def synthesize_stream(self, instruction, context=None):
+        yield "Oi!"
+
+
+class FakeCritic:
+    def validate_plan(self, steps):
+        return steps
+
+    def critique_step(self, **kwargs):
+        return {"quality": "good", "feedback": "", "skipped": "clean_result"}
+
+
+class FakeMemory:
+    is_available = True
+
+    def __init__(self, context):
+        self.context = context
+
+    def recall_scored(self, query, k=3):
+        time.sleep(0.02)  # an embedding round-trip, well under the Gatekeeper's
+        return self.context, 0.4
+
+    def save(self, text):
+        pass
+
+
+class CountingLLM:
+    def __init__(self, reply="RESPONSE_INSTRUCTION: Cumprimente o usuário."):
+        self.reply = reply
+        self.calls = 0
+        self.prompts = []
+
+    def invoke(self, messages):
+        self.calls += 1
+        self.prompts.append([m.content for m in messages])
+        return AIMessage(content=self.reply)
+
+    def stream(self, messages):
+        self.calls += 1
+        for word in self.reply.split(" "):
+            yield AIMessageChunk(content=word + " ")
+
+
+def _orchestrator(monkeypatch, mode, fast_lane=False, reply=None):
+    llm = CountingLLM(reply) if reply else CountingLLM()
+    monkeypatch.setattr(LLMFactory, "get_bound_model", staticmethod(lambda tools: llm))
+    orchestrator = Orchestrator()
+    orchestrator.SHALLOW_FAST_LANE = fast_lane
+    orchestrator.logger = FakeLogger()
+    orchestrator.gatekeeper = FakeGatekeeper(mode)
+    orchestrator.thinker = FakeThinker()
+    orchestrator.critic = FakeCritic()
+    orchestrator.voice = FakeVoice()
+    orchestrator.soul_message = SystemMessage(content="soul")
+    orchestrator.chat_history = [orchestrator.soul_message]
+    return orchestrator, llm
+
+
+def test_shallow_hit_reuses_the_speculative_brain_call(monkeypatch):
+    orchestrator, llm = _orchestrator(monkeypatch, "MODE_SHALLOW")
+
+    events = list(orchestrator.process_message("oi"))
+
+    assert events[-1].content == "Oi!"
+    assert llm.calls == 1
+    assert orchestrator.speculation.stats()["hit"] == 1
+    assert ("speculation", "hit", {"reused_brain": True, "miss_rate": 0.0}) in orchestrator.logger.entries
+
+
+def test_shallow_hit_with_recalled_memories_reuses_the_brain_call(monkeypatch):
+    orchestrator, llm = _orchestrator(monkeypatch, "MODE_SHALLOW")
+    orchestrator.memory = FakeMemory("- usuário se chama Ana")
+
+    events = list(orchestrator.process_message("oi, lembra de mim?"))
+
+    assert events[-1].content == "Oi!"
+    assert llm.calls == 1
+    assert orchestrator.speculation.stats()["hit"] == 1
+    # The speculative prompt carried the same memories as the real turn
+    assert "[MEMÓRIAS RELEVANTES]\n- usuário se chama Ana" in llm.prompts[0]
+
+
+def test_deep_miss_hands_the_quick_thought_to_the_thinker(monkeypatch):
+    orchestrator, llm = _orchestrator(monkeypatch, "MODE_DEEP")
+
+    list(orchestrator.process_message("analise o projeto"))
+
+    stats = orchestrator.speculation.stats()
+    assert (stats["miss"], stats["reused_thoughts"]) == (1, 1)
+    assert orchestrator.thinker.contexts[0]["quick_thought"] == "pensamento rápido"
+    # The step ran with a fresh call: speculative call + real one
+    assert llm.calls == 2
+
+
+def test_fast_lane_answers_small_talk_with_one_call(monkeypatch):
+    orchestrator, llm = _orchestrator(monkeypatch, "MODE_SHALLOW", fast_lane=True, reply="Oi! Tudo ótimo por aqui.")
+    orchestrator.SPECULATE_SHALLOW = False
+
+    events = list(orchestrator.process_message("oi"))
+
+    deltas = "".join(e.content for e in events if e.type == "final_answer_delta")
+    assert deltas.strip() == events[-1].content == "Oi! Tudo ótimo por aqui."
+    assert llm.calls == 1
+    assert orchestrator.chat_history[-1].content == "Oi! Tudo ótimo por aqui."
+    assert not any(e.type == "thought" for e in events)
+
+
+def test_fast_lane_reuses_a_speculative_hit(monkeypatch):
+    orchestrator, llm = _orchestrator(monkeypatch, "MODE_SHALLOW", fast_lane=True, reply="Oi!")
+
+    events = list(orchestrator.process_message("oi"))
+
+    assert events[-1].content == "Oi!"
+    assert llm.calls == 1
+    assert orchestrator.speculation.stats()["hit"] == 1
+
+
+def test_fast_lane_hands_tool_calls_to_brain_and_voice(monkeypatch):
+    from langchain_core.tools import tool
+
+    @tool
+    def current_time() -> str:
+        """Returns the current time."""
+        return "14:00"
+
+    class ToolLLM(CountingLLM):
+        def stream(self, messages):
+            self.calls += 1
+            yield AIMessageChunk(content="", tool_call_chunks=[
+                {"name": "current_time", "args": "{}", "id": "call_1", "index": 0},
+            ])
+
+    orchestrator, _ = _orchestrator(monkeypatch, "MODE_SHALLOW", fast_lane=True)
+    orchestrator.SPECULATE_SHALLOW = False
+    llm = ToolLLM()
+    monkeypatch.setattr(LLMFactory, "get_bound_model", staticmethod(lambda tools: llm))
+    orchestrator.tools_map = {"current_time": current_time}
+
+    events = list(orchestrator.process_message("que horas são?"))
+
+    assert [e.content for e in events if e.type == "tool_result"] == ["14:00"]
+    assert events[-1].content == "Oi!"  # written by the voice, not the fast lane
+    assert llm.calls == 2  # fast lane + one brain call after the tool result
+
+
+def test_fast_lane_retracts_text_streamed_before_a_tool_call(monkeypatch):
+    from langchain_core.tools import tool
+
+    @tool
+    def current_time() -> str:
+        """Returns the current time."""
+        return "14:00"
+
+    class PreambleLLM(CountingLLM):
+        def stream(self, messages):
+            self.calls += 1
+            yield AIMessageChunk(content="Vou ")
+            yield AIMessageChunk(content="verificar.")
+            yield AIMessageChunk(content="", tool_call_chunks=[
+                {"name": "current_time", "args": "{}", "id": "call_1", "index": 0},
+            ])
+            yield AIMessageChunk(content=" ignorado")
+
+    orchestrator, _ = _orchestrator(monkeypatch, "MODE_SHALLOW", fast_lane=True)
+    orchestrator.SPECULATE_SHALLOW = False
+    llm = PreambleLLM()
+    monkeypatch.setattr(LLMFactory, "get_bound_model", staticmethod(lambda tools: llm))
+    orchestrator.tools_map = {"current_time": current_time}
+
+    events = list(orchestrator.process_message("que horas são?"))
+
+    types = [e.type for e in events]
+    assert types.count("final_answer_reset") == 1
+    # Everything streamed after the reset adds up to the final answer alone
+    after_reset = events[types.index("final_answer_reset") + 1:]
+    deltas = "".join(e.content for e in after_reset if e.type == "final_answer_delta")
+    assert deltas == events[-1].content == "Oi!"
+    assert [e.content for e in events if e.type == "tool_result"] == ["14:00"]
@@ -0,0 +1,177 @@
+import os
+import sys
+import threading
+import time
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.tool_executor import ToolExecutor
+from agent_core.utils.process_runner import run_command
+
+
+class SlowTool:
+    def __init__(self, delay, log):
+        self.delay = delay
+        self.log = log
+
+    def invoke(self, args):
+        self.log.append(("start", args["tag"]))
+        time.sleep(self.delay)
+        self.log.append(("end", args["tag"]))
+        return f"ok {args['tag']}"
+
+
+def _call(name, tag):
+    return {"name": name, "args": {"tag": tag}, "id": f"call_{tag}"}
+
+
+def test_independent_calls_run_concurrently_and_keep_order():
+    log = []
+    tools = {"read_file": SlowTool(0.2, log)}
+    calls = [_call("read_file", i) for i in range(3)]
+
+    started = time.time()
+    gen = ToolExecutor().run(calls, tools)
+    finished = []
+    try:
+        while True:
+            finished.append(next(gen))
+    except StopIteration as stop:
+        results = stop.value
+
+    assert time.time() - started < 0.5
+    assert results == ["ok 0", "ok 1", "ok 2"]
+    assert sorted(e.index for e in finished if e.kind == "result") == [0, 1, 2]
+
+
+def test_serial_tools_are_barriers():
+    log = []
+    tools = {"read_file": SlowTool(0.05, log), "write_file": SlowTool(0.05, log)}
+    calls = [_call("read_file", "r1"), _call("write_file", "w"), _call("read_file", "r2")]
+
+    list(ToolExecutor().run(calls, tools))
+
+    w_start = log.index(("start", "w"))
+    w_end = log.index(("end", "w"))
+    assert log.index(("end", "r1")) < w_start
+    assert w_end < log.index(("start", "r2"))
+
+
+def test_per_tool_limit_and_errors():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class Counting:
+        def invoke(self, args):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return "ok"
+
+    class Broken:
+        def invoke(self, args):
+            raise ValueError("boom")
+
+    executor = ToolExecutor(tool_concurrency={"shell_executor": 1})
+    calls = [_call("shell_executor", i) for i in range(3)] + [_call("broken", 9), _call("missing", 10)]
+    events = executor.run(calls, {"shell_executor": Counting(), "broken": Broken()})
+    results = {e.index: e.content for e in events if e.kind == "result"}
+
+    assert peak[0] == 1
+    assert results[3] == "Erro na ferramenta: boom"
+    assert results[4] == "Ferramenta não encontrada."
+
+
+def test_subprocess_streams_progress_and_is_killed_on_timeout():
+    class Shell:
+        def invoke(self, args):
+            result = run_command(args["command"], shell=True)
+            return result.stdout + result.status_note()
+
+    executor = ToolExecutor(tool_timeouts={"shell_executor": 0.5})
+    calls = [{"name": "shell_executor", "args": {"command": "echo first; sleep 30"}, "id": "c1"}]
+
+    started = time.time()
+    events = list(executor.run(calls, {"shell_executor": Shell()}))
+
+    assert time.time() - started < 5
+    assert ("progress", "first\n") in [(e.kind, e.content) for e in events]
+    assert "tempo limite excedido" in events[-1].content
+
+
+def test_cancel_stops_running_calls():
+    class Shell:
+        def invoke(self, args):
+            return run_command("sleep 30", shell=True).status_note()
+
+    executor = ToolExecutor()
+    calls = [{"name": "shell_executor", "args": {}, "id": "c1"}]
+    threading.Timer(0.3, executor.cancel).start()
+
+    started = time.time()
+    events = list(executor.run(calls, {"shell_executor": Shell()}))
+
+    assert time.time() - started < 5
+    assert events[-1].content == "[Processo cancelado pelo usuário]"
+
+
+def test_deadline_starts_when_the_call_starts_not_when_it_is_queued():
+    log = []
+    executor = ToolExecutor(tool_timeouts={"read_file": 0.3}, max_workers=1)
+    executor.KILL_GRACE = 0.05
+    calls = [_call("read_file", i) for i in range(2)]
+
+    # The second call waits ~0.25s for the only worker; only its run time counts
+    results = {e.index: e.content for e in executor.run(calls, {"read_file": SlowTool(0.25, log)}) if e.kind == "result"}
+
+    assert results == {0: "ok 0", 1: "ok 1"}
+
+
+class HangingTool:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def invoke(self, args):
+        self.release.wait(10)
+        return "tarde demais"
+
+
+def test_hung_call_does_not_block_later_calls_or_other_sessions():
+    hanging = HangingTool()
+    tools = {"hang": hanging, "read_file": SlowTool(0, [])}
+    session_a = ToolExecutor(tool_timeouts={"hang": 0.1}, max_workers=1)
+    session_a.KILL_GRACE = 0.05
+    session_b = ToolExecutor(max_workers=1)
+
+    events = list(session_a.run([_call("hang", "h")], tools))
+    assert "tempo limite excedido" in events[-1].content
+    assert session_a.hung == 1
+
+    # The hung thread still runs, but neither session waits behind it
+    started = time.time()
+    assert list(session_b.run([_call("read_file", "b")], tools))[-1].content == "ok b"
+    assert list(session_a.run([_call("read_file", "a")], tools))[-1].content == "ok a"
+    assert time.time() - started < 1
+
+    hanging.release.set()
+    deadline = time.time() + 2
+    while session_a.hung and time.time() < deadline:
+        time.sleep(0.01)
+    assert session_a.hung == 0
+
+
+def test_new_calls_are_refused_once_too_many_threads_are_hung():
+    hanging = HangingTool()
+    executor = ToolExecutor(tool_timeouts={"hang": 0.05})
+    executor.KILL_GRACE = 0.05
+    executor.MAX_HUNG = 1
+
+    list(executor.run([_call("hang", "h")], {"hang": hanging}))
+    events = list(executor.run([_call("read_file", "r")], {"read_file": SlowTool(0, [])}))
+    assert "travadas" in events[-1].content
+
+    hanging.release.set()
@@ -0,0 +1,65 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.utils import tool_loader
+from agent_core.utils.tool_loader import build_manifest, load_dynamic_tools
+
+
+SIDE_EFFECT_TOOL = '''
+import os
+open(os.path.join(os.path.dirname(__file__), "imported.marker"), "w").close()
+
+TOOL_DESC = (
+    "Ecoa o input "
+    "com um prefixo."
+)
+
+def run(input_str: str, prefix="> "):
+    return prefix + input_str
+'''
+
+
+def test_tools_are_registered_without_importing(tmp_path):
+    (tmp_path / "echo_tool.py").write_text(SIDE_EFFECT_TOOL)
+    (tmp_path / "helper.py").write_text("X = 1\n")
+
+    tools = load_dynamic_tools(str(tmp_path))
+
+    assert [t.name for t in tools] == ["echo_tool"]
+    assert tools[0].description == "Ecoa o input com um prefixo."
+    assert not (tmp_path / "imported.marker").exists()
+
+    assert tools[0].invoke({"input_str": "oi"}) == "> oi"
+    assert (tmp_path / "imported.marker").exists()
+
+
+def test_manifest_is_cached_by_mtime(tmp_path, monkeypatch):
+    tool_file = tmp_path / "echo_tool.py"
+    tool_file.write_text(SIDE_EFFECT_TOOL)
+    build_manifest(str(tmp_path))
+
+    parsed = []
+    original = tool_loader._parse_tool_file
+    monkeypatch.setattr(tool_loader, "_parse_tool_file", lambda p: parsed.append(p) or original(p))
+
+    build_manifest(str(tmp_path))
+    assert parsed == []
+
+    tool_file.write_text(SIDE_EFFECT_TOOL.replace("Ecoa", "Repete"))
+    os.utime(tool_file, ns=(0, os.stat(tool_file).st_mtime_ns + 10**9))
+    manifest = build_manifest(str(tmp_path))
+    assert len(parsed) == 1
+    assert manifest["echo_tool.py"]["description"].startswith("Repete")
+
+
+def test_computed_description_falls_back_to_import(tmp_path):
+    (tmp_path / "dynamic_tool.py").write_text(
+        'TOOL_DESC = "Gera " + "descrição"\n\ndef run(input_str):\n    return input_str\n'
+    )
+
+    assert build_manifest(str(tmp_path))["dynamic_tool.py"]["kind"] == "eager"
+    tools = load_dynamic_tools(str(tmp_path))
+    assert tools[0].description == "Gera descrição"
@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core.tool_registry import ToolRegistry
+
+
+def _write_tool(path, desc, reply):
+    path.write_text(f'TOOL_DESC = "{desc}"\n\ndef run(input_str):\n    return "{reply}"\n')
+    # Guarantee a new mtime even on coarse filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_new_tool_is_picked_up_and_added_to_soul(tmp_path):
+    registry = ToolRegistry(str(tmp_path), poll_interval=0)
+    assert registry.snapshot.tools == []
+
+    _write_tool(tmp_path / "hello_tool.py", "Diz oi.", "oi")
+    changes = registry.refresh()
+
+    snapshot = registry.snapshot
+    assert changes == {"added": ["hello_tool"], "updated": [], "removed": []}
+    assert snapshot.version == 2
+    assert snapshot.tools_map["hello_tool"].invoke({"input_str": "x"}) == "oi"
+    assert "hello_tool: Diz oi." in snapshot.soul_message.content
+
+
+def test_update_and_remove_only_touch_the_changed_file(tmp_path):
+    _write_tool(tmp_path / "a_tool.py", "A.", "a1")
+    _write_tool(tmp_path / "b_tool.py", "B.", "b")
+    registry = ToolRegistry(str(tmp_path), poll_interval=0)
+    b_before = registry.snapshot.tools_map["b_tool"]
+
+    assert registry.refresh() is None
+
+    _write_tool(tmp_path / "a_tool.py", "A.", "a2")
+    assert registry.refresh()["updated"] == ["a_tool"]
+    assert registry.snapshot.tools_map["a_tool"].invoke({"input_str": ""}) == "a2"
+    assert registry.snapshot.tools_map["b_tool"] is b_before
+
+    os.remove(tmp_path / "b_tool.py")
+    assert registry.refresh()["removed"] == ["b_tool"]
+    assert "b_tool" not in registry.snapshot.tools_map
+
+
+def test_polling_is_throttled(tmp_path):
+    registry = ToolRegistry(str(tmp_path), poll_interval=60)
+    _write_tool(tmp_path / "late_tool.py", "Late.", "x")
+
+    assert registry.refresh() is None
+    assert registry.refresh(force=True)["added"] == ["late_tool"]
@@ -0,0 +1,79 @@
+import os
+import sys
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, SystemMessage
+from langchain_core.runnables import RunnableGenerator
+
+from agent_core.core.orchestrator import Orchestrator
+from agent_core.modules.cognitive.gatekeeper import GateDecision
+from agent_core.modules.effectors.voice_synthesizer import VoiceSynthesizer
+from agent_core.utils.llm_factory import LLMFactory
+
+
+def _voice(monkeypatch, llm):
+    monkeypatch.setattr(LLMFactory, "get_voice_model", staticmethod(lambda: llm))
+    return VoiceSynthesizer(soul_text="Você é Aurora.")
+
+
+def test_stream_yields_chunks_that_add_up_to_the_answer(monkeypatch):
+    voice = _voice(monkeypatch, GenericFakeChatModel(messages=iter([AIMessage(content="  Oi, tudo bem por aqui!")])))
+
+    chunks = list(voice.synthesize_stream("RESPONSE_INSTRUCTION: cumprimente", {"user_input": "oi"}))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Oi, tudo bem por aqui!"  # no leading whitespace, like synthesize()
+
+
+def test_stream_failing_before_any_token_yields_the_cleaned_instruction(monkeypatch):
+    def broken(_):
+        raise RuntimeError("groq down")
+        yield  # pragma: no cover
+
+    voice = _voice(monkeypatch, RunnableGenerator(broken))
+
+    assert list(voice.synthesize_stream("RESPONSE_INSTRUCTION: Diga que está tudo bem.")) == [
+        "Diga que está tudo bem.",
+    ]
+
+
+def test_stream_failing_midway_keeps_what_was_already_sent(monkeypatch):
+    def flaky(_):
+        yield AIMessageChunk(content="Oi, ")
+        raise RuntimeError("connection reset")
+
+    voice = _voice(monkeypatch, RunnableGenerator(flaky))
+
+    # No fallback text appended after a partial answer the user already saw
+    assert list(voice.synthesize_stream("RESPONSE_INSTRUCTION: cumprimente")) == ["Oi, "]
+
+
+def test_orchestrator_streams_deltas_before_the_final_answer(monkeypatch):
+    class Brain:
+        def invoke(self, messages):
+            return AIMessage(content="RESPONSE_INSTRUCTION: cumprimente")
+
+    class Gatekeeper:
+        def classify(self, user_input, context=None):
+            return GateDecision("MODE_SHALLOW", "rules", 1.0, "MODE_SHALLOW", None)
+
+    monkeypatch.setattr(LLMFactory, "get_bound_model", staticmethod(lambda tools: Brain()))
+    orchestrator = Orchestrator()
+    orchestrator.SPECULATE_SHALLOW = False
+    orchestrator.SHALLOW_FAST_LANE = False
+    orchestrator.logger = type("Logger", (), {"log": lambda *a, **k: None})()
+    orchestrator.gatekeeper = Gatekeeper()
+    orchestrator.thinker = type("Thinker", (), {"quick_reflect": lambda self, u, c=None: "hm"})()
+    orchestrator.voice = _voice(monkeypatch, GenericFakeChatModel(messages=iter([AIMessage(content="Oi, tudo certo!")])))
+    orchestrator.soul_message = SystemMessage(content="soul")
+    orchestrator.chat_history = [orchestrator.soul_message]
+
+    events = list(orchestrator.process_message("oi"))
+
+    deltas = [e for e in events if e.type == "final_answer_delta"]
+    assert len(deltas) > 1
+    assert events[-1].type == "final_answer"
+    assert "".join(e.content for e in deltas) == events[-1].content == "Oi, tudo certo!"
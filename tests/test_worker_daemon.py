@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Path injection
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_core.core import worker_client
+from agent_core.core.worker_daemon import WorkerDaemon
+
+
+class FakePool:
+    def stats(self):
+        return {"size": 1, "in_use": 0, "idle": 0}
+
+
+def test_ping_and_unknown_action_over_socket():
+    socket_path = os.path.join(tempfile.mkdtemp(), "worker.sock")
+    daemon = WorkerDaemon(pool=FakePool(), socket_path=socket_path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+
+    for _ in range(50):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.02)
+
+    try:
+        assert worker_client.ping(socket_path)
+        response = worker_client.send_request({"action": "dance"}, socket_path)
+        assert response == {"ok": False, "error": "Ação desconhecida: dance"}
+        assert not worker_client.submit_task("", socket_path=socket_path)
+    finally:
+        daemon.shutdown()
+        thread.join(timeout=5)
+
+    assert not os.path.exists(socket_path)
+    assert not worker_client.ping(socket_path)
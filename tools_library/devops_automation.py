@@ -1,7 +1,11 @@
 import os
-import subprocess
+import sys
 import json
 
+# Injetar path para importar módulos do Aurora
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent_core.utils.process_runner import run_command
+
 TOOL_DESC = "Executa testes ou build detectando o tipo de projeto (Python/Node). Input: JSON com 'action' (test|build) e 'target_dir' (opcional)."
 
 def run(input_str):
@@ -30,9 +34,12 @@ def run(input_str):
             
         for cmd in cmds:
             try:
-                res = subprocess.run(cmd, cwd=target_dir, capture_output=True, text=True)
-                if res.returncode == 0:
+                res = run_command(cmd, cwd=target_dir)
+                if res.ok:
                     return f"Sucesso: {action} ok.\nOutput: {res.stdout}"
+                if res.timed_out or res.cancelled:
+                    # Não tenta o próximo comando: o usuário/limite já decidiu parar
+                    return f"Erro: {action} interrompido. {res.status_note()}\nOutput: {res.stdout}"
             except: continue
             
         return f"Erro: Falha ao rodar {action}."
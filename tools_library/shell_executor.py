@@ -1,9 +1,17 @@
-import subprocess
+import os
+import sys
+
+# Injetar path para importar módulos do Aurora
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agent_core.utils.process_runner import run_command
 
 def run(command):
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        return f"STDOUT: {result.stdout}\nSTDERR: {result.stderr}"
+        # Timeout, limite de saída e cancelamento ficam a cargo do process_runner
+        result = run_command(command, shell=True)
+        output = f"STDOUT: {result.stdout}\nSTDERR: {result.stderr}"
+        note = result.status_note()
+        return f"{output}\n{note}" if note else output
     except Exception as e:
         return str(e)
 
@@ -26,7 +26,9 @@ TELEGRAM_ALLOWED_CHAT_ID = os.getenv("TELEGRAM_DEFAULT_CHAT_ID")
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agent_core.core.orchestrator import Orchestrator
+from agent_core.core.engine_pool import EnginePool
+from agent_core.core.session_manager import SessionManager
+from agent_core.core.worker_daemon import WorkerDaemon
 from agent_core.core.instance_manager import InstanceManager
 
 app = Flask(__name__, static_folder='static', template_folder='static')
@@ -37,18 +39,34 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Global engine instance
-engine = None
-engine_lock = eventlet.semaphore.Semaphore()
 
 # --- TELEGRAM HELPER FUNCTIONS ---
-def tg_send_message(chat_id, text):
-    if not TELEGRAM_TOKEN: return
+def tg_send_message(chat_id, text, parse_mode="Markdown"):
+    """Sends a message and returns its message_id (None on failure)."""
+    if not TELEGRAM_TOKEN: return None
     url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+    payload = {"chat_id": chat_id, "text": text}
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
     try:
-        requests.post(url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"})
+        resp = requests.post(url, json=payload)
+        return resp.json().get("result", {}).get("message_id")
     except Exception as e:
         print(f"Telegram Error: {e}")
+        return None
+
+def tg_edit_message(chat_id, message_id, text, parse_mode=None):
+    """Edits a previously sent message. Returns True on success."""
+    if not TELEGRAM_TOKEN: return False
+    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/editMessageText"
+    payload = {"chat_id": chat_id, "message_id": message_id, "text": text}
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    try:
+        return bool(requests.post(url, json=payload).json().get("ok"))
+    except Exception as e:
+        print(f"Telegram Edit Error: {e}")
+        return False
 
 def tg_send_action(chat_id, action="typing"):
     if not TELEGRAM_TOKEN: return
@@ -58,9 +76,64 @@ def tg_send_action(chat_id, action="typing"):
     except:
         pass
 
+class TelegramStreamer:
+    """
+    Renders streamed final_answer deltas in Telegram by editing one message.
+    Edits are batched (Telegram rate-limits editMessageText), and partial
+    text is sent without parse_mode since half-written Markdown is invalid.
+    """
+
+    EDIT_INTERVAL = 1.0  # seconds between edits
+    MIN_NEW_CHARS = 20   # don't edit for a handful of new characters
+
+    def __init__(self, chat_id):
+        self.chat_id = chat_id
+        self.message_id = None
+        self.text = ""
+        self._sent_len = 0
+        self._last_edit = 0.0
+
+    def add(self, delta):
+        self.text += delta
+        if not self.text.strip():
+            return
+        now = time.time()
+        if self.message_id is None:
+            self.message_id = tg_send_message(self.chat_id, self.text, parse_mode=None)
+            self._sent_len = len(self.text)
+            self._last_edit = now
+        elif (now - self._last_edit >= self.EDIT_INTERVAL
+              and len(self.text) - self._sent_len >= self.MIN_NEW_CHARS):
+            if tg_edit_message(self.chat_id, self.message_id, self.text):
+                self._sent_len = len(self.text)
+            self._last_edit = now
+
+    def reset(self):
+        """Drops the streamed text; later deltas rewrite the same message."""
+        self.text = ""
+        self._sent_len = 0
+
+    def finish(self, final_text):
+        """Writes the final text. Returns False if nothing was streamed."""
+        if self.message_id is None:
+            return False
+        if not tg_edit_message(self.chat_id, self.message_id, final_text, parse_mode="Markdown"):
+            tg_edit_message(self.chat_id, self.message_id, final_text)
+        return True
+
 # --- CORE PROCESSING (Shared by Web & Telegram) ---
-# Semaphore to limit concurrent background tasks on VPS
-background_tasks_semaphore = eventlet.semaphore.Semaphore(2)
+# Warm sessions for background tasks (also limits concurrency on the VPS)
+background_pool = EnginePool(size=2)
+
+# One conversation per HUD client / Telegram chat, all forked from the same
+# initialized engine (background_pool.base) so tools, memory and LLM clients
+# are loaded once per process
+sessions = SessionManager(lambda: background_pool.base)
+
+def session_key(source, chat_id=None, sid=None):
+    if source == "telegram":
+        return f"telegram:{chat_id}"
+    return f"web:{sid}"
 
 # Global tracking of active background tasks
 active_instances = {}
@@ -91,16 +164,13 @@ def process_background_task(task_description):
 
     broadcast_instances(im)
 
-    with background_tasks_semaphore:
-        im.update_status(instance_id, "Processando...")
-        broadcast_instances(im)
-
-        print(f"[Scheduler] Start background task: {task_description}")
-        temp_engine = Orchestrator()
-        temp_engine.initialize()
+    try:
+        with background_pool.session() as temp_engine:
+            im.update_status(instance_id, "Processando...")
+            broadcast_instances(im)
 
-        results = []
-        try:
+            print(f"[Scheduler] Start background task: {task_description}")
+            results = []
             for event in temp_engine.process_message(f"EXECUTE TAREFA AGENDADA: {task_description}"):
                 if event.type == "final_answer":
                     results.append(event.content)
@@ -109,61 +179,96 @@ def process_background_task(task_description):
                 final_msg = f"🔔 *Tarefa Agendada Concluída*\n\n*Tarefa:* {task_description}\n\n{results[-1]}"
                 from tools_library import telegram_sender
                 telegram_sender.run(final_msg)
-        except Exception as e:
-            print(f"[Scheduler] Error executing task '{task_description}': {e}")
-        finally:
-            im.unregister(instance_id)
-            broadcast_instances(im)
+    except Exception as e:
+        print(f"[Scheduler] Error executing task '{task_description}': {e}")
+    finally:
+        im.unregister(instance_id)
+        broadcast_instances(im)
 
-def process_engine_request(user_input, source="web", chat_id=None):
+def process_engine_request(user_input, source="web", chat_id=None, sid=None):
     """Main engine processor for direct interactions."""
-    global engine
-    if engine is None:
-        with engine_lock:
-            if engine is None:
-                engine = Orchestrator()
-                engine.initialize()
-    
+    # Web events go only to the client that asked; Telegram turns are
+    # mirrored to every HUD
+    target = sid if source == "web" else None
+
     if source == "telegram":
         socketio.emit('user_message', {'content': f"[Telegram] {user_input}"})
     
     final_response = ""
+    streamer = TelegramStreamer(chat_id) if source == "telegram" and chat_id else None
     
     try:
-        for event in engine.process_message(user_input):
-            socketio.emit(event.type, {
-                'content': event.content,
-                'metadata': event.metadata or {},
-                'steps': event.content if event.type == 'plan' else None,
-                'mode': event.metadata.get('mode', 'UNKNOWN') if event.type == 'plan' else None,
-                'step': event.content if event.type == 'step_start' else None,
-                'index': event.metadata.get('step_index') if event.type == 'step_start' else None,
-                'total': event.metadata.get('total_steps') if event.type == 'step_start' else None,
-                'name': event.content if event.type == 'tool_call' else None,
-                'args': event.metadata.get('args', {}) if event.type == 'tool_call' else None,
-                'preview': event.content if event.type == 'tool_result' else None,
-                'full': event.metadata.get('full_content', '') if event.type == 'tool_result' else None,
-                'message': event.content if event.type in ['error', 'log', 'thought'] else None
-            })
-            
-            # Emit task update after potential cron_scheduler calls
-            if event.type == "tool_call" and event.content == "cron_scheduler":
-                 eventlet.spawn_after(1, broadcast_tasks)
-
-            if source == "telegram" and chat_id:
-                if event.type == "final_answer":
-                    final_response = event.content
-                elif event.type in ["plan", "tool_call"]:
-                    tg_send_action(chat_id, "typing")
-                    
-            socketio.sleep(0.02)
-            
+        with sessions.acquire(session_key(source, chat_id, sid)) as engine:
+            final_response = _forward_events(
+                engine.process_message(user_input), source, chat_id, target, streamer
+            )
     except Exception as e:
         error_msg = f"Error processing: {e}"
-        socketio.emit('error', {'message': error_msg})
+        socketio.emit('error', {'message': error_msg}, to=target)
         return error_msg
 
-    socketio.emit('processing_complete', {})
+    socketio.emit('processing_complete', {}, to=target)
+    return final_response
+
+def _forward_events(events, source, chat_id, target, streamer):
+    """Relays engine events to Socket.IO (and Telegram). Returns the final text."""
+    final_response = ""
+
+    for event in events:
+        if event.type == "final_answer_delta":
+            socketio.emit('final_answer_delta', {'content': event.content}, to=target)
+            if streamer:
+                streamer.add(event.content)
+            socketio.sleep(0)
+            continue
+
+        if event.type == "final_answer_reset":
+            # The streamed text was not the answer (a tool call followed)
+            socketio.emit('final_answer_reset', {}, to=target)
+            if streamer:
+                streamer.reset()
+            continue
+
+        if event.type == "tool_progress":
+            # Chatty commands stream many lines — relay without the per-event pause
+            socketio.emit('tool_progress', {
+                'content': event.content,
+                'metadata': event.metadata or {},
+            }, to=target)
+            socketio.sleep(0)
+            continue
+
+        socketio.emit(event.type, {
+            'content': event.content,
+            'metadata': event.metadata or {},
+            'steps': event.content if event.type == 'plan' else None,
+            'mode': event.metadata.get('mode', 'UNKNOWN') if event.type == 'plan' else None,
+            'step': event.content if event.type == 'step_start' else None,
+            'index': event.metadata.get('step_index') if event.type == 'step_start' else None,
+            'total': event.metadata.get('total_steps') if event.type == 'step_start' else None,
+            'name': event.content if event.type == 'tool_call' else None,
+            'args': event.metadata.get('args', {}) if event.type == 'tool_call' else None,
+            'preview': event.content if event.type == 'tool_result' else None,
+            'full': event.metadata.get('full_content', '') if event.type == 'tool_result' else None,
+            'message': event.content if event.type in ['error', 'log', 'thought'] else None
+        }, to=target)
+        
+        # Emit task update after potential cron_scheduler calls
+        if event.type == "tool_call" and event.content == "cron_scheduler":
+             eventlet.spawn_after(1, broadcast_tasks)
+
+        if source == "telegram" and chat_id:
+            if event.type == "final_answer":
+                # Already on screen via streamed edits — just finalize it
+                if streamer and streamer.finish(event.content):
+                    final_response = ""
+                else:
+                    final_response = event.content
+            elif event.type in ["plan", "tool_call"]:
+                tg_send_action(chat_id, "typing")
+                
+        socketio.sleep(0.02)
+
     return final_response
 
 def broadcast_tasks():
@@ -178,6 +283,71 @@ def broadcast_tasks():
         socketio.emit('update_tasks', {'tasks': []})
 
 
+def handle_telegram_message(msg, chat_id):
+    """Processes one Telegram message (text or photo) and replies."""
+    try:
+        # Handle Text
+        if "text" in msg:
+            text = msg["text"]
+            response_text = process_engine_request(text, source="telegram", chat_id=chat_id)
+            if response_text:
+                tg_send_message(chat_id, response_text)
+        
+        # Handle Photo
+        elif "photo" in msg:
+            photo = msg["photo"][-1]
+            file_id = photo["file_id"]
+            file_info = requests.get(f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getFile?file_id={file_id}").json()
+            file_path = file_info["result"]["file_path"]
+            img_url = f"https://api.telegram.org/file/bot{TELEGRAM_TOKEN}/{file_path}"
+            img_data = requests.get(img_url).content
+            
+            local_filename = f"tg_{uuid.uuid4().hex}.jpg"
+            local_path = os.path.join(app.config['UPLOAD_FOLDER'], local_filename)
+            with open(local_path, "wb") as f:
+                f.write(img_data)
+            
+            tg_send_action(chat_id, "typing")
+            
+            try:
+                from tools_library.vision_analyzer import vision_analyzer
+                description = vision_analyzer(local_path)
+                vision_context = f"[CONTEXTO VISUAL DA IMAGEM]\n{description}\n[Caminho: {local_path}]"
+            except Exception as ve:
+                vision_context = f"[ERRO NA VISÃO]: {ve}"
+            
+            caption = msg.get("caption", "")
+            full_prompt = f"{vision_context}\n\n{caption}".strip()
+            
+            response_text = process_engine_request(full_prompt, source="telegram", chat_id=chat_id)
+            if response_text:
+                tg_send_message(chat_id, response_text)
+    except Exception as e:
+        print(f"[Telegram] Error handling message from {chat_id}: {e}")
+
+
+TOOLS_POLL_INTERVAL = 5  # seconds
+
+
+def tools_watch_loop():
+    """Tells the HUD when tools_library changes (sessions sync on their next turn)."""
+    while True:
+        socketio.sleep(TOOLS_POLL_INTERVAL)
+        if not background_pool.initialized:
+            continue
+        try:
+            registry = background_pool.base.tool_registry
+            changes = registry.refresh()
+            if changes:
+                count = len(registry.snapshot.tools)
+                socketio.emit('tools_updated', {
+                    'content': f"{count} ferramentas disponíveis.",
+                    'metadata': {'tools_count': count, **changes},
+                })
+        except Exception as e:
+            print(f"[Tools] Erro ao recarregar ferramentas: {e}")
+
+
 def telegram_poll_loop():
     if not TELEGRAM_TOKEN:
         print("[System] Telegram Token not found. Polling disabled.")
@@ -204,42 +374,8 @@ def telegram_poll_loop():
                         if TELEGRAM_ALLOWED_CHAT_ID and chat_id != str(TELEGRAM_ALLOWED_CHAT_ID):
                             continue
 
-                        # Handle Text
-                        if "text" in msg:
-                            text = msg["text"]
-                            response_text = process_engine_request(text, source="telegram", chat_id=chat_id)
-                            if response_text:
-                                tg_send_message(chat_id, response_text)
-                        
-                        # Handle Photo
-                        elif "photo" in msg:
-                            photo = msg["photo"][-1]
-                            file_id = photo["file_id"]
-                            file_info = requests.get(f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getFile?file_id={file_id}").json()
-                            file_path = file_info["result"]["file_path"]
-                            img_url = f"https://api.telegram.org/file/bot{TELEGRAM_TOKEN}/{file_path}"
-                            img_data = requests.get(img_url).content
-                            
-                            local_filename = f"tg_{uuid.uuid4().hex}.jpg"
-                            local_path = os.path.join(app.config['UPLOAD_FOLDER'], local_filename)
-                            with open(local_path, "wb") as f:
-                                f.write(img_data)
-                            
-                            tg_send_action(chat_id, "typing")
-                            
-                            try:
-                                from tools_library.vision_analyzer import vision_analyzer
-                                description = vision_analyzer(local_path)
-                                vision_context = f"[CONTEXTO VISUAL DA IMAGEM]\n{description}\n[Caminho: {local_path}]"
-                            except Exception as ve:
-                                vision_context = f"[ERRO NA VISÃO]: {ve}"
-                            
-                            caption = msg.get("caption", "")
-                            full_prompt = f"{vision_context}\n\n{caption}".strip()
-                            
-                            response_text = process_engine_request(full_prompt, source="telegram", chat_id=chat_id)
-                            if response_text:
-                                tg_send_message(chat_id, response_text)
+                        # Each chat has its own session, so chats don't wait on each other
+                        eventlet.spawn(handle_telegram_message, msg, chat_id)
                             
         except Exception as e:
             print(f"[Telegram] Polling Error: {e}")
@@ -279,36 +415,39 @@ def handle_connect():
 
 @socketio.on('init_engine')
 def handle_init():
-    global engine
-    with engine_lock:
-        if engine is None:
+    try:
+        if not background_pool.initialized:
             emit('system', {'message': 'Inicializando Aurora Engine...'})
-            engine = Orchestrator()
-            init_event = engine.initialize()
-            if init_event.type == "error":
-                emit('error', {'message': init_event.content})
-            else:
-                emit('system', {'message': init_event.content})
-                emit('ready', {'tools': len(engine.all_tools)})
-        else:
-            emit('ready', {'tools': len(engine.all_tools)})
+            base = background_pool.base
+            emit('system', {'message': f"Aurora v5.0 Online. {len(base.all_tools)} ferramentas carregadas."})
+        base = background_pool.base
+        emit('ready', {'tools': len(base.all_tools)})
+    except Exception as e:
+        emit('error', {'message': str(e)})
 
 @socketio.on('reset_engine')
 def handle_reset():
-    global engine
-    with engine_lock:
-        if engine is None:
-            engine = Orchestrator()
-            init_event = engine.initialize()
-        else:
-            init_event = engine.reset_session()
-        
-        if init_event.type == "error":
-             emit('error', {'message': f"Erro no reset: {init_event.content}"})
-        else:
-             emit('reset_complete', {})
-             emit('system', {'message': 'Sessão reiniciada.'})
-             emit('ready', {'tools': len(engine.all_tools)})
+    try:
+        sessions.reset(session_key("web", sid=request.sid))
+        emit('reset_complete', {})
+        emit('system', {'message': 'Sessão reiniciada.'})
+        emit('ready', {'tools': len(background_pool.base.all_tools)})
+    except Exception as e:
+        emit('error', {'message': f"Erro no reset: {e}"})
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    # A reconnecting HUD gets a new sid, so this conversation is unreachable;
+    # a session still mid-turn is dropped when that turn finishes
+    sessions.drop(session_key("web", sid=request.sid))
+
+@socketio.on('cancel_tool')
+def handle_cancel_tool():
+    cancelled = sessions.cancel_tools(session_key("web", sid=request.sid))
+    if cancelled:
+        emit('system', {'message': f'Cancelando {cancelled} ferramenta(s) em execução...'})
+    else:
+        emit('system', {'message': 'Nenhuma ferramenta em execução.'})
 
 @socketio.on('cancel_task')
 def handle_cancel_task(data):
@@ -351,7 +490,7 @@ def handle_message(data):
         display_msg = f"[Imagem Anexada] {user_input}"
 
     emit('user_message', {'content': display_msg})
-    process_engine_request(final_input, source="web")
+    process_engine_request(final_input, source="web", sid=request.sid)
 
 
 if __name__ == '__main__':
@@ -360,5 +499,17 @@ if __name__ == '__main__':
     
     if TELEGRAM_TOKEN:
         eventlet.spawn(telegram_poll_loop)
+
+    # Resident worker: cron jobs (aurora_runner.py) hand their task_id to the
+    # warm background pool instead of cold-starting a new interpreter
+    def run_worker():
+        try:
+            WorkerDaemon(pool=background_pool).serve_forever()
+        except Exception as e:
+            print(f"[Worker] Não foi possível iniciar o worker residente: {e}")
+    eventlet.spawn(run_worker)
+
+    # Hot reload: new tools written by Aurora show up without a restart
+    eventlet.spawn(tools_watch_loop)
     
     socketio.run(app, host='0.0.0.0', port=5001, debug=False)